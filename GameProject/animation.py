@@ -0,0 +1,71 @@
+﻿"""플레이어 애니메이션 클립 표.
+
+로딩 단계의 프레임 dict ("right_walk" 같은 문자열 키) 를 전직별로 한 번만
+[방향][동작] 정수 인덱스 표로 컴파일한다. 매 틱 Player.update_animation 은
+문자열을 만들지 않고 이 표를 인덱싱해 프레임 키를 고른다.
+
+Clip 은 프레임 목록, 다음 프레임까지의 틱 문턱값, 재생 길이, 끝에 도달했을 때의
+처리(END_*) 를 갖는다. 프레임이 하나뿐인 일반 클립은 static 이라 타이머를 돌리지 않는다.
+"""
+
+RIGHT, LEFT = 0, 1
+DIRS = ("right", "left")
+
+IDLE, WALK, JUMP, CAST, ATTACK, DASH, SKILL = range(7)
+ACTIONS = ("idle", "walk", "jump", "cast", "attack", "dash", "skill")
+
+# 클립 끝 처리
+END_LOOP = 0     # 처음 프레임으로
+END_ATTACK = 1   # 공격 종료 (is_attacking 해제)
+END_DASH = 2     # 대시 종료 (is_dashing 해제)
+END_SKILL = 3    # 마지막 프레임 유지 후 finish_skill 예약
+END_CAST = 4     # 마지막 프레임 유지, 플라즈마 발사 상태로 전환
+
+
+class Clip:
+    __slots__ = ("frames", "threshold", "length", "last", "end", "static")
+
+    def __init__(self, frames, threshold=5, length=None, end=END_LOOP, static=True):
+        self.frames = tuple(frames)
+        self.threshold = threshold
+        self.length = len(self.frames) if length is None else length
+        self.last = len(self.frames) - 1
+        self.end = end
+        self.static = static and len(self.frames) == 1
+
+
+class ClipTable:
+    """전직 하나의 컴파일된 애니메이션 표.
+
+    clips[방향][동작] → Clip 또는 None (프레임 없음)
+    jump[방향]        → (준비, 상승, 하강) 프레임 키
+    beam[방향]        → 플라즈마 발사 프레임 키 (스트레인져)
+    combo[방향][단계] → 콤보 단계별 프레임 키 (프라이슈츠, 1~3 단계)
+    """
+    __slots__ = ("clips", "jump", "beam", "combo")
+
+    def __init__(self, char_type, frames, jump_imgs, beam_imgs, combo_imgs):
+        rules = {
+            IDLE: (5, None, END_LOOP),
+            WALK: (5, None, END_LOOP),
+            ATTACK: (5, 2, END_ATTACK) if char_type == "strider" else (6, None, END_ATTACK),
+            DASH: (2, None, END_DASH),
+            SKILL: (6, None, END_SKILL),
+            CAST: (5, None, END_CAST),
+        }
+        self.clips = []
+        for d in DIRS:
+            row = [None] * len(ACTIONS)
+            for action, (threshold, length, end) in rules.items():
+                frame_list = frames.get(f"{d}_{ACTIONS[action]}")
+                if frame_list:
+                    row[action] = Clip(frame_list, threshold, length, end, static=action != CAST)
+            self.clips.append(tuple(row))
+        self.clips = tuple(self.clips)
+        self.jump = tuple((jump_imgs.get(f"{d}_prep"), jump_imgs.get(f"{d}_rise"), jump_imgs.get(f"{d}_fall"))
+                          for d in DIRS)
+        self.beam = tuple(beam_imgs.get(f"{d}_beam") for d in DIRS)
+        if combo_imgs:
+            self.combo = tuple((None,) + tuple(combo_imgs.get(f"{d}_{step}") for step in (1, 2, 3)) for d in DIRS)
+        else:
+            self.combo = None
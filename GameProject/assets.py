@@ -0,0 +1,93 @@
+﻿"""프로세스 전체에서 공유하는 이미지 캐시 (ASSETS).
+
+파일은 한 번만 읽고, 프레임 키 (경로, GIF 인덱스) 마다 PhotoImage 를 한 번만 만든다.
+GIF 프레임 수는 sprites.image_info 로 미리 알기 때문에 TclError 가 날 때까지 시도하지 않는다.
+모든 엔티티/스테이지/재시작이 같은 PhotoImage 객체를 받는다.
+렌더러가 직접 만든 이미지(지형 청크)도 add 로 등록해 memory_bytes/report 에 함께 잡히게 한다.
+"""
+import tkinter as tk
+
+import sprites
+
+
+class AssetManager:
+    def __init__(self):
+        self.images = {}
+        self.sizes = {}
+
+    def _read(self, path):
+        with open(sprites.resolve(path), "rb") as f:
+            return f.read()
+
+    def image(self, key):
+        """프레임 키 → PhotoImage. 없으면 디코딩해서 캐시."""
+        img = self.images.get(key)
+        if img is None:
+            self.load_file(key[0])
+            img = self.images[key]
+        return img
+
+    def load_file(self, path, data=None):
+        """파일 하나의 모든 프레임을 디코딩해 캐시. 이미 있는 프레임은 건너뛴다."""
+        w, h, count = sprites.image_info(path)
+        if path.lower().endswith(".gif"):
+            keys = [(path, i) for i in range(count)]
+        else:
+            keys = [(path, None)]
+        if all(k in self.images for k in keys):
+            return
+        if data is None:
+            data = self._read(path)
+        for key in keys:
+            if key in self.images:
+                continue
+            if key[1] is None:
+                img = tk.PhotoImage(data=data)
+            else:
+                img = tk.PhotoImage(data=data, format=f"gif -index {key[1]}")
+            self.images[key] = img
+            self.sizes[key] = (img.width(), img.height())
+
+    def add(self, key, img):
+        """파일에서 읽지 않은 이미지(렌더러가 합성한 것 등)를 키 (이름, 인덱스) 로 등록."""
+        self.images[key] = img
+        self.sizes[key] = (img.width(), img.height())
+
+    def discard(self, path):
+        """이름(경로)이 path 인 모든 프레임을 캐시에서 뺀다."""
+        for key in [k for k in self.images if k[0] == path]:
+            del self.images[key]
+            del self.sizes[key]
+
+    def preload(self, keys):
+        for path in {k[0] for k in keys}:
+            try:
+                self.load_file(path)
+            except Exception:
+                pass
+
+    def frames(self, path):
+        w, h, count = sprites.image_info(path)
+        self.load_file(path)
+        if path.lower().endswith(".gif"):
+            return [self.images[(path, i)] for i in range(count)]
+        return [self.images[(path, None)]]
+
+    def memory_bytes(self):
+        """보유 중인 PhotoImage 픽셀 메모리 추정치 (픽셀당 RGBA 4바이트)."""
+        return sum(w * h * 4 for w, h in self.sizes.values())
+
+    def report(self):
+        by_file = {}
+        for (path, _), (w, h) in self.sizes.items():
+            entry = by_file.setdefault(path, {"frames": 0, "bytes": 0})
+            entry["frames"] += 1
+            entry["bytes"] += w * h * 4
+        return {"images": len(self.images), "bytes": self.memory_bytes(), "by_file": by_file}
+
+    def clear(self):
+        self.images.clear()
+        self.sizes.clear()
+
+
+ASSETS = AssetManager()
@@ -0,0 +1,235 @@
+﻿"""효과음 믹서: 카테고리별 예약 채널, 키별 동시 재생 상한, 재생 간격 제한, 프레임 단위 요청 큐.
+
+효과음은 SoundBank 가 처음 요청될 때(또는 직업 선택 시 미리) 백그라운드 스레드에서 디코딩하고,
+디코딩된 PCM 합계가 SOUND_CACHE_BYTES 를 넘으면 가장 오래 안 쓴 것부터 버린다.
+
+월드가 보낸 사운드 이벤트는 request 로 큐에 쌓였다가 렌더 프레임마다 flush 에서 한 번에 처리된다.
+채널은 SOUND_CHANNELS 만큼 카테고리별로 pygame.mixer 에서 예약해 두고(Sound.play 의 자동 할당이 건드리지 않도록)
+그 안에서만 돌려 쓰므로, 전투가 몰려도 믹서 채널 수와 동시에 섞는 소리 수가 고정된다.
+"""
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+from constants import SOUND_FILES, SOUND_CHANNELS, SOUND_VOICES, SOUND_THROTTLE_MS, SOUND_CACHE_BYTES
+import sprites
+
+
+def _decode(path):
+    return pygame.mixer.Sound(file=sprites.resolve(path))
+
+
+def sound_bytes(snd):
+    """디코딩된 PCM 크기 추정 (길이 × 믹서 샘플레이트 × 채널 × 샘플 바이트)."""
+    init = pygame.mixer.get_init()
+    if not init:
+        return 0
+    freq, size, channels = init
+    return int(snd.get_length() * freq) * (abs(size) // 8) * channels
+
+
+class SoundBank:
+    """키 → pygame Sound 의 지연 로딩 LRU 캐시.
+
+    디코딩은 항상 스레드 풀에서 하고 Tk 스레드는 기다리지 않는다: get 은 캐시에 없으면 디코딩을 걸어 두고
+    None 을 돌려주며(그 재생 요청은 버려진다), 끝난 결과는 collect 가 캐시에 넣는다.
+    읽을 수 없는 파일은 기억해 두고 다시 시도하지 않는다.
+    채널이 재생 중인 Sound 는 채널이 참조를 쥐고 있으므로 캐시에서 빠져도 끝까지 재생된다.
+    """
+    def __init__(self, files=SOUND_FILES, cap_bytes=SOUND_CACHE_BYTES, workers=1):
+        self.files = files
+        self.cap = cap_bytes
+        self.cache = OrderedDict()
+        self.sizes = {}
+        self.bytes = 0
+        self.pending = {}
+        self.missing = set()
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.stats = Counter()
+
+    def prefetch(self, keys):
+        for key in keys:
+            if key in self.cache or key in self.pending or key in self.missing or key not in self.files:
+                continue
+            self.pending[key] = self.pool.submit(_decode, self.files[key])
+
+    def put(self, key, snd):
+        if snd is None:
+            self.missing.add(key)
+            return
+        if key in self.cache:
+            self.bytes -= self.sizes[key]
+        self.cache[key] = snd
+        self.cache.move_to_end(key)
+        self.sizes[key] = size = sound_bytes(snd)
+        self.bytes += size
+        while self.bytes > self.cap and len(self.cache) > 1:
+            old, _ = self.cache.popitem(last=False)
+            self.bytes -= self.sizes.pop(old)
+            self.stats["evicted"] += 1
+
+    def get(self, key):
+        snd = self.cache.get(key)
+        if snd is not None:
+            self.cache.move_to_end(key)
+            self.stats["hits"] += 1
+            return snd
+        if key in self.missing or key not in self.files:
+            return None
+        self.stats["misses"] += 1
+        self.prefetch((key,))
+        return None
+
+    def collect(self):
+        """끝난 백그라운드 디코딩 결과를 캐시에 넣는다 (Tk 스레드에서 프레임마다 호출)."""
+        for key in [k for k, f in self.pending.items() if f.done()]:
+            fut = self.pending.pop(key)
+            self.stats["loads"] += 1
+            try:
+                self.put(key, fut.result())
+            except Exception:
+                self.missing.add(key)
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False)
+
+
+class SoundMixer:
+    """채널 하나 = [Channel, 재생 중인 키, 시작 시각] 슬롯.
+
+    키별 상한(SOUND_VOICES)에 걸리면 그 키의 가장 오래된 소리를, 카테고리 채널이 모두 차 있으면
+    카테고리에서 가장 오래된 소리를 끊고 그 채널을 재사용한다. 반복 재생이 아닌 같은 키를
+    throttle_ms 안에 다시 틀면 무시한다 (한 프레임에 몰린 중복 요청도 여기서 하나로 합쳐진다).
+    아직 디코딩되지 않은 효과음은 한 번 재생이면 버리고, 반복 재생이면 deferred_loops 에 남겨 두었다가
+    디코딩이 끝난 flush 에서 시작한다 (그 전에 pause/stop 이 오면 취소).
+    """
+    def __init__(self, channels=SOUND_CHANNELS, voices=SOUND_VOICES, throttle_ms=SOUND_THROTTLE_MS, bank=None):
+        self.sounds = bank or SoundBank()
+        self.spec = channels
+        self.voices = voices
+        self.throttle = throttle_ms / 1000.0
+        self.slots = {}
+        self.last_play = {}
+        self.queue = []
+        self.deferred_loops = set()
+        self.now = 0.0
+        self.stats = Counter()
+
+    def setup(self):
+        """믹서 초기화 후 호출: 카테고리 채널 예약. 믹서가 없으면 슬롯 없이 모든 재생이 무시된다."""
+        self.slots = {}
+        try:
+            total = sum(self.spec.values())
+            pygame.mixer.set_num_channels(max(total, pygame.mixer.get_num_channels()))
+            pygame.mixer.set_reserved(total)
+            index = 0
+            for category, count in self.spec.items():
+                self.slots[category] = [[pygame.mixer.Channel(index + i), None, 0.0] for i in range(count)]
+                index += count
+        except Exception:
+            self.slots = {}
+
+    def request(self, method, *args):
+        self.queue.append((method, args))
+
+    def flush(self, now):
+        """쌓인 요청을 순서대로 처리. now 는 재생 간격 제한과 오래된 소리 판정에 쓰는 시각(초)."""
+        self.now = now
+        self.sounds.collect()
+        for key in list(self.deferred_loops):
+            if key in self.sounds.cache:
+                self.deferred_loops.discard(key)
+                self.play_sound(key, loop=True)
+            elif key in self.sounds.missing:
+                self.deferred_loops.discard(key)
+        queue, self.queue = self.queue, []
+        for method, args in queue:
+            getattr(self, method)(*args)
+
+    def preload_sounds(self, keys):
+        self.sounds.prefetch(keys)
+
+    def _owned(self, key):
+        category = self.voices.get(key, ("player", 1))[0]
+        return [s for s in self.slots.get(category, ()) if s[1] == key]
+
+    def play_sound(self, key, loop=False):
+        category, cap = self.voices.get(key, ("player", 1))
+        slots = self.slots.get(category)
+        if not slots:
+            return
+        snd = self.sounds.get(key)
+        if not snd:
+            if loop and key in self.sounds.pending:
+                self.deferred_loops.add(key)
+            return
+        now = self.now
+        if not loop:
+            if now - self.last_play.get(key, -1.0) < self.throttle:
+                self.stats["throttled"] += 1
+                return
+            self.last_play[key] = now
+        try:
+            mine = [s for s in slots if s[1] == key and s[0].get_busy()]
+            if len(mine) >= cap:
+                slot = min(mine, key=lambda s: s[2])
+                self.stats["stolen"] += 1
+            else:
+                slot = next((s for s in slots if not s[0].get_busy()), None)
+                if slot is None:
+                    slot = min(slots, key=lambda s: s[2])
+                    self.stats["stolen"] += 1
+            slot[0].play(snd, -1 if loop else 0)
+            slot[1], slot[2] = key, now
+            self.stats["played"] += 1
+        except Exception:
+            pass
+
+    def play_loop(self, key):
+        """일시정지해 둔 반복음이 있으면 이어서, 없으면 새로 반복 재생."""
+        for slot in self._owned(key):
+            try:
+                if slot[0].get_busy():
+                    slot[0].unpause()
+                    return
+            except Exception:
+                pass
+        self.play_sound(key, loop=True)
+
+    def pause_sound(self, key):
+        self.deferred_loops.discard(key)
+        for slot in self._owned(key):
+            try:
+                slot[0].pause()
+            except Exception:
+                pass
+
+    def stop_sound(self, key):
+        self.deferred_loops.discard(key)
+        for slot in self._owned(key):
+            try:
+                slot[0].stop()
+            except Exception:
+                pass
+            slot[1] = None
+
+    def stop_all_sounds(self):
+        self.deferred_loops.clear()
+        for slots in self.slots.values():
+            for slot in slots:
+                try:
+                    slot[0].stop()
+                except Exception:
+                    pass
+                slot[1] = None
+
+    def active_voices(self):
+        """카테고리별 재생 중 채널 수 (디버그/프로파일용)."""
+        busy = {}
+        for category, slots in self.slots.items():
+            try:
+                busy[category] = sum(1 for s in slots if s[0].get_busy())
+            except Exception:
+                busy[category] = 0
+        return busy
@@ -0,0 +1,245 @@
+﻿"""몬스터 일괄 물리 (NumPy 선택 의존).
+
+MonsterBatch 는 몬스터 위치·속도·크기·순찰 구간을 열(column) 배열로 들고,
+중력 → x 이동/벽 충돌 → y 이동/바닥·천장 충돌 → 판정 영역 → 순찰 구간 보정을
+모든 몬스터에 한꺼번에 적용한다. 계산 순서와 식은 Entity.update_physics /
+check_col / Monster.update_physics 와 같아서 스칼라 경로와 결과가 비트 단위로 같다.
+
+Monster 의 x, y, dx, dy 등은 BatchField 디스크립터라서 배치에 속해 있으면
+배열의 해당 칸을 읽고 쓰고, 아니면 인스턴스의 "_이름" 슬롯에 값을 둔다. numpy 가 없으면
+배치를 만들지 않고 기존 몬스터별 루프를 그대로 쓴다.
+"""
+from constants import *
+from stage import compile_stage
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class BatchField:
+    """배치에 속하면 배열 칸, 아니면 인스턴스의 "_이름" 슬롯을 가리키는 속성.
+
+    소유 클래스의 __slots__ 에 "_이름" 이 있어야 한다.
+    """
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.local = owner.__dict__["_" + name]
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        batch = obj._batch
+        if batch is None:
+            return self.local.__get__(obj)
+        return batch.cols[self.name][obj._slot]
+
+    def __set__(self, obj, value):
+        batch = obj._batch
+        if batch is None:
+            self.local.__set__(obj, value)
+        else:
+            batch.cols[self.name][obj._slot] = value
+
+
+class OptionalField(BatchField):
+    """None 을 허용하는 실수 속성 (배열에서는 NaN 으로 보관)."""
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        batch = obj._batch
+        if batch is None:
+            return self.local.__get__(obj)
+        value = batch.cols[self.name][obj._slot]
+        return None if value != value else value
+
+    def __set__(self, obj, value):
+        batch = obj._batch
+        if batch is None:
+            self.local.__set__(obj, value)
+        else:
+            batch.cols[self.name][obj._slot] = np.nan if value is None else value
+
+
+FLOAT_FIELDS = ("x", "y", "dx", "dy", "prev_x", "prev_y", "left_bound", "right_bound")
+BOOL_FIELDS = ("on_ground", "target_player")
+FIXED_FIELDS = ("w", "h", "speed", "img_w", "img_h")
+HITBOX_FIELDS = ("hx1", "hy1", "hx2", "hy2")   # 마지막 물리 갱신 시점의 m.hitbox 사본 (전투 질의용)
+
+
+class MonsterBatch:
+    def __init__(self, capacity=64, cell_size=TILE_SIZE):
+        self.cell_size = cell_size
+        self.members = []
+        self.cols = {}
+        self.capacity = 0
+        self.map_data = None
+        self.solid = None
+        self._grow(capacity)
+
+    @staticmethod
+    def available():
+        return np is not None
+
+    def _grow(self, capacity):
+        old, n = self.cols, len(self.members)
+        cols = {}
+        for name in FLOAT_FIELDS + FIXED_FIELDS + HITBOX_FIELDS:
+            cols[name] = np.zeros(capacity)
+        for name in BOOL_FIELDS + ("is_boss", "has_image"):
+            cols[name] = np.zeros(capacity, dtype=bool)
+        for name, arr in old.items():
+            cols[name][:n] = arr[:n]
+        self.cols = cols
+        self.capacity = capacity
+
+    def set_map(self, map_data):
+        """컴파일된 스테이지의 패딩 solid 테이블을 (ROWS+2, COLS+2) 불리언 배열 뷰로 (복사 없음)."""
+        stage = compile_stage(map_data)
+        self.solid = np.frombuffer(stage.solid, dtype=bool).reshape(MAP_ROWS + 2, MAP_COLS + 2)
+        self.map_data = map_data
+
+    def add(self, m, image_size=None):
+        """몬스터를 배치에 붙인다. 인스턴스에 있던 값을 배열로 옮긴다."""
+        if len(self.members) == self.capacity:
+            self._grow(self.capacity * 2)
+        slot = len(self.members)
+        cols = self.cols
+        for name in FLOAT_FIELDS:
+            value = getattr(m, "_" + name)
+            cols[name][slot] = np.nan if value is None else value
+        for name in BOOL_FIELDS:
+            cols[name][slot] = getattr(m, "_" + name)
+        cols["w"][slot], cols["h"][slot] = m.w, m.h
+        cols["speed"][slot] = m.stats.speed
+        cols["is_boss"][slot] = m.is_boss
+        cols["has_image"][slot] = image_size is not None
+        if image_size is not None:
+            cols["img_w"][slot], cols["img_h"][slot] = image_size
+        for name, value in zip(HITBOX_FIELDS, m.hitbox):
+            cols[name][slot] = value
+        m._batch, m._slot = self, slot
+        self.members.append(m)
+
+    def _detach(self, m):
+        values = {}
+        for name in FLOAT_FIELDS + BOOL_FIELDS:
+            values[name] = getattr(m, name)
+        m._batch, m._slot = None, -1
+        for name, value in values.items():
+            setattr(m, name, value.item() if hasattr(value, "item") else value)
+
+    def remove(self, m):
+        """m 을 떼어내고 마지막 칸을 그 자리로 옮긴다 (swap-remove)."""
+        if m._batch is not self:
+            return
+        slot, last = m._slot, len(self.members) - 1
+        self._detach(m)
+        if slot != last:
+            moved = self.members[last]
+            for arr in self.cols.values():
+                arr[slot] = arr[last]
+            moved._slot = slot
+            self.members[slot] = moved
+        self.members.pop()
+
+    def clear(self):
+        for m in self.members:
+            self._detach(m)
+        self.members = []
+
+    def hitboxes(self):
+        """멤버 순서의 판정 영역 열 (x1, y1, x2, y2) 뷰."""
+        n = len(self.members)
+        cols = self.cols
+        return cols["hx1"][:n], cols["hy1"][:n], cols["hx2"][:n], cols["hy2"][:n]
+
+    def save_prev(self):
+        n = len(self.members)
+        cols = self.cols
+        cols["prev_x"][:n] = cols["x"][:n]
+        cols["prev_y"][:n] = cols["y"][:n]
+
+    def _wall(self, r, c):
+        return self.solid[np.clip(r, -1, MAP_ROWS) + 1, np.clip(c, -1, MAP_COLS) + 1]
+
+    def _cells(self, x, y, w, h):
+        T = TILE_SIZE
+        left = np.trunc(x / T).astype(np.int64)
+        right = np.trunc((x + w - 0.1) / T).astype(np.int64)
+        top = np.trunc(y / T).astype(np.int64)
+        bottom = np.trunc((y + h - 0.1) / T).astype(np.int64)
+        return left, right, top, bottom
+
+    @staticmethod
+    def _clamp_x(x, w):
+        x = np.where(x < 0, 0.0, x)
+        return np.where(x > MAP_WIDTH - w, MAP_WIDTH - w, x)
+
+    def step(self, map_data, player_x=None, members=None):
+        """members(기본: 전체) 의 물리를 한 틱 진행.
+
+        (판정 영역 목록, 공간 해시 셀 범위 목록) 을 members 순서로 돌려준다.
+        """
+        if map_data is not self.map_data:
+            self.set_map(map_data)
+        if members is None:
+            members = self.members
+            idx = np.arange(len(members))
+        else:
+            idx = np.fromiter((m._slot for m in members), dtype=np.int64, count=len(members))
+        if not len(idx):
+            return [], []
+        cols = self.cols
+        x, y, dx, dy = cols["x"][idx], cols["y"][idx], cols["dx"][idx], cols["dy"][idx]
+        w, h = cols["w"][idx], cols["h"][idx]
+        T = TILE_SIZE
+
+        if player_x is not None:
+            speed = cols["speed"][idx]
+            chase = cols["target_player"][idx] & ~cols["is_boss"][idx] & (np.abs(player_x - x) > 2)
+            dx = np.where(chase, np.where(player_x > x, speed, -speed), dx)
+
+        dy = dy + GRAVITY
+        x = x + dx
+        x = self._clamp_x(x, w)
+        left, right, top, bottom = self._cells(x, y, w, h)
+        pos, neg = dx > 0, dx < 0
+        hit_r = pos & (self._wall(top, right) | self._wall(bottom, right))
+        hit_l = neg & (self._wall(top, left) | self._wall(bottom, left))
+        x = np.where(hit_r, right * T - w - 0.1, x)
+        x = np.where(hit_l, (left + 1) * T + 0.1, x)
+        dx = np.where(hit_r | hit_l, -dx, dx)
+
+        y = y + dy
+        x = self._clamp_x(x, w)
+        left, right, top, bottom = self._cells(x, y, w, h)
+        down, up = dy > 0, dy < 0
+        land = down & (self._wall(bottom, left) | self._wall(bottom, right))
+        ceil = up & (self._wall(top, left) | self._wall(top, right))
+        y = np.where(land, bottom * T - h, y)
+        y = np.where(ceil, (top + 1) * T, y)
+        dy = np.where(land | ceil, 0.0, dy)
+
+        img = cols["has_image"][idx]
+        iw, ih = cols["img_w"][idx], cols["img_h"][idx]
+        hx1 = np.where(img, (x + w / 2) - np.floor_divide(iw, 2), x)
+        hy1 = np.where(img, (y + h) - ih, y)
+        hx2 = np.where(img, hx1 + iw, x + w)
+        hy2 = np.where(img, hy1 + ih, y + h)
+
+        lb, rb = cols["left_bound"][idx], cols["right_bound"][idx]
+        bounded = ~np.isnan(lb) & ~np.isnan(rb)
+        lo = bounded & (x < lb)
+        hi = bounded & ~lo & (x > rb - w)
+        x = np.where(lo, lb, np.where(hi, rb - w, x))
+        dx = np.where(lo, np.abs(dx), np.where(hi, -np.abs(dx), dx))
+
+        cols["x"][idx], cols["y"][idx], cols["dx"][idx], cols["dy"][idx] = x, y, dx, dy
+        cols["on_ground"][idx] = land
+        cols["hx1"][idx], cols["hy1"][idx], cols["hx2"][idx], cols["hy2"][idx] = hx1, hy1, hx2, hy2
+
+        cs = self.cell_size
+        spans = [np.floor_divide(v, cs).astype(np.int64).tolist() for v in (hx1, hy1, hx2, hy2)]
+        return list(zip(hx1.tolist(), hy1.tolist(), hx2.tolist(), hy2.tolist())), list(zip(*spans))
@@ -0,0 +1,262 @@
+﻿"""헤드리스 성능 벤치마크: 스테이지 × 직업 × 몬스터 수 조합별 틱 처리량.
+
+각 조합마다 고정 시드의 GameWorld 에 스테이지를 올리고 몬스터를 count 마리로 맞춘 뒤,
+직업별 스크립트 입력(replay.apply_mask 경로)으로 ticks 만큼 step() 을 돌린다.
+플레이어는 매 틱 HP 를 채워 죽지 않고(피격 경로는 그대로 실행), 몬스터는 HP 를 크게 잡아
+측정 중 마릿수가 줄지 않게 한다. 포탈 이동은 Up 키가 필요하므로 스크립트는 누르지 않는다.
+
+지표:
+    ticks/s       tracemalloc 없이 잰 순수 처리량
+    blocks/tick   sys.getallocatedblocks() 순증가 / 틱 (누수 감지용)
+    alloc KiB/t   틱 하나 안에서 새로 잡힌 임시 메모리 최대치의 평균 (tracemalloc.reset_peak)
+    peak KiB      tracemalloc 으로 다시 돌린 구간의 최대 추적 메모리
+    ops/tick      (--fake-render) 틱당 캔버스 연산 수, JSON 에는 연산 종류별로도 남긴다
+
+--render 를 주면 실제 Tk 캔버스(가상 디스플레이 포함)에 CanvasRenderer.sync 까지 돌린다.
+--fake-render 는 headless.FakeCanvas 에 같은 sync 를 돌려 Tk 비용 없이 렌더러 쪽 파이썬 비용과
+캔버스 연산 수를 잰다. 디스플레이가 없는 환경에서 --render 를 주면 자동으로 --fake-render 가 된다.
+
+사용법: python benchmark.py [--ticks 600] [--counts 10,100,1000] [--stages -1,0,1,2,3,4]
+                            [--classes iron,strider,stranger,freischutz] [--render | --fake-render]
+                            [--json out.json]
+"""
+import contextlib
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from constants import *
+from entities import Monster
+from replay import INPUT_BITS, apply_mask
+from world import GameWorld
+
+
+STAGES = {-1: "STAGE_OPEN", 0: "STAGE_0", 1: "STAGE_1", 2: "STAGE_2", 3: "STAGE_3", 4: "STAGE_END"}
+CLASSES = ("iron", "strider", "stranger", "freischutz")
+COUNTS = (10, 100, 1000)
+SEED = 20251
+
+
+def bits(*keys):
+    mask = 0
+    for key in keys:
+        mask |= INPUT_BITS[key]
+    return mask
+
+
+def scripted_mask(char_type, tick):
+    """직업별 스크립트 입력: 좌우 왕복, 주기적 점프·공격, 직업 스킬."""
+    phase = tick % 480
+    mask = bits("Right") if phase < 240 else bits("Left")
+    if tick % 50 < 3:
+        mask |= bits("space")
+    if tick % 20 < 2:
+        mask |= bits("z")
+    if char_type == "stranger":
+        if tick % 120 < 60:
+            mask |= bits("d")
+        if tick % 50 > 20:
+            mask |= bits("s")
+    elif char_type == "freischutz":
+        if tick % 120 < 2:
+            mask |= bits("d")
+    elif char_type == "strider":
+        t = tick % 60
+        if t in (3, 4, 7, 8):
+            mask = (mask & ~bits("Left", "Right")) | bits("Right" if phase < 240 else "Left")
+        elif t in (5, 6):
+            mask &= ~bits("Left", "Right")
+    return mask
+
+
+def populate(world, count):
+    """현재 스테이지 몬스터를 count 마리로 맞춘다 (보스 유지, 부족분은 스테이지 몹으로 추가)."""
+    keep = sorted(world.monsters, key=lambda m: not m.is_boss)[:count]
+    world.clear_monsters()
+    if world.stage_level == 1:
+        types = ["enemy0"]
+    elif world.stage_level == 0:
+        types = ["enemy3"]
+    else:
+        types = ["enemy1", "enemy2"]
+    for m in keep:
+        world.add_monster(m)
+    while len(world.monsters) < count:
+        x = world.rng.randint(1, MAP_COLS - 2) * TILE_SIZE
+        m = Monster(world, x, 0, world.rng.choice(types))
+        m.y = world.find_ground_y(x) + world.player.h - m.h
+        m.target_player = world.rng.random() < 0.5
+        m.refresh_hitbox()
+        world.add_monster(m)
+    for m in world.monsters:
+        m.hp = m.max_hp = 10 ** 9
+
+
+def make_world(stage, char_type, count):
+    world = GameWorld(emit_events=False, seed=SEED)
+    world.start_game(char_type)
+    world.load_stage(stage)
+    world.step()
+    populate(world, count)
+    return world
+
+
+def run(world, char_type, ticks, renderer=None, traced=False):
+    """ticks 만큼 진행. traced 면 (틱별 임시 할당 최대치 합계, 전체 최대 추적 메모리) 바이트를 돌려준다."""
+    player = world.player
+    prev = 0
+    transient = 0
+    peak = 0
+    for t in range(ticks):
+        if traced:
+            start = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        prev = apply_mask(world, prev, scripted_mask(char_type, t))
+        world.step()
+        player.hp = player.max_hp
+        if renderer is not None:
+            renderer.sync()
+            renderer.canvas.update_idletasks()
+        if traced:
+            tick_peak = tracemalloc.get_traced_memory()[1]
+            transient += tick_peak - start
+            peak = max(peak, tick_peak)
+    return transient, peak
+
+
+def has_display():
+    """Tk 창을 띄울 수 있는지 (X11 계열에서 DISPLAY 가 없으면 False)."""
+    if sys.platform.startswith("win") or sys.platform == "darwin":
+        return True
+    return bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
+
+_tk_root = None
+
+
+def make_renderer(world, render):
+    """렌더 벤치마크용 CanvasRenderer.
+
+    "tk" 는 실제 Tk 캔버스 (DISPLAY 또는 Xvfb 필요, Tk 루트는 프로세스에 하나만 만들어 재사용),
+    "fake" 는 headless.installed() 안에서 FakeRoot 에 붙은 FakeCanvas (지형 합성 등 준비 단계 연산은 세지 않는다).
+    """
+    global _tk_root
+    import tkinter as tk
+    from renderer import CanvasRenderer
+    if render == "fake":
+        from headless import FakeRoot
+        master = FakeRoot()
+    else:
+        if _tk_root is None:
+            _tk_root = tk.Tk()
+            _tk_root.withdraw()
+        master = _tk_root
+    canvas = tk.Canvas(master, width=SCREEN_WIDTH, height=GAME_HEIGHT)
+    renderer = CanvasRenderer(canvas, world)
+    renderer.rebuild()
+    if render == "fake":
+        canvas.ops.clear()
+    return renderer
+
+
+def bench(stage, char_type, count, ticks, render=None):
+    """render 는 None(월드만), "tk", "fake" 중 하나."""
+    world = make_world(stage, char_type, count)
+    renderer = make_renderer(world, render) if render else None
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    t0 = time.perf_counter()
+    run(world, char_type, ticks, renderer)
+    elapsed = time.perf_counter() - t0
+    ops = None
+    if renderer is not None:
+        if render == "fake":
+            ops = {name: n / ticks for name, n in sorted(renderer.canvas.ops.items()) if name != "update_idletasks"}
+        renderer.canvas.destroy()
+    gc.collect()
+    blocks = sys.getallocatedblocks() - blocks
+
+    world = make_world(stage, char_type, count)
+    renderer = make_renderer(world, render) if render else None
+    traced_ticks = min(ticks, 200)
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    try:
+        transient, peak = run(world, char_type, traced_ticks, renderer, traced=True)
+    finally:
+        tracemalloc.stop()
+        if renderer is not None:
+            renderer.canvas.destroy()
+    peak -= base
+    return {
+        "stage": STAGES[stage], "class": char_type, "monsters": count, "ticks": ticks,
+        "ticks_per_s": ticks / elapsed if elapsed else 0.0,
+        "blocks_per_tick": blocks / ticks,
+        "alloc_kib_per_tick": transient / 1024.0 / max(1, traced_ticks),
+        "peak_kib": peak / 1024.0,
+        "canvas_ops_per_tick": ops,
+    }
+
+
+def parse_args(argv):
+    opts = {"ticks": 600, "counts": COUNTS, "stages": tuple(STAGES), "classes": CLASSES,
+            "render": None, "json": None}
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg == "--render":
+            opts["render"] = "tk"
+        elif arg == "--fake-render":
+            opts["render"] = "fake"
+        elif arg in ("--ticks", "--counts", "--stages", "--classes", "--json"):
+            i += 1
+            value = argv[i]
+            if arg == "--ticks":
+                opts["ticks"] = int(value)
+            elif arg == "--counts":
+                opts["counts"] = tuple(int(v) for v in value.split(","))
+            elif arg == "--stages":
+                opts["stages"] = tuple(int(v) for v in value.split(","))
+            elif arg == "--classes":
+                opts["classes"] = tuple(value.split(","))
+            else:
+                opts["json"] = value
+        else:
+            raise SystemExit(f"알 수 없는 인자: {arg}")
+        i += 1
+    if opts["render"] == "tk" and not has_display():
+        print("디스플레이가 없어 --fake-render 로 돌립니다.", file=sys.stderr)
+        opts["render"] = "fake"
+    return opts
+
+
+def main(argv):
+    opts = parse_args(argv)
+    results = []
+    print(f"{'stage':11}{'class':12}{'mobs':>6}{'ticks/s':>10}{'blocks/t':>10}{'alloc KiB/t':>12}{'peak KiB':>10}{'ops/t':>8}")
+    if opts["render"] == "fake":
+        from headless import installed
+        backend = installed()
+    else:
+        backend = contextlib.nullcontext()
+    with backend:
+        for stage in opts["stages"]:
+            for char_type in opts["classes"]:
+                for count in opts["counts"]:
+                    r = bench(stage, char_type, count, opts["ticks"], opts["render"])
+                    results.append(r)
+                    ops = r["canvas_ops_per_tick"]
+                    ops = f"{sum(ops.values()):8.1f}" if ops is not None else f"{'-':>8}"
+                    print(f"{r['stage']:11}{r['class']:12}{r['monsters']:6d}{r['ticks_per_s']:10.0f}"
+                          f"{r['blocks_per_tick']:10.2f}{r['alloc_kib_per_tick']:12.2f}{r['peak_kib']:10.1f}{ops}", flush=True)
+    if opts["json"]:
+        with open(opts["json"], "w", encoding="utf-8") as f:
+            json.dump({"seed": SEED, "ticks": opts["ticks"], "render": opts["render"], "results": results}, f, indent=1)
+    return results
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
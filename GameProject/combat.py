@@ -0,0 +1,105 @@
+﻿"""몬스터 대상 공격 판정 공용 API.
+
+공격 모양(상자 / 원 / 스윕 상자) 하나로 맞은 몬스터 목록을 돌려주고, 피해는 damage() 로 한꺼번에 적용한다.
+몬스터 일괄 물리(MonsterBatch)가 켜져 있으면 배치의 판정 영역 열에 대해 NumPy 로 한 번에 거르고,
+아니면 공간 해시 후보를 하나씩 정밀 판정한다. 두 경로 모두 결과는 eid 순이다.
+대상 중복 제거(다단 히트 스킬 등)는 exclude 에 eid 집합을 넘긴다.
+"""
+from sweep import sweep_box
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def box_hits(box, hb):
+    """경계에 닿는 것도 맞은 것으로 본다."""
+    return not (box[2] < hb[0] or box[0] > hb[2] or box[3] < hb[1] or box[1] > hb[3])
+
+
+def circle_hits(cx, cy, r, hb):
+    """원과 상자: 상자 안에서 원 중심에 가장 가까운 점까지의 거리로 판정."""
+    nx = min(max(cx, hb[0]), hb[2])
+    ny = min(max(cy, hb[1]), hb[3])
+    return (cx - nx) ** 2 + (cy - ny) ** 2 <= r * r
+
+
+class CombatQuery:
+    def __init__(self, world):
+        self.world = world
+
+    def _batch(self):
+        batch = self.world.monster_batch
+        if batch is not None and batch.members:
+            return batch
+        return None
+
+    def _select(self, candidates, exclude):
+        can_damage = self.world.can_damage_monster
+        if exclude:
+            return [m for m in candidates if m.eid not in exclude and can_damage(m)]
+        return [m for m in candidates if can_damage(m)]
+
+    def _from_mask(self, batch, mask, exclude):
+        members = batch.members
+        found = [members[i] for i in np.flatnonzero(mask).tolist()]
+        if len(found) > 1:
+            found.sort(key=lambda m: m.eid)
+        return self._select(found, exclude)
+
+    def box(self, box, exclude=None):
+        """box 와 겹치는 몬스터."""
+        batch = self._batch()
+        if batch is not None:
+            x1, y1, x2, y2 = batch.hitboxes()
+            mask = (box[2] >= x1) & (box[0] <= x2) & (box[3] >= y1) & (box[1] <= y2)
+            return self._from_mask(batch, mask, exclude)
+        world = self.world
+        return self._select([m for m in world.monsters_near(box) if box_hits(box, world.get_bbox(m))], exclude)
+
+    def circle(self, cx, cy, r, exclude=None):
+        """중심 (cx, cy), 반지름 r 인 원과 겹치는 몬스터."""
+        batch = self._batch()
+        if batch is not None:
+            x1, y1, x2, y2 = batch.hitboxes()
+            nx = np.clip(cx, x1, x2)
+            ny = np.clip(cy, y1, y2)
+            mask = (cx - nx) ** 2 + (cy - ny) ** 2 <= r * r
+            return self._from_mask(batch, mask, exclude)
+        world = self.world
+        near = world.monsters_near((cx - r, cy - r, cx + r, cy + r))
+        return self._select([m for m in near if circle_hits(cx, cy, r, world.get_bbox(m))], exclude)
+
+    def sweep(self, box, dx, dy, exclude=None):
+        """box 를 (dx, dy) 만큼 옮기는 동안 닿는 몬스터 (이동 구간 전체, 관통 없음)."""
+        batch = self._batch()
+        if batch is not None:
+            x1, y1, x2, y2 = batch.hitboxes()
+            bw, bh = box[2] - box[0], box[3] - box[1]
+            t0, t1 = np.zeros(len(x1)), np.ones(len(x1))
+            mask = np.ones(len(x1), dtype=bool)
+            for p, d, lo, hi in ((box[0], dx, x1 - bw, x2), (box[1], dy, y1 - bh, y2)):
+                if d == 0:
+                    mask &= (p >= lo) & (p <= hi)
+                else:
+                    a, b = (lo - p) / d, (hi - p) / d
+                    t0 = np.maximum(t0, np.minimum(a, b))
+                    t1 = np.minimum(t1, np.maximum(a, b))
+            return self._from_mask(batch, mask & (t0 <= t1), exclude)
+        world = self.world
+        swept = (min(box[0], box[0] + dx), min(box[1], box[1] + dy), max(box[2], box[2] + dx), max(box[3], box[3] + dy))
+        near = world.monsters_near(swept)
+        return self._select([m for m in near if sweep_box(box, dx, dy, world.get_bbox(m)) is not None], exclude)
+
+    def damage(self, targets, amount, shown=None):
+        """targets 전원에게 amount 피해와 데미지 숫자(shown, 기본 amount) 를 적용. 체력이 바닥난 몬스터 목록을 돌려준다."""
+        world = self.world
+        shown = amount if shown is None else shown
+        dead = []
+        for m in targets:
+            m.hp -= amount
+            world.create_damage_text(m.x, m.y, shown, m.eid)
+            if m.hp <= 0:
+                dead.append(m)
+        return dead
@@ -9,6 +9,20 @@ MAP_WIDTH = TILE_SIZE * MAP_COLS
 GAME_HEIGHT = TILE_SIZE * MAP_ROWS
 UI_HEIGHT = 180
 
+FRAME_MS = 16          # 시뮬레이션 고정 스텝 길이 (프레임 단위 타이머도 이 스텝을 센다)
+RENDER_MS = 16         # 렌더 콜백 주기 = 프레임 예산
+MAX_CATCHUP_STEPS = 5  # 렌더 한 번에 따라잡을 최대 스텝 수 (넘으면 밀린 시간은 버림)
+DEBUG_HITBOX = False   # True 면 매 프레임 캔버스 bbox 와 (보간한) 파이썬 hitbox 를 비교해 어긋남 수를 프로파일러에 누적
+CULL_MARGIN = TILE_SIZE * 2     # 화면 밖 이만큼까지는 캔버스 아이템을 계속 갱신
+FAR_MONSTER_DIST = SCREEN_WIDTH  # 화면에서 이보다 먼 몬스터는 저비용 갱신 대상
+FAR_MONSTER_STRIDE = 1           # 먼 몬스터를 N 틱마다 한 번만 갱신 (1 이면 끔)
+BATCH_MIN_MONSTERS = 64          # 몬스터가 이 이상이면 NumPy 일괄 물리 (적으면 몬스터별 루프가 더 빠름)
+BOSS_PROJECTILE_CAP = 512        # 동시에 살아 있을 수 있는 보스 투사체 수 (풀 크기, 넘치면 새 발사를 버림)
+DAMAGE_TEXT_CAP = 64             # 동시에 떠 있는 데미지 숫자 최대 개수 (넘치면 가장 오래된 것을 재사용)
+DAMAGE_TEXT_MS = 500             # 데미지 숫자 표시 시간
+DAMAGE_MERGE_MS = 150            # 같은 대상의 연속 타격을 한 숫자로 합치는 창 (0 이면 합치지 않음)
+TIMER_WHEEL_SLOTS = 256          # 타이머 휠 칸 수 (한 바퀴 = 256 틱, 더 긴 지연은 바퀴 수를 세며 대기)
+
 GRAVITY = 0.8
 JUMP_POWER = -19.0
 MOVE_SPEED = 7.0
@@ -31,7 +45,27 @@ SOUND_FILES = {
     "freischutz_skill": "sound/freischutz_skill.wav",
     "boss_projectile": "sound/boss_projectile.wav",
 }
-BGM_FILE = "sound/bgm_main.wav"  # 최종 컷신 이전까지 반복 재생할 배경 음악
+BGM_FILE = "sound/bgm_main.ogg"  # 최종 컷신 이전까지 반복 재생할 배경 음악 (mixer.music 으로 스트리밍)
+CLASS_SOUNDS = {                 # 직업을 고르면 미리 디코딩해 둘 효과음
+    "iron": ("iron_walk", "iron_attack"),
+    "strider": ("strider_attack", "strider_dash"),
+    "stranger": ("stranger_attack", "stranger_plasma"),
+    "freischutz": ("freischutz_attack", "freischutz_skill"),
+}
+SOUND_CACHE_BYTES = 1536 * 1024  # 디코딩된 효과음 PCM 상한 (넘으면 가장 오래 안 쓴 것부터 해제)
+SOUND_CHANNELS = {"player": 4, "loop": 2, "enemy": 3}  # 카테고리별로 예약하는 믹서 채널 수
+SOUND_VOICES = {                 # 효과음 키별 (채널 카테고리, 동시 재생 상한). 상한을 넘으면 가장 오래된 소리를 끊는다
+    "iron_walk": ("loop", 1),
+    "iron_attack": ("player", 2),
+    "strider_attack": ("player", 2),
+    "strider_dash": ("player", 1),
+    "stranger_attack": ("player", 2),
+    "stranger_plasma": ("loop", 1),
+    "freischutz_attack": ("player", 2),
+    "freischutz_skill": ("player", 1),
+    "boss_projectile": ("enemy", 3),
+}
+SOUND_THROTTLE_MS = 40           # 같은 효과음을 이보다 짧은 간격으로 다시 틀면 무시
 
 MONSTER_DB = {
     "enemy0": {"color": "lime", "hp": 15, "atk": 5, "exp": 30, "speed": 2},
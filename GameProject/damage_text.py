@@ -0,0 +1,71 @@
+﻿from collections import deque
+
+from constants import *
+
+
+class DamageTextPool:
+    """떠오르는 데미지 숫자용 캔버스 텍스트 풀.
+
+    텍스트 아이템은 최대 capacity 개까지만 만들고 숨김/표시로 재사용한다. 수명은 Tk 타이머 대신
+    매 프레임 update(now) 가 처리한다 (now 는 월드 시뮬레이션 시각, 초).
+    key(대상 eid)가 같은 타격이 merge_ms 안에 다시 들어오면 새 숫자를 띄우지 않고 기존 숫자에 더한다.
+    """
+    def __init__(self, canvas, capacity=DAMAGE_TEXT_CAP, life_ms=DAMAGE_TEXT_MS, merge_ms=DAMAGE_MERGE_MS):
+        self.canvas = canvas
+        self.capacity = capacity
+        self.life = life_ms / 1000
+        self.merge = merge_ms / 1000
+        self.reset()
+
+    def reset(self):
+        """캔버스가 통째로 지워졌을 때 (스테이지 재구성) 호출. 아이템을 새로 만들게 한다."""
+        self.free = []
+        self.active = deque()
+        self.by_key = {}
+        self.created = 0
+
+    def add(self, x, y, dmg, key=None, now=0.0):
+        if key is not None and self.merge > 0:
+            slot = self.by_key.get(key)
+            if slot is not None and now - slot[3] <= self.merge:
+                slot[4] += dmg
+                slot[2], slot[3] = now + self.life, now
+                self.canvas.itemconfig(slot[0], text=str(int(slot[4])))
+                self.canvas.coords(slot[0], x, y-40)
+                self.active.remove(slot)
+                self.active.append(slot)
+                return
+        if self.free:
+            slot = self.free.pop()
+            self.canvas.coords(slot[0], x, y-40)
+            self.canvas.itemconfig(slot[0], text=str(int(dmg)), state="normal")
+        elif self.created < self.capacity:
+            item = self.canvas.create_text(x, y-40, text=str(int(dmg)), fill="red", font=("Arial", 20, "bold"))
+            self.created += 1
+            slot = [item, None, 0.0, 0.0, 0]
+        else:
+            slot = self.active.popleft()
+            self._unbind(slot)
+            self.canvas.coords(slot[0], x, y-40)
+            self.canvas.itemconfig(slot[0], text=str(int(dmg)))
+        # [아이템, key, 만료 시각, 마지막 타격 시각, 누적 데미지]
+        slot[1], slot[2], slot[3], slot[4] = key, now + self.life, now, dmg
+        if key is not None:
+            self.by_key[key] = slot
+        self.active.append(slot)
+
+    def _unbind(self, slot):
+        if slot[1] is not None and self.by_key.get(slot[1]) is slot:
+            del self.by_key[slot[1]]
+
+    def update(self, now):
+        """만료된 숫자를 숨기고 풀로 되돌린다. active 는 만료 시각 순."""
+        active = self.active
+        while active and active[0][2] <= now:
+            slot = active.popleft()
+            self._unbind(slot)
+            self.canvas.itemconfig(slot[0], state="hidden")
+            self.free.append(slot)
+
+    def __len__(self):
+        return len(self.active)
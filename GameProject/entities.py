@@ -1,21 +1,42 @@
-﻿import tkinter as tk
-import time
-from constants import *
+﻿from constants import *
+from batch import BatchField, OptionalField
+from animation import (ClipTable, RIGHT, LEFT, IDLE, WALK, JUMP, CAST, ATTACK, DASH, SKILL,
+                       END_ATTACK, END_DASH, END_SKILL, END_CAST)
+import sprites
 
 
 class Entity:
-    """기본 위치/충돌/중력 처리를 담당하는 모든 오브젝트의 베이스 클래스."""
-    def __init__(self, canvas, x, y, w, h, color):
-        self.canvas = canvas
+    """기본 위치/충돌/중력 처리를 담당하는 모든 오브젝트의 베이스 클래스.
+
+    캔버스를 직접 다루지 않는다. image(프레임 키)/visible 과 sprite_pos() 로
+    렌더러가 그릴 상태만 노출한다.
+
+    속성은 __slots__ 로 고정한다. 선택 기능은 hasattr 로 찾지 않고 클래스 플래그로 밝힌다
+    (animated: 물리 후 update_animation 호출).
+    위치·속도(KINEMATIC_SLOTS)는 서브클래스가 선언한다: Player 는 일반 슬롯,
+    Monster 는 BatchField 라서 "_이름" 슬롯만 가진다 (베이스에 두면 몬스터마다 안 쓰는 칸이 생긴다).
+    """
+    KINEMATIC_SLOTS = ("x", "y", "prev_x", "prev_y", "dx", "dy", "on_ground")
+    __slots__ = ("world", "eid", "w", "h", "is_floating", "color", "image", "visible", "hitbox")
+    animated = False
+
+    def __init__(self, world, x, y, w, h, color):
+        self.world = world
+        self.eid = world.new_id()
         self.x, self.y = float(x), float(y)
+        self.prev_x, self.prev_y = self.x, self.y
         self.w, self.h = w, h
         self.dx, self.dy = 0.0, 0.0
         self.on_ground = False
-        self.body = canvas.create_rectangle(x, y, x+w, y+h, fill=color, outline="black")
+        self.is_floating = False
+        self.color = color
+        self.image = None
+        self.visible = True
+        self.hitbox = (self.x, self.y, self.x + w, self.y + h)
 
     def update_physics(self, map_data):
         gravity_factor = 1.0
-        if hasattr(self, 'is_floating') and self.is_floating:
+        if self.is_floating:
             gravity_factor = 0.2
         
         self.dy += (GRAVITY * gravity_factor)
@@ -23,29 +44,26 @@ class Entity:
         self.check_col(map_data, "x")
         self.y += self.dy
         self.check_col(map_data, "y")
-        
-        item_type = self.canvas.type(self.body)
-        if item_type == "image":
-            if hasattr(self, 'char_type') and self.char_type == "stranger" and (self.is_firing or self.is_casting):
-                if self.current_dir == "right": 
-                    self.canvas.coords(self.body, self.x, self.y + self.h)
-                    self.canvas.itemconfig(self.body, anchor="sw")
-                else: 
-                    self.canvas.coords(self.body, self.x + self.w, self.y + self.h)
-                    self.canvas.itemconfig(self.body, anchor="se")
-            elif hasattr(self, 'is_dashing') and self.is_dashing:
-                 self.canvas.coords(self.body, self.dash_visual_x, self.y + self.h)
-                 self.canvas.itemconfig(self.body, anchor="s")
-            else:
-                self.canvas.coords(self.body, self.x + (self.w/2), self.y + self.h)
-                self.canvas.itemconfig(self.body, anchor="s")
-            
-            if hasattr(self, 'update_animation'):
-                self.update_animation()
+
+        if self.image is not None and self.animated:
+            self.update_animation()
+        self.refresh_hitbox()
+
+    def refresh_hitbox(self):
+        """판정 영역 갱신: 이미지면 앵커·이미지 크기 기준(캔버스 bbox 와 동일), 아니면 논리 영역."""
+        if self.image is None:
+            self.hitbox = (self.x, self.y, self.x + self.w, self.y + self.h)
         else:
-            self.canvas.coords(self.body, self.x, self.y, self.x + self.w, self.y + self.h)
+            x, y, anchor = self.sprite_pos()
+            iw, ih, _ = sprites.image_info(self.image[0])
+            self.hitbox = sprites.anchor_box(x, y, anchor, iw, ih)
+
+    def sprite_pos(self):
+        """이미지 스프라이트를 놓을 기준점과 앵커."""
+        return self.x + (self.w/2), self.y + self.h, "s"
 
     def check_col(self, map_data, axis):
+        """타일 충돌 보정. 벽 판정은 월드의 컴파일된 스테이지(stage.solid 평면 테이블)를 직접 읽는다."""
         if self.x < 0: self.x = 0
         if self.x > MAP_WIDTH - self.w: self.x = MAP_WIDTH - self.w
 
@@ -53,39 +71,73 @@ class Entity:
         right = int((self.x + self.w - 0.1) / TILE_SIZE)
         top = int(self.y / TILE_SIZE)
         bottom = int((self.y + self.h - 0.1) / TILE_SIZE)
+        stage = self.world.stage
+        solid = stage.solid
+        top_off = stage.offsets.get(top, 0) + 1
+        bottom_off = stage.offsets.get(bottom, 0) + 1
 
         if axis == "x":
             if self.dx > 0:
-                if self.is_wall(map_data, top, right) or self.is_wall(map_data, bottom, right):
+                if solid[top_off + right] or solid[bottom_off + right]:
                     self.x = (right * TILE_SIZE) - self.w - 0.1
                     self.dx *= -1 
             elif self.dx < 0:
-                if self.is_wall(map_data, top, left) or self.is_wall(map_data, bottom, left):
+                if solid[top_off + left] or solid[bottom_off + left]:
                     self.x = (left + 1) * TILE_SIZE + 0.1
                     self.dx *= -1
 
         elif axis == "y":
             if self.dy > 0:
-                if self.is_wall(map_data, bottom, left) or self.is_wall(map_data, bottom, right):
+                if solid[bottom_off + left] or solid[bottom_off + right]:
                     self.y = (bottom * TILE_SIZE) - self.h
                     self.dy = 0
                     self.on_ground = True
                     return
             elif self.dy < 0:
-                if self.is_wall(map_data, top, left) or self.is_wall(map_data, top, right):
+                if solid[top_off + left] or solid[top_off + right]:
                     self.y = (top + 1) * TILE_SIZE
                     self.dy = 0
             self.on_ground = False
 
     def is_wall(self, map_data, r, c):
-        if 0 <= r < MAP_ROWS and 0 <= c < MAP_COLS: return map_data[r][c] == 1
-        return True
+        return self.world.stage.is_wall(r, c)
+
+
+class MonsterStats:
+    """몬스터 한 마리의 스탯 레코드 (MONSTER_DB 항목의 복사본)."""
+    __slots__ = ("color", "hp", "atk", "exp", "speed")
+
+    def __init__(self, entry):
+        self.color = entry["color"]
+        self.hp = entry["hp"]
+        self.atk = entry["atk"]
+        self.exp = entry["exp"]
+        self.speed = entry["speed"]
 
 
 class Monster(Entity):
-    """몬스터 공통 로직: 크기/스탯 로딩, 이미지 스프라이트, AI 이동·투사체 쿨다운."""
-    def __init__(self, canvas, x, y, m_type):
-        data = MONSTER_DB[m_type]
+    """몬스터 공통 로직: 크기/스탯 로딩, 이미지 스프라이트, AI 이동·투사체 쿨다운.
+
+    위치/속도/순찰 구간은 BatchField 라서 월드의 MonsterBatch 에 들어가면 배열 칸의 뷰가 된다.
+    스탯은 MONSTER_DB 를 복사한 몬스터별 MonsterStats 라서 개체별로 바꿔도 다른 몬스터에 번지지 않는다.
+    """
+    __slots__ = ("stats", "hp", "max_hp", "is_boss", "boss_last_shot", "boss_shot_cd", "_batch", "_slot",
+                 "_x", "_y", "_dx", "_dy", "_prev_x", "_prev_y", "_on_ground", "_target_player",
+                 "_left_bound", "_right_bound")
+    x = BatchField()
+    y = BatchField()
+    dx = BatchField()
+    dy = BatchField()
+    prev_x = BatchField()
+    prev_y = BatchField()
+    on_ground = BatchField()
+    target_player = BatchField()
+    left_bound = OptionalField()
+    right_bound = OptionalField()
+
+    def __init__(self, world, x, y, m_type):
+        self._batch, self._slot = None, -1
+        stats = MonsterStats(MONSTER_DB[m_type])
         if m_type in ["enemy0", "enemy1"]:
             w, h = 60, 78
         elif m_type == "enemy2":
@@ -96,11 +148,11 @@ class Monster(Entity):
             w, h = 60, 94
         else:
             w, h = 40, 40
-        super().__init__(canvas, x, y, w, h, data["color"])
-        self.data = data
-        self.hp = data["hp"]
-        self.max_hp = data["hp"]
-        self.dx = data["speed"] 
+        super().__init__(world, x, y, w, h, stats.color)
+        self.stats = stats
+        self.hp = stats.hp
+        self.max_hp = stats.hp
+        self.dx = stats.speed
         self.left_bound = None
         self.right_bound = None
         self.target_player = False
@@ -110,32 +162,27 @@ class Monster(Entity):
 
         if m_type in ["enemy0", "enemy1", "enemy2", "Boss", "enemy3"]:
             try:
-                if not hasattr(Monster, "_img_cache"):
-                    Monster._img_cache = {}
                 if m_type == "enemy0":
-                    key, file = "enemy0", "image/enemy0.png"
+                    file = "image/enemy0.png"
                 elif m_type == "enemy1":
-                    key, file = "enemy1", "image/enemy1.png"
+                    file = "image/enemy1.png"
                 elif m_type == "enemy2":
-                    key, file = "enemy2", "image/enemy2.png"
+                    file = "image/enemy2.png"
                 elif m_type == "Boss":
-                    key, file = "boss", "image/boss.png"
+                    file = "image/boss.png"
                 else:
-                    key, file = "enemy3", "image/enemy3.png"
-                if key not in Monster._img_cache:
-                    Monster._img_cache[key] = tk.PhotoImage(file=file)
-                img = Monster._img_cache[key]
-                self.canvas.delete(self.body)
-                self.body = self.canvas.create_image(self.x, self.y, image=img, anchor="nw")
+                    file = "image/enemy3.png"
+                self.image = sprites.png_frame(file)
             except Exception:
                 pass
+        self.refresh_hitbox()
 
     def update_physics(self, map_data):
         """플레이어 추적 옵션/플랫폼 한계 적용 후 기본 물리 처리."""
-        if self.target_player and not self.is_boss and hasattr(self.canvas, "game_instance") and self.canvas.game_instance.player:
-            px = self.canvas.game_instance.player.x
+        if self.target_player and not self.is_boss and self.world.player:
+            px = self.world.player.x
             if abs(px - self.x) > 2:
-                self.dx = self.data["speed"] if px > self.x else -self.data["speed"]
+                self.dx = self.stats.speed if px > self.x else -self.stats.speed
         super().update_physics(map_data)
         if self.left_bound is not None and self.right_bound is not None:
             if self.x < self.left_bound:
@@ -144,14 +191,27 @@ class Monster(Entity):
             elif self.x > self.right_bound - self.w:
                 self.x = self.right_bound - self.w
                 self.dx = -abs(self.dx)
+        self.world.monster_index.update(self, self.hitbox)
 
 
 class Player(Entity):
     """플레이어 캐릭터: 스탯, 상태 플래그, 공격/스킬/애니메이션·사운드 제어."""
-    def __init__(self, canvas, x, y, char_type="iron"):
-        self.canvas = canvas
+    __slots__ = Entity.KINEMATIC_SLOTS + ("char_type", "level", "exp", "max_exp", "hp", "max_hp", "base_atk", "base_def",
+                 "equip_atk", "equip_def", "inventory", "equipped",
+                 "is_attacking", "is_dashing", "invincible", "dash_cooldown", "can_dash_cancel",
+                 "last_tap_key", "last_tap_time", "z_press_time", "d_press_time", "is_casting", "is_firing",
+                 "fire_start_time", "plasma_hits", "float_dmg_timer", "must_release_d",
+                 "combo_step", "last_atk_time", "attack_cooldown", "is_skilling", "skill_end_pending",
+                 "skill_hit_targets", "skill_render_x", "skill_anchor", "combo_imgs", "attack_hit_consumed",
+                 "walk_sound_playing", "plasma_sound_playing", "draw_anchor", "dash_visual_x",
+                 "frames", "jump_imgs", "beam_imgs", "anim", "current_dir", "dir_id", "action_id", "frame_index", "anim_timer")
+    animated = True
+    def __init__(self, world, x, y, char_type="iron"):
+        self.world = world
+        self.eid = world.new_id()
         self.char_type = char_type
         self.x, self.y = float(x), float(y)
+        self.prev_x, self.prev_y = self.x, self.y
         self.dx, self.dy = 0.0, 0.0
         self.on_ground = False
         
@@ -184,6 +244,7 @@ class Player(Entity):
         self.last_tap_time = 0.0
 
         self.z_press_time = 0.0
+        self.d_press_time = 0.0
         self.is_casting = False     
         self.is_firing = False      
         self.fire_start_time = 0.0
@@ -220,44 +281,26 @@ class Player(Entity):
         self.beam_imgs = {}
 
         try:
-            prefix = f"{char_type}_"
+            prefix = f"image/{char_type}_"
             
             if self.char_type in ["strider", "stranger", "freischutz"]:
                 try:
-                    img_r = tk.PhotoImage(file=f"image/{prefix}idle_right.png")
-                    img_l = tk.PhotoImage(file=f"image/{prefix}idle_left.png")
+                    img_r = sprites.png_frame(f"{prefix}idle_right.png")
+                    img_l = sprites.png_frame(f"{prefix}idle_left.png")
                     self.frames["right_idle"].append(img_r)
                     self.frames["left_idle"].append(img_l)
                     
                     if self.char_type == "freischutz":
-                         for d in ["right", "left"]:
-                            idx = 0
-                            while True:
-                                try:
-                                    img = tk.PhotoImage(file=f"image/{prefix}walk_{d}.gif", format=f"gif -index {idx}")
-                                    self.frames[f"{d}_walk"].append(img)
-                                    idx += 1
-                                except: break
+                        for d in ["right", "left"]:
+                            self.frames[f"{d}_walk"] = sprites.gif_frames(f"{prefix}walk_{d}.gif")
                     else:
                         self.frames["right_walk"].append(img_r)
                         self.frames["left_walk"].append(img_l)
-                except: pass
+                except Exception: pass
             else: 
                 for d in ["right", "left"]:
-                    idx = 0
-                    while True:
-                        try:
-                            img = tk.PhotoImage(file=f"image/{prefix}walk_{d}.gif", format=f"gif -index {idx}")
-                            self.frames[f"{d}_walk"].append(img)
-                            idx += 1
-                        except tk.TclError: break
-                    idx = 0
-                    while True:
-                        try:
-                            img = tk.PhotoImage(file=f"image/{prefix}idle_{d}.gif", format=f"gif -index {idx}")
-                            self.frames[f"{d}_idle"].append(img)
-                            idx += 1
-                        except tk.TclError: break
+                    self.frames[f"{d}_walk"] = sprites.gif_frames(f"{prefix}walk_{d}.gif")
+                    self.frames[f"{d}_idle"] = sprites.gif_frames(f"{prefix}idle_{d}.gif")
 
             action_list = ["attack"]
             if self.char_type == "strider": action_list.append("dash")
@@ -266,48 +309,55 @@ class Player(Entity):
 
             for action in action_list:
                 for d in ["right", "left"]:
-                    idx = 0
-                    while True:
-                        try:
-                            img = tk.PhotoImage(file=f"image/{prefix}{action}_{d}.gif", format=f"gif -index {idx}")
-                            self.frames[f"{d}_{action}"].append(img)
-                            idx += 1
-                        except tk.TclError: break
+                    self.frames[f"{d}_{action}"] = sprites.gif_frames(f"{prefix}{action}_{d}.gif")
             
             for d in ["right", "left"]:
-                self.jump_imgs[f"{d}_prep"] = tk.PhotoImage(file=f"image/{prefix}jump_prep_{d}.png")
+                self.jump_imgs[f"{d}_prep"] = sprites.png_frame(f"{prefix}jump_prep_{d}.png")
                 
                 if self.char_type == "strider":
-                    self.jump_imgs[f"{d}_rise"] = tk.PhotoImage(file=f"image/{prefix}jump_air_{d}.png")
-                    self.jump_imgs[f"{d}_fall"] = tk.PhotoImage(file=f"image/{prefix}jump_land_{d}.png")
+                    self.jump_imgs[f"{d}_rise"] = sprites.png_frame(f"{prefix}jump_air_{d}.png")
+                    self.jump_imgs[f"{d}_fall"] = sprites.png_frame(f"{prefix}jump_land_{d}.png")
                 else:
-                    self.jump_imgs[f"{d}_rise"] = tk.PhotoImage(file=f"image/{prefix}jump_rise_{d}.png")
-                    self.jump_imgs[f"{d}_fall"] = tk.PhotoImage(file=f"image/{prefix}jump_fall_{d}.png")
+                    self.jump_imgs[f"{d}_rise"] = sprites.png_frame(f"{prefix}jump_rise_{d}.png")
+                    self.jump_imgs[f"{d}_fall"] = sprites.png_frame(f"{prefix}jump_fall_{d}.png")
                 
                 if self.char_type == "stranger":
-                    self.beam_imgs[f"{d}_beam"] = tk.PhotoImage(file=f"image/{prefix}beam_{d}.png")
+                    self.beam_imgs[f"{d}_beam"] = sprites.png_frame(f"{prefix}beam_{d}.png")
                 
                 if self.char_type == "freischutz":
-                    self.combo_imgs[f"{d}_1"] = tk.PhotoImage(file=f"image/{prefix}attack1_{d}.png")
-                    self.combo_imgs[f"{d}_2"] = tk.PhotoImage(file=f"image/{prefix}attack2_{d}.png")
-                    self.combo_imgs[f"{d}_3"] = tk.PhotoImage(file=f"image/{prefix}attack3_{d}.png")
+                    self.combo_imgs[f"{d}_1"] = sprites.png_frame(f"{prefix}attack1_{d}.png")
+                    self.combo_imgs[f"{d}_2"] = sprites.png_frame(f"{prefix}attack2_{d}.png")
+                    self.combo_imgs[f"{d}_3"] = sprites.png_frame(f"{prefix}attack3_{d}.png")
 
         except Exception as e:
             print(f"이미지 로딩 실패: {e}")
             self.frames = None
 
+        self.anim = ClipTable(char_type, self.frames, self.jump_imgs, self.beam_imgs, self.combo_imgs) if self.frames else None
         self.current_dir = "right"
-        self.current_action = "idle"
+        self.dir_id = RIGHT
+        self.action_id = IDLE
         self.frame_index = 0
         self.anim_timer = 0
         
+        self.color = "blue"
+        self.visible = True
         if self.frames and self.frames["right_idle"]:
-            self.body = canvas.create_image(
-                x + (self.w/2), y + self.h, 
-                image=self.frames["right_idle"][0], anchor="s"
-            )
+            self.image = self.frames["right_idle"][0]
         else:
-            self.body = canvas.create_rectangle(x, y, x+self.w, y+self.h, fill="blue")
+            self.image = None
+        self.refresh_hitbox()
+
+    def sprite_keys(self):
+        """이 캐릭터가 쓰는 모든 프레임 키 (전직/시작 시 미리 디코딩용)."""
+        keys = []
+        if self.frames:
+            for frame_list in self.frames.values():
+                keys.extend(frame_list)
+        keys.extend(self.jump_imgs.values())
+        keys.extend(self.beam_imgs.values())
+        keys.extend(self.combo_imgs.values())
+        return keys
 
     @property
     def atk(self): return self.base_atk + self.equip_atk
@@ -315,16 +365,16 @@ class Player(Entity):
     def total_def(self): return self.base_def + self.equip_def
 
     def update_physics(self, map_data):
-        """상태에 따른 중력/이동 잠금, 충돌 처리, 스프라이트 정렬/앵커 반영."""
+        """상태에 따른 중력/이동 잠금, 충돌 처리, 애니메이션 갱신."""
         gravity_factor = 1.0
         
-        if hasattr(self, 'is_dashing') and self.is_dashing:
+        if self.is_dashing:
             gravity_factor = 0.0
             self.dy = 0
             self.dx = 0
         elif self.char_type == "freischutz" and (self.is_attacking or self.is_skilling):
             self.dx = 0
-        elif hasattr(self, 'is_floating') and self.is_floating:
+        elif self.is_floating:
             gravity_factor = 0.2
             
         self.dy += (GRAVITY * gravity_factor)
@@ -333,54 +383,43 @@ class Player(Entity):
         self.y += self.dy
         self.check_col(map_data, "y")
         
-        item_type = self.canvas.type(self.body)
-        if item_type == "image":
-            if hasattr(self, 'update_animation'):
-                self.update_animation()
-
-            base_x = self.x + (self.w / 2)
-            base_y = self.y + self.h
-            offset_x = 0
-
-            if self.char_type == "freischutz" and self.is_skilling:
-                render_x = self.skill_render_x if self.skill_render_x else base_x
-                self.canvas.coords(self.body, render_x, base_y)
-                self.canvas.itemconfig(self.body, anchor=self.skill_anchor)
-                return
-            elif self.char_type == "stranger" and (self.is_firing or self.is_casting):
-                if self.current_dir == "right":
-                    self.canvas.coords(self.body, self.x, self.y + self.h)
-                    self.canvas.itemconfig(self.body, anchor="sw")
-                    return
-                else:
-                    self.canvas.coords(self.body, self.x + self.w, self.y + self.h)
-                    self.canvas.itemconfig(self.body, anchor="se")
-                    return
-            elif hasattr(self, 'is_dashing') and self.is_dashing:
-                base_x = self.dash_visual_x
-
-            self.canvas.coords(self.body, base_x + offset_x, base_y)
-            self.canvas.itemconfig(self.body, anchor="s")
-        else:
-            self.canvas.coords(self.body, self.x, self.y, self.x + self.w, self.y + self.h)
+        if self.image is not None:
+            self.update_animation()
+        self.refresh_hitbox()
+
+    def sprite_pos(self):
+        """상태별 스프라이트 정렬: 스킬/플라즈마는 좌·우 끝 기준, 대시는 궤적 중앙."""
+        base_x = self.x + (self.w / 2)
+        base_y = self.y + self.h
+
+        if self.char_type == "freischutz" and self.is_skilling:
+            render_x = self.skill_render_x if self.skill_render_x else base_x
+            return render_x, base_y, self.skill_anchor
+        elif self.char_type == "stranger" and (self.is_firing or self.is_casting):
+            if self.current_dir == "right":
+                return self.x, base_y, "sw"
+            return self.x + self.w, base_y, "se"
+        elif self.is_dashing:
+            base_x = self.dash_visual_x
+        return base_x, base_y, "s"
 
     def attack_trigger(self):
         """기본 공격 시작 처리(쿨다운/콤보/사운드 설정)."""
         if self.is_attacking or self.is_casting or self.is_firing or self.is_skilling: return
         self.is_attacking = True
         self.attack_hit_consumed = False
-        gi = getattr(self.canvas, "game_instance", None)
+        gi = self.world
         if self.char_type == "strider":
             self.can_dash_cancel = True
-            self.canvas.after(500, lambda: setattr(self, 'can_dash_cancel', False))
+            self.world.after(500, lambda: setattr(self, 'can_dash_cancel', False), stage=False)
             if gi: gi.play_sound("strider_attack")
         if self.char_type == "freischutz":
-            now = time.time()
+            now = self.world.now
             if now - self.last_atk_time > 1.0: self.combo_step = 1
             self.last_atk_time = now
             duration = 250 if self.combo_step < 3 else 300
             self.update_animation()
-            self.canvas.after(duration, self.end_attack_freischutz)
+            self.world.after(duration, self.end_attack_freischutz, stage=False)
             if gi: gi.play_sound("freischutz_attack")
         elif self.char_type == "iron":
             if gi: gi.play_sound("iron_attack")
@@ -410,22 +449,18 @@ class Player(Entity):
         if not self.is_attacking and not self.is_dashing:
             self.is_casting = True
             self.is_firing = False
-            self.d_press_time = time.time()
+            self.d_press_time = self.world.now
             self.fire_start_time = 0.0
             self.plasma_hits = 0
             self.frame_index = 0
             self.anim_timer = 0
             self.plasma_sound_playing = False
-            has_cast = False
-            if self.frames:
-                cast_list = self.frames.get(f"{self.current_dir}_cast")
-                has_cast = bool(cast_list)
-            if not has_cast:
+            if not (self.anim and self.anim.clips[self.dir_id][CAST]):
                 self.is_casting = False
                 self.is_firing = True
-                self.fire_start_time = time.time()
+                self.fire_start_time = self.world.now
                 self.plasma_hits = 0
-                gi = getattr(self.canvas, "game_instance", None)
+                gi = self.world
                 if gi: gi.play_sound("stranger_plasma", loop=True)
                 self.plasma_sound_playing = True
 
@@ -433,7 +468,7 @@ class Player(Entity):
         self.is_casting = False
         self.is_firing = False
         if self.plasma_sound_playing:
-            gi = getattr(self.canvas, "game_instance", None)
+            gi = self.world
             if gi: gi.stop_sound("stranger_plasma")
             self.plasma_sound_playing = False
         self.float_dmg_timer = 0
@@ -452,11 +487,9 @@ class Player(Entity):
             self.skill_hit_targets = set()
             self.skill_render_x = self.x + (self.w / 2)
             self.skill_anchor = "sw" if self.current_dir == "right" else "se"
-            self.canvas.coords(self.body, self.skill_render_x, self.y + self.h)
-            self.canvas.itemconfig(self.body, anchor=self.skill_anchor)
             self.frame_index = 0
             self.anim_timer = 0
-            gi = getattr(self.canvas, "game_instance", None)
+            gi = self.world
             if gi: gi.play_sound("freischutz_skill")
             self.update_animation()
 
@@ -467,13 +500,13 @@ class Player(Entity):
         self.frame_index = 0
         self.anim_timer = 0
 
-    def update_plasma(self, monster_list, game_instance):
+    def update_plasma(self):
         """발사 중 주기적(최대 3회) 빔 판정/데미지 적용, 종료 타이밍 관리."""
         if not self.is_firing:
             return
         if self.fire_start_time == 0.0:
-            self.fire_start_time = time.time()
-        elapsed = time.time() - self.fire_start_time
+            self.fire_start_time = self.world.now
+        elapsed = self.world.now - self.fire_start_time
         if elapsed > 2.0:
             self.stop_plasma()
             self.must_release_d = True
@@ -489,87 +522,50 @@ class Player(Entity):
         else:
             bbox = (self.x - beam_len, self.y, self.x, self.y + self.h)
         beam_dmg = max(1, int(self.atk * 0.7))
-        for m in monster_list[:]:
-            mx1, my1, mx2, my2 = game_instance.get_bbox(m)
-            if not (bbox[2] < mx1 or bbox[0] > mx2 or bbox[3] < my1 or bbox[1] > my2):
-                if hasattr(game_instance, "can_damage_monster") and not game_instance.can_damage_monster(m):
-                    continue
-                m.hp -= beam_dmg
-                try:
-                    game_instance.create_damage_text(m.x, m.y, beam_dmg)
-                except Exception:
-                    pass
-                if m.hp <= 0:
-                    game_instance.kill_monster(m)
+        world = self.world
+        for m in world.combat.damage(world.combat.box(bbox), beam_dmg):
+            world.kill_monster(m)
         self.plasma_hits += 1
 
-    def toggle_floating(self, is_active, monster_list):
+    def toggle_floating(self, is_active):
         if self.char_type != "stranger": return
         if not self.on_ground and self.dy >= 0 and is_active:
             self.is_floating = True
             self.float_dmg_timer += 1
             if self.float_dmg_timer > 30:
                 self.float_dmg_timer = 0
-                r = STRANGER_CIRCLE_RANGE
-                cx, cy = self.x + self.w/2, self.y + self.h/2
-                bbox = (cx-r, cy-r, cx+r, cy+r)
-                for m in monster_list:
-                    mx1, my1, mx2, my2 = self.canvas.game_instance.get_bbox(m)
-                    if not (bbox[2] < mx1 or bbox[0] > mx2 or bbox[3] < my1 or bbox[1] > my2):
-                        if hasattr(self.canvas.game_instance, "can_damage_monster") and not self.canvas.game_instance.can_damage_monster(m):
-                            continue
-                        dmg = self.atk * 0.8
-                        m.hp -= dmg
-                        try:
-                            self.canvas.game_instance.create_damage_text(m.x, m.y, int(dmg))
-                        except Exception:
-                            pass
-                        if m.hp <= 0:
-                            self.canvas.game_instance.kill_monster(m)
+                combat = self.world.combat
+                dmg = self.atk * 0.8
+                hits = combat.circle(self.x + self.w/2, self.y + self.h/2, STRANGER_CIRCLE_RANGE)
+                for m in combat.damage(hits, dmg, int(dmg)):
+                    self.world.kill_monster(m)
         else:
             self.is_floating = False
             if not is_active:
                 self.float_dmg_timer = 0
 
-    def check_freischutz_hit(self, monster_list, is_skill=False):
+    def check_freischutz_hit(self, is_skill=False):
         atk_range = FREISCHUTZ_ATK_RANGE
         damage = self.atk if not is_skill else self.atk * 1.5
         if self.current_dir == "right":
             atk_box = (self.x + self.w, self.y, self.x + self.w + atk_range, self.y + self.h)
         else:
             atk_box = (self.x - atk_range, self.y, self.x, self.y + self.h)
-        hits = []
-        for m in monster_list:
-            mx1, my1, mx2, my2 = self.canvas.game_instance.get_bbox(m)
-            if not (atk_box[2] < mx1 or atk_box[0] > mx2 or atk_box[3] < my1 or atk_box[1] > my2):
-                if hasattr(self.canvas.game_instance, "can_damage_monster") and not self.canvas.game_instance.can_damage_monster(m):
-                    continue
-                if is_skill:
-                    mid = id(m)
-                    if not hasattr(self, "skill_hit_targets"):
-                        self.skill_hit_targets = set()
-                    if mid in self.skill_hit_targets:
-                        continue
-                    self.skill_hit_targets.add(mid)
-                if self.current_dir == "right":
-                    dist = max(0, mx1 - (self.x + self.w))
-                else:
-                    dist = max(0, self.x - mx2)
-                hits.append((m, dist))
+        combat = self.world.combat
+        hits = combat.box(atk_box, exclude=self.skill_hit_targets if is_skill else None)
         if not hits:
             return
-        if not is_skill:
-            if getattr(self, "attack_hit_consumed", False):
+        if is_skill:
+            self.skill_hit_targets.update(m.eid for m in hits)
+        else:
+            if self.attack_hit_consumed:
                 return
-            hits = [min(hits, key=lambda x: x[1])]
-        for m, _ in hits:
-            if hasattr(self.canvas.game_instance, "can_damage_monster") and not self.canvas.game_instance.can_damage_monster(m):
-                continue
-            m.hp -= damage
-            try:
-                self.canvas.game_instance.create_damage_text(m.x, m.y, damage)
-            except Exception:
-                pass
+            if self.current_dir == "right":
+                front = self.x + self.w
+                hits = [min(hits, key=lambda m: max(0, self.world.get_bbox(m)[0] - front))]
+            else:
+                hits = [min(hits, key=lambda m: max(0, self.x - self.world.get_bbox(m)[2]))]
+        combat.damage(hits, damage)
         if not is_skill:
             self.attack_hit_consumed = True
 
@@ -578,47 +574,30 @@ class Player(Entity):
         actual_dmg = max(1, dmg - self.total_def)
         self.hp -= actual_dmg
         self.invincible = 30 
-        self.canvas.itemconfig(self.body, state='hidden')
-        self.canvas.after(100, lambda: self.canvas.itemconfig(self.body, state='normal'))
+        self.visible = False
+        self.world.after(100, lambda: setattr(self, 'visible', True), stage=False)
 
-    def dash_skill(self, direction, monster_list, map_data=None):
-        """스트라이더 대시: 벽 충돌 고려 이동, 즉시 렌더, 경로 내 몬스터 판정."""
+    def dash_skill(self, direction, map_data=None):
+        """스트라이더 대시: 지형 스윕 한 번으로 벽 앞까지 이동, 즉시 렌더, 이동 구간 스윕으로 몬스터 판정."""
         if self.dash_cooldown > 0: return []
         
         self.is_attacking = False
         self.is_dashing = True
         self.frame_index = 0
         self.anim_timer = 0
-        gi = getattr(self.canvas, "game_instance", None)
+        gi = self.world
         if gi: gi.play_sound("strider_dash")
         
-        dist = STRIDER_DASH_RANGE
         start_x = self.x
         sign = 1 if direction == "right" else -1
-        step = TILE_SIZE / 4
-        remaining = abs(dist)
-        sim_x = self.x
-        max_x = MAP_WIDTH - self.w
-        while remaining > 0:
-            move = min(step, remaining) * sign
-            next_x = sim_x + move
-            next_x = max(0, min(max_x, next_x))
-            if map_data is not None:
-                left = int(next_x / TILE_SIZE)
-                right = int((next_x + self.w - 0.1) / TILE_SIZE)
-                top = int(self.y / TILE_SIZE)
-                bottom = int((self.y + self.h - 0.1) / TILE_SIZE)
-                if sign > 0:
-                    if self.is_wall(map_data, top, right) or self.is_wall(map_data, bottom, right):
-                        break
-                else:
-                    if self.is_wall(map_data, top, left) or self.is_wall(map_data, bottom, left):
-                        break
-            sim_x = next_x
-            remaining -= step
-            if next_x == 0 or next_x == max_x:
-                break
-        self.x = sim_x
+        target_x = max(0, min(MAP_WIDTH - self.w, start_x + STRIDER_DASH_RANGE * sign))
+        move = target_x - start_x
+        if map_data is not None and move:
+            hit = self.world.stage.cast_box(start_x, self.y, self.w, self.h, move, 0)
+            if hit is not None:
+                # check_col 과 같은 0.1 여유를 두고 벽 앞에 멈춘다
+                target_x = start_x if hit[1] is None else max(0, min(MAP_WIDTH - self.w, start_x + move * hit[0] - 0.1 * sign))
+        self.x = target_x
         actual_dist = self.x - start_x
         self.dash_visual_x = start_x + (self.w / 2) + (actual_dist / 2)
 
@@ -628,138 +607,71 @@ class Player(Entity):
         
         if self.frames["right_dash"]:
             self.update_animation() 
-            self.canvas.coords(self.body, self.dash_visual_x, self.y + self.h)
-            self.canvas.itemconfig(self.body, anchor="s")
         
-        dead_monsters = []
-        dash_box = (min(start_x, self.x), self.y, max(start_x, self.x) + self.w, self.y + self.h)
-        for m in monster_list:
-            mx1, my1, mx2, my2 = self.canvas.game_instance.get_bbox(m)
-            if not (dash_box[2] < mx1 or dash_box[0] > mx2 or dash_box[3] < my1 or dash_box[1] > my2):
-                if hasattr(self.canvas.game_instance, "can_damage_monster") and not self.canvas.game_instance.can_damage_monster(m):
-                    continue
-                damage = (self.atk * 1.5)
-                m.hp -= damage
-                try:
-                    self.canvas.game_instance.create_damage_text(m.x, m.y, int(damage))
-                except Exception:
-                    pass
-                if m.hp <= 0: dead_monsters.append(m)
+        combat = self.world.combat
+        damage = self.atk * 1.5
+        start_box = (start_x, self.y, start_x + self.w, self.y + self.h)
+        dead_monsters = combat.damage(combat.sweep(start_box, actual_dist, 0), damage, int(damage))
         
-        self.canvas.after(300, lambda: setattr(self, 'is_dashing', False))
+        self.world.after(300, lambda: setattr(self, 'is_dashing', False), stage=False)
         return dead_monsters
 
     def update_animation(self):
-        """상태에 따라 액션 결정 후 프레임/사운드 교체 및 종료 조건 처리."""
-        if not self.frames: return
+        """상태 플래그로 동작 ID 를 고르고, 컴파일된 클립 표(self.anim)로 프레임/사운드 교체 및 종료 처리."""
+        anim = self.anim
+        if not anim: return
         if self.dash_cooldown > 0: self.dash_cooldown -= 1
         if self.attack_cooldown > 0: self.attack_cooldown -= 1
 
-        if self.dx > 0: self.current_dir = "right"
-        elif self.dx < 0: self.current_dir = "left"
-        
-        next_action = "idle"
-        if self.is_dashing: next_action = "dash"
-        elif self.is_skilling: next_action = "skill"
-        elif self.is_firing: next_action = "cast" 
-        elif self.is_casting: next_action = "cast"
-        elif self.is_attacking: next_action = "attack"
-        elif not self.on_ground: next_action = "jump"
-        elif self.dx != 0: next_action = "walk"
-        else: next_action = "idle"
-
-        if next_action != self.current_action:
+        if self.dx > 0:
+            self.current_dir = "right"
+            self.dir_id = RIGHT
+        elif self.dx < 0:
+            self.current_dir = "left"
+            self.dir_id = LEFT
+
+        if self.is_dashing: action = DASH
+        elif self.is_skilling: action = SKILL
+        elif self.is_firing or self.is_casting: action = CAST
+        elif self.is_attacking: action = ATTACK
+        elif not self.on_ground: action = JUMP
+        elif self.dx != 0: action = WALK
+        else: action = IDLE
+
+        if action != self.action_id:
             self.frame_index = 0
             self.anim_timer = 0
-            self.current_action = next_action
+            self.action_id = action
 
+        d = self.dir_id
         final_image = None
-        
-        if next_action == "jump":
+        if action == JUMP:
+            prep, rise, fall = anim.jump[d]
             if self.dy < -5:
-                final_image = self.jump_imgs.get(f"{self.current_dir}_prep")
+                final_image = prep
+            elif self.char_type == "stranger" and self.is_floating:
+                final_image = fall
             else:
-                if self.char_type == "stranger" and self.is_floating:
-                    final_image = self.jump_imgs.get(f"{self.current_dir}_fall")
-                else:
-                    final_image = self.jump_imgs.get(f"{self.current_dir}_rise")
-        
-        elif next_action == "cast":
-            current_list = self.frames.get(f"{self.current_dir}_cast") if self.frames else None
-            if self.is_firing:
-                final_image = self.beam_imgs.get(f"{self.current_dir}_beam")
-                if not self.plasma_sound_playing:
-                    gi = getattr(self.canvas, "game_instance", None)
-                    if gi: gi.play_sound("stranger_plasma", loop=True)
+                final_image = rise
+        elif action == CAST:
+            clip = anim.clips[d][CAST]
+            if self.is_firing or not clip:
+                final_image = anim.beam[d]
+                if self.is_firing and not self.plasma_sound_playing:
+                    self.world.play_sound("stranger_plasma", loop=True)
                     self.plasma_sound_playing = True
-            elif current_list:
-                self.anim_timer += 1
-                if self.anim_timer > 5:
-                    self.frame_index += 1
-                    self.anim_timer = 0
-                    if self.frame_index >= len(current_list):
-                        self.is_casting = False
-                        self.is_firing = True
-                        self.fire_start_time = time.time()
-                        self.frame_index = len(current_list) - 1
-                        if not self.plasma_sound_playing:
-                            gi = getattr(self.canvas, "game_instance", None)
-                            if gi: gi.play_sound("stranger_plasma", loop=True)
-                            self.plasma_sound_playing = True
-                final_image = current_list[self.frame_index]
             else:
-                final_image = self.beam_imgs.get(f"{self.current_dir}_beam")
-
-        elif next_action == "attack" and self.char_type == "freischutz":
-            final_image = self.combo_imgs.get(f"{self.current_dir}_{self.combo_step}")
-
+                final_image = self.step_clip(clip)
+        elif action == ATTACK and anim.combo:
+            final_image = anim.combo[d][self.combo_step]
         else:
-            current_list = self.frames.get(f"{self.current_dir}_{next_action}")
-            if current_list:
-                if len(current_list) == 1:
-                    final_image = current_list[0]
-                else:
-                    self.anim_timer += 1
-                    
-                    threshold = 5
-                    max_len = len(current_list) 
-                    
-                    if next_action == "attack":
-                        if self.char_type == "strider":
-                            threshold = 5
-                            max_len = 2
-                        else:
-                            threshold = 6
-                    elif next_action == "dash": 
-                        threshold = 2
-                    elif next_action == "skill":
-                        threshold = 6
-                    
-                    if self.anim_timer > threshold:
-                        self.frame_index += 1
-                        self.anim_timer = 0
-                    
-                    if self.frame_index >= max_len: 
-                        if next_action == "attack": 
-                            self.is_attacking = False
-                            self.frame_index = 0
-                        elif next_action == "dash":
-                            self.is_dashing = False
-                            self.frame_index = 0
-                        elif next_action == "skill":
-                            self.frame_index = max_len - 1
-                            if not self.skill_end_pending:
-                                self.skill_end_pending = True
-                                self.canvas.after(120, self.finish_skill)
-                        else:
-                            self.frame_index = 0
-                    
-                    safe_index = min(self.frame_index, len(current_list) - 1)
-                    final_image = current_list[safe_index]
+            clip = anim.clips[d][action]
+            if clip:
+                final_image = self.step_clip(clip)
 
-        gi = getattr(self.canvas, "game_instance", None)
+        gi = self.world
         if self.char_type == "iron":
-            if next_action == "walk":
+            if action == WALK:
                 if not self.walk_sound_playing and gi:
                     gi.play_loop("iron_walk")
                     self.walk_sound_playing = True
@@ -769,4 +681,37 @@ class Player(Entity):
                 self.walk_sound_playing = False
 
         if final_image:
-            self.canvas.itemconfig(self.body, image=final_image)
+            self.image = final_image
+
+    def step_clip(self, clip):
+        """클립 한 틱 진행: 문턱값을 넘기면 다음 프레임, 끝에 닿으면 클립의 END_* 처리. 보여줄 프레임 키를 돌려준다."""
+        if clip.static:
+            return clip.frames[0]
+        self.anim_timer += 1
+        if self.anim_timer > clip.threshold:
+            self.frame_index += 1
+            self.anim_timer = 0
+        if self.frame_index >= clip.length:
+            end = clip.end
+            if end == END_ATTACK:
+                self.is_attacking = False
+                self.frame_index = 0
+            elif end == END_DASH:
+                self.is_dashing = False
+                self.frame_index = 0
+            elif end == END_SKILL:
+                self.frame_index = clip.length - 1
+                if not self.skill_end_pending:
+                    self.skill_end_pending = True
+                    self.world.after(120, self.finish_skill, stage=False)
+            elif end == END_CAST:
+                self.is_casting = False
+                self.is_firing = True
+                self.fire_start_time = self.world.now
+                self.frame_index = clip.length - 1
+                if not self.plasma_sound_playing:
+                    self.world.play_sound("stranger_plasma", loop=True)
+                    self.plasma_sound_playing = True
+            else:
+                self.frame_index = 0
+        return clip.frames[min(self.frame_index, clip.last)]
@@ -0,0 +1,561 @@
+﻿"""디스플레이·사운드 장치 없이 AdventureRPGGame 을 그대로 돌리는 가짜 Tk/pygame.mixer 백엔드.
+
+FakeCanvas 는 아이템을 메모리에 기록하고 (종류·좌표·옵션·태그) 좌표와 이미지 크기로 bbox 를 계산하며,
+메서드별 호출 횟수를 ops 에 센다. FakeRoot.after 는 가상 시계 위의 힙으로 콜백을 돌리므로
+FixedTimestep 의 clock 을 root.time 으로 바꾸면 game_core/entities 코드가 수정 없이 실시간보다 빠르게 진행된다.
+FakePhotoImage 는 PNG/GIF 헤더만 읽어 크기를 알고 픽셀은 디코딩하지 않는다.
+
+사용법:
+    with installed():
+        game = make_game()
+        run_until_loaded(game)
+        run_ticks(game, 600)
+        print(canvas_ops(game))
+"""
+import base64
+import contextlib
+import heapq
+import itertools
+import struct
+from collections import Counter
+
+import pygame
+import tkinter as tk
+
+from constants import *
+from assets import ASSETS
+import sprites
+
+
+class FakeImageTk:
+    """PhotoImage.tk 자리: renderer 의 img.tk.call(name, "copy", ...) 같은 Tcl 호출을 세기만 한다."""
+    def __init__(self, ops):
+        self.ops = ops
+
+    def call(self, *args):
+        self.ops[args[1] if len(args) > 1 else args[0]] += 1
+        return ""
+
+
+class FakePhotoImage:
+    """tk.PhotoImage 대역: 크기는 width/height 인자 또는 data/file 의 PNG·GIF 헤더에서 얻는다."""
+    ops = Counter()
+    _ids = itertools.count(1)
+
+    def __init__(self, name=None, cnf=None, master=None, data=None, file=None, format=None,
+                 width=0, height=0, **kw):
+        self.name = name or f"pyimage{next(self._ids)}"
+        self.format = format
+        self.tk = FakeImageTk(self.ops)
+        if file is not None:
+            with open(file, "rb") as f:
+                data = f.read()
+        w = h = 0
+        if data is not None:
+            w, h = self._header_size(data)
+        self._width = int(width) or w
+        self._height = int(height) or h
+        self.ops["create"] += 1
+
+    @staticmethod
+    def _header_size(data):
+        if isinstance(data, str):
+            data = base64.b64decode(data)
+        if data[:8] == b"\x89PNG\r\n\x1a\n":
+            return struct.unpack(">II", data[16:24])
+        if data[:6] in (b"GIF87a", b"GIF89a"):
+            w, h, _ = sprites._gif_info(data)
+            return w, h
+        raise tk.TclError("couldn't recognize image data")
+
+    def width(self):
+        return self._width
+
+    def height(self):
+        return self._height
+
+    def put(self, data, to=None):
+        self.ops["put"] += 1
+
+    def blank(self):
+        self.ops["blank"] += 1
+
+    def __str__(self):
+        return self.name
+
+
+class FakeItem:
+    __slots__ = ("kind", "coords", "options", "tags")
+
+    def __init__(self, kind, coords, options, tags):
+        self.kind = kind
+        self.coords = coords
+        self.options = options
+        self.tags = tags
+
+
+def _flat_coords(args):
+    if len(args) == 1 and isinstance(args[0], (list, tuple)):
+        args = args[0]
+    out = []
+    for a in args:
+        if isinstance(a, (list, tuple)):
+            out.extend(float(v) for v in a)
+        else:
+            out.append(float(a))
+    return out
+
+
+def _tag_tuple(tags):
+    if tags is None:
+        return ()
+    if isinstance(tags, str):
+        return tuple(tags.split())
+    return tuple(tags)
+
+
+class FakeCanvas:
+    """tk.Canvas 대역. 아이템 id 는 Tk 처럼 1 부터 증가하는 정수, 태그/"all" 로도 지정할 수 있다."""
+    def __init__(self, master=None, cnf=None, **options):
+        self.master = master
+        self.options = dict(options)
+        self.items = {}
+        self.ops = Counter()
+        self._next_id = 1
+
+    # 생성
+    def _create(self, kind, args, options):
+        self.ops["create_" + kind] += 1
+        item = self._next_id
+        self._next_id += 1
+        tags = _tag_tuple(options.pop("tags", None))
+        self.items[item] = FakeItem(kind, _flat_coords(args), options, tags)
+        return item
+
+    def create_image(self, *args, **options):
+        return self._create("image", args, options)
+
+    def create_rectangle(self, *args, **options):
+        return self._create("rectangle", args, options)
+
+    def create_oval(self, *args, **options):
+        return self._create("oval", args, options)
+
+    def create_line(self, *args, **options):
+        return self._create("line", args, options)
+
+    def create_text(self, *args, **options):
+        return self._create("text", args, options)
+
+    # 조회/수정
+    def _find(self, tag_or_id):
+        if tag_or_id == "all":
+            return list(self.items)
+        if isinstance(tag_or_id, int) or (isinstance(tag_or_id, str) and tag_or_id.isdigit()):
+            item = int(tag_or_id)
+            return [item] if item in self.items else []
+        return [i for i, it in self.items.items() if tag_or_id in it.tags]
+
+    def find_withtag(self, tag_or_id):
+        self.ops["find_withtag"] += 1
+        return tuple(self._find(tag_or_id))
+
+    def find_all(self):
+        return tuple(self.items)
+
+    def type(self, tag_or_id):
+        found = self._find(tag_or_id)
+        return self.items[found[0]].kind if found else None
+
+    def coords(self, tag_or_id, *args):
+        self.ops["coords"] += 1
+        found = self._find(tag_or_id)
+        if not args:
+            return list(self.items[found[0]].coords) if found else []
+        values = _flat_coords(args)
+        for item in found:
+            self.items[item].coords = list(values)
+        return None
+
+    def move(self, tag_or_id, dx, dy):
+        self.ops["move"] += 1
+        for item in self._find(tag_or_id):
+            c = self.items[item].coords
+            for k in range(len(c)):
+                c[k] += dx if k % 2 == 0 else dy
+
+    def itemconfig(self, tag_or_id, cnf=None, **options):
+        self.ops["itemconfig"] += 1
+        if cnf:
+            options.update(cnf)
+        tags = options.pop("tags", None)
+        for item in self._find(tag_or_id):
+            it = self.items[item]
+            it.options.update(options)
+            if tags is not None:
+                it.tags = _tag_tuple(tags)
+
+    itemconfigure = itemconfig
+
+    def itemcget(self, tag_or_id, option):
+        found = self._find(tag_or_id)
+        if not found:
+            return ""
+        it = self.items[found[0]]
+        if option == "tags":
+            return " ".join(it.tags)
+        return it.options.get(option, "")
+
+    def delete(self, *tags_or_ids):
+        self.ops["delete"] += 1
+        for tag_or_id in tags_or_ids:
+            for item in self._find(tag_or_id):
+                del self.items[item]
+
+    def tag_bind(self, tag_or_id, sequence=None, func=None, add=None):
+        self.ops["tag_bind"] += 1
+
+    def bbox(self, *tags_or_ids):
+        """Tk 와 같은 규칙: 숨긴 아이템은 제외하고 대상 아이템들의 합집합 (정수), 없으면 None."""
+        self.ops["bbox"] += 1
+        boxes = []
+        for tag_or_id in tags_or_ids:
+            for item in self._find(tag_or_id):
+                box = self._item_bbox(self.items[item])
+                if box is not None:
+                    boxes.append(box)
+        if not boxes:
+            return None
+        return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+                max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+    def _item_bbox(self, it):
+        if it.options.get("state", self.options.get("state")) == "hidden" or not it.coords:
+            return None
+        if it.kind == "image":
+            img = it.options.get("image")
+            if not img:
+                return None
+            x, y = int(round(it.coords[0])), int(round(it.coords[1]))
+            return sprites.anchor_box(x, y, it.options.get("anchor", "center"), img.width(), img.height())
+        if it.kind == "text":
+            return self._text_bbox(it)
+        xs, ys = it.coords[0::2], it.coords[1::2]
+        pad = int(float(it.options.get("width", 1))) // 2 + 1
+        return (int(min(xs)) - pad, int(min(ys)) - pad, int(max(xs)) + pad, int(max(ys)) + pad)
+
+    @staticmethod
+    def _text_bbox(it):
+        """글꼴 메트릭이 없으므로 글자 폭을 크기의 0.6배, 줄 높이를 1.5배로 근사."""
+        font = it.options.get("font") or ("TkDefaultFont", 10)
+        size = abs(int(font[1])) if isinstance(font, (list, tuple)) and len(font) > 1 else 10
+        lines = str(it.options.get("text", "")).split("\n")
+        w = int(max(len(line) for line in lines) * size * 0.6)
+        h = int(len(lines) * size * 1.5)
+        x, y = int(it.coords[0]), int(it.coords[1])
+        return sprites.anchor_box(x, y, it.options.get("anchor", "center"), w, h)
+
+    # 위젯
+    def config(self, cnf=None, **options):
+        self.ops["config"] += 1
+        if cnf:
+            options.update(cnf)
+        self.options.update(options)
+
+    configure = config
+
+    def cget(self, option):
+        return self.options.get(option, "")
+
+    def xview_moveto(self, fraction):
+        self.ops["xview_moveto"] += 1
+        self.options["xview"] = fraction
+
+    def pack(self, **options):
+        pass
+
+    def update_idletasks(self):
+        self.ops["update_idletasks"] += 1
+
+    def update(self):
+        self.ops["update"] += 1
+
+    def destroy(self):
+        self.items.clear()
+
+    def after(self, ms, func=None, *args):
+        return self.master.after(ms, func, *args)
+
+    def after_cancel(self, after_id):
+        self.master.after_cancel(after_id)
+
+
+class FakeRoot:
+    """tk.Tk 대역: 창 관련 호출은 무시하고 after 콜백은 가상 시계(ms) 기준으로 실행한다."""
+    def __init__(self, screen=(1920, 1080)):
+        self.now_ms = 0.0
+        self.screen = screen
+        self.queue = []
+        self.cancelled = set()
+        self.bindings = {}
+        self.destroyed = False
+        self.geometry_spec = ""
+        self.title_text = ""
+        self.callbacks_run = 0
+        self._seq = itertools.count()
+
+    def time(self):
+        """FixedTimestep.clock 자리에 넣는 가상 시계 (초)."""
+        return self.now_ms / 1000.0
+
+    def after(self, ms, func=None, *args):
+        seq = next(self._seq)
+        heapq.heappush(self.queue, (self.now_ms + int(ms), seq, func, args))
+        return f"after#{seq}"
+
+    def after_idle(self, func, *args):
+        return self.after(0, func, *args)
+
+    def after_cancel(self, after_id):
+        self.cancelled.add(int(after_id.split("#")[1]))
+
+    def advance(self, ms):
+        """가상 시계를 ms 만큼 진행하며 그 사이 예정된 콜백을 시각 순서대로 실행."""
+        target = self.now_ms + ms
+        queue = self.queue
+        while queue and queue[0][0] <= target and not self.destroyed:
+            due, seq, func, args = heapq.heappop(queue)
+            if seq in self.cancelled:
+                self.cancelled.discard(seq)
+                continue
+            self.now_ms = max(self.now_ms, due)
+            self.callbacks_run += 1
+            func(*args)
+        self.now_ms = max(self.now_ms, target)
+
+    def bind(self, sequence, func=None, add=None):
+        self.bindings[sequence] = func
+
+    def title(self, text=None):
+        if text is not None:
+            self.title_text = text
+        return self.title_text
+
+    def geometry(self, spec=None):
+        if spec is not None:
+            self.geometry_spec = spec
+        return self.geometry_spec
+
+    def winfo_screenwidth(self):
+        return self.screen[0]
+
+    def winfo_screenheight(self):
+        return self.screen[1]
+
+    def protocol(self, name=None, func=None):
+        self.bindings[name] = func
+
+    def withdraw(self):
+        pass
+
+    def destroy(self):
+        self.destroyed = True
+        self.queue.clear()
+
+    def mainloop(self):
+        while self.queue and not self.destroyed:
+            self.advance(max(0.0, self.queue[0][0] - self.now_ms))
+
+
+class FakeChannel:
+    """재생이 끝나는 시점은 흉내 내지 않는다: play 후 stop 전까지 계속 재생 중으로 본다."""
+    def __init__(self, mixer, sound=None, loops=0):
+        self.mixer = mixer
+        self.sound = sound
+        self.loops = loops
+        self.busy = sound is not None
+
+    def play(self, sound, loops=0, maxtime=0, fade_ms=0):
+        self.mixer.ops["channel_play"] += 1
+        self.sound = sound
+        self.loops = loops
+        self.busy = True
+
+    def pause(self):
+        self.mixer.ops["channel_pause"] += 1
+
+    def unpause(self):
+        self.mixer.ops["channel_unpause"] += 1
+
+    def stop(self):
+        self.mixer.ops["channel_stop"] += 1
+        self.busy = False
+
+    def get_busy(self):
+        return self.busy
+
+    def set_volume(self, *volume):
+        self.mixer.ops["channel_set_volume"] += 1
+
+
+class FakeMusic:
+    def __init__(self, mixer):
+        self.mixer = mixer
+        self.busy = False
+        self.volume = 1.0
+
+    def load(self, filename, namehint=""):
+        self.mixer.ops["music_load"] += 1
+
+    def play(self, loops=0, start=0.0, fade_ms=0):
+        self.mixer.ops["music_play"] += 1
+        self.busy = True
+
+    def stop(self):
+        self.mixer.ops["music_stop"] += 1
+        self.busy = False
+
+    def get_busy(self):
+        return self.busy
+
+    def set_volume(self, volume):
+        self.volume = volume
+
+    def get_volume(self):
+        return self.volume
+
+
+class FakeMixer:
+    """pygame.mixer 대역: Sound 는 파일을 디코딩하지 않고 재생 호출만 센다."""
+    def __init__(self):
+        self.ops = Counter()
+        self.initialized = False
+        self.num_channels = 8
+        self.reserved = 0
+        self.channels = {}
+        self.music = FakeMusic(self)
+        mixer = self
+
+        class Sound:
+            def __init__(self, file=None, buffer=None, array=None):
+                self.file = file
+                self.volume = 1.0
+                mixer.ops["sound_load"] += 1
+
+            def play(self, loops=0, maxtime=0, fade_ms=0):
+                mixer.ops["sound_play"] += 1
+                return FakeChannel(mixer, self, loops)
+
+            def stop(self):
+                mixer.ops["sound_stop"] += 1
+
+            def set_volume(self, value):
+                self.volume = value
+
+            def get_volume(self):
+                return self.volume
+
+            def get_length(self):
+                return 0.0
+
+        self.Sound = Sound
+
+    def pre_init(self, *args, **kw):
+        pass
+
+    def init(self, *args, **kw):
+        self.initialized = True
+
+    def quit(self):
+        self.initialized = False
+
+    def get_init(self):
+        return (44100, -16, 2) if self.initialized else None
+
+    def stop(self):
+        self.ops["stop"] += 1
+
+    def set_num_channels(self, count):
+        self.num_channels = count
+
+    def get_num_channels(self):
+        return self.num_channels
+
+    def set_reserved(self, count):
+        self.reserved = count
+
+    def Channel(self, index):
+        if index not in self.channels:
+            self.channels[index] = FakeChannel(self)
+        return self.channels[index]
+
+
+@contextlib.contextmanager
+def installed():
+    """tk.Canvas / tk.PhotoImage / pygame.mixer 를 가짜로 바꾼다. 공유 이미지 캐시(ASSETS)는 들어갈 때와 나올 때 비운다."""
+    saved = (tk.Canvas, tk.PhotoImage, pygame.mixer)
+    mixer = FakeMixer()
+    tk.Canvas, tk.PhotoImage, pygame.mixer = FakeCanvas, FakePhotoImage, mixer
+    FakePhotoImage.ops.clear()
+    ASSETS.clear()
+    try:
+        yield mixer
+    finally:
+        tk.Canvas, tk.PhotoImage, pygame.mixer = saved
+        ASSETS.clear()
+
+
+def make_game(root=None):
+    """installed() 안에서 호출: 가상 시계에 물린 AdventureRPGGame. 선로딩은 아직 돌지 않은 상태."""
+    from game_core import AdventureRPGGame
+    root = root or FakeRoot()
+    game = AdventureRPGGame(root)
+    game.timestep.clock = root.time
+    return game
+
+
+def run_until_loaded(game, limit_ms=60000):
+    """선로딩(스레드 풀 파일 읽기)이 끝나 첫 게임이 시작될 때까지 가상 시계를 진행."""
+    root = game.root
+    start = root.now_ms
+    while game.world.player is None:
+        if root.now_ms - start > limit_ms:
+            raise TimeoutError("선로딩이 끝나지 않음")
+        root.advance(1)
+
+
+def run_ticks(game, ticks):
+    """월드가 ticks 스텝 진행할 때까지 RENDER_MS 단위로 렌더 루프를 돌린다 (렌더·UI 포함)."""
+    target = game.world.tick + ticks
+    root = game.root
+    while game.world.tick < target and not root.destroyed:
+        root.advance(RENDER_MS)
+
+
+class KeyEvent:
+    """key_down/key_up 에 넘기는 최소 이벤트."""
+    def __init__(self, keysym, char=""):
+        self.keysym = keysym
+        self.char = char
+
+
+def press(game, keysym, char=""):
+    game.key_down(KeyEvent(keysym, char))
+
+
+def release(game, keysym, char=""):
+    game.key_up(KeyEvent(keysym, char))
+
+
+def canvas_ops(game):
+    """캔버스별 연산 횟수와 사진 이미지/믹서 호출 횟수."""
+    return {"game": dict(game.game_cv.ops), "ui": dict(game.ui_cv.ops),
+            "photo": dict(FakePhotoImage.ops), "mixer": dict(pygame.mixer.ops)}
+
+
+def reset_ops(game):
+    """테스트 구간별로 세기 위해 카운터를 0 으로."""
+    game.game_cv.ops.clear()
+    game.ui_cv.ops.clear()
+    FakePhotoImage.ops.clear()
+    pygame.mixer.ops.clear()
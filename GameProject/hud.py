@@ -0,0 +1,67 @@
+﻿from constants import *
+
+
+class Hud:
+    """하단 UI 캔버스의 HP/EXP 바, 스탯, 도움말, 로그 표시 (유지 모드).
+
+    아이템은 한 번만 만들고, 이후에는 바뀐 값만 coords(바 길이)/itemconfig(텍스트)로 반영한다.
+    ops_last_frame / ops_total 로 캔버스 호출 횟수를 확인할 수 있다.
+    """
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.items = None
+        self.last = {}
+        self.ops_last_frame = 0
+        self.ops_total = 0
+        self._ops = 0
+
+    def _create(self, kind, *args, **kw):
+        self._ops += 1
+        return getattr(self.canvas, "create_" + kind)(*args, tags="ui", **kw)
+
+    def build(self):
+        self.canvas.delete("ui")
+        self._ops += 1
+        c = self._create
+        self.items = {
+            "hp_label": c("text", 50, 40, text="HP", fill="red", font=("Arial", 16)),
+            "hp_bg": c("rectangle", 100, 25, 400, 55, fill="gray"),
+            "hp_bar": c("rectangle", 100, 25, 100, 55, fill="red"),
+            "hp_text": c("text", 250, 40, text="", fill="white"),
+            "exp_label": c("text", 50, 80, text="EXP", fill="yellow", font=("Arial", 16)),
+            "exp_bg": c("rectangle", 100, 65, 400, 95, fill="gray"),
+            "exp_bar": c("rectangle", 100, 65, 100, 95, fill="yellow"),
+            "info": c("text", 700, 60, text="", fill="white", font=("Arial", 20)),
+            "help": c("text", SCREEN_WIDTH - 120, 120, text="도움말: H 키", fill="white", font=("Arial", 14)),
+            "log": c("text", SCREEN_WIDTH/2, 140, text="", fill="white", font=("Arial", 14)),
+        }
+        self.last = {}
+
+    def invalidate(self):
+        """다음 update 에서 모든 값을 다시 반영 (스테이지 전환 등)."""
+        self.last = {}
+
+    def _set(self, key, value, push):
+        if self.last.get(key) != value:
+            self.last[key] = value
+            push(value)
+            self._ops += 1
+
+    def update(self, player, msg_log):
+        self._ops = 0
+        if self.items is None:
+            self.build()
+        items = self.items
+        cv = self.canvas
+
+        hp_r = max(0, player.hp / player.max_hp)
+        self._set("hp_w", 300*hp_r, lambda w: cv.coords(items["hp_bar"], 100, 25, 100 + w, 55))
+        self._set("hp_text", f"{int(player.hp)}/{player.max_hp}", lambda t: cv.itemconfig(items["hp_text"], text=t))
+        exp_r = player.exp / player.max_exp
+        self._set("exp_w", 300*exp_r, lambda w: cv.coords(items["exp_bar"], 100, 65, 100 + w, 95))
+        info = f"Lv.{player.level}  ATK: {player.atk}  DEF: {player.total_def}"
+        self._set("info", info, lambda t: cv.itemconfig(items["info"], text=t))
+        self._set("log", msg_log or "", lambda t: cv.itemconfig(items["log"], text=t))
+
+        self.ops_last_frame = self._ops
+        self.ops_total += self._ops
@@ -5,6 +5,14 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 os.chdir(BASE_DIR)
 
 if __name__ == "__main__":
+    record_path = None
+    if "--record" in sys.argv:
+        i = sys.argv.index("--record") + 1
+        if i >= len(sys.argv) or sys.argv[i].startswith("-"):
+            sys.exit("사용법: python main.py [--record 리플레이파일]")
+        record_path = sys.argv[i]
     root = tk.Tk()
     game = AdventureRPGGame(root)
+    game.record_path = record_path
+    root.protocol("WM_DELETE_WINDOW", game.close)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,78 @@
+﻿import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from constants import *
+from assets import ASSETS
+import sprites
+
+
+def image_files():
+    """image/ 폴더의 모든 PNG/GIF (스테이지 타일·캐릭터·몬스터·투사체 전부)."""
+    folder = sprites.resolve("image")
+    try:
+        names = sorted(os.listdir(folder))
+    except OSError:
+        return []
+    return [f"image/{n}" for n in names if n.lower().endswith((".png", ".gif"))]
+
+
+def _read_image(path):
+    sprites.image_info(path)
+    with open(sprites.resolve(path), "rb") as f:
+        return f.read()
+
+
+class AssetPreloader:
+    """시작 시 이미지 선로딩: 스레드 풀에서 파일을 읽고,
+    PhotoImage 생성은 Tk 스레드에서 chunk_ms 씩 나눠 처리하며 진행 바를 그린다.
+    효과음은 여기서 읽지 않는다 (audio.SoundBank 가 필요할 때 디코딩)."""
+    def __init__(self, root, canvas, on_done, images=None, chunk_ms=8, workers=4):
+        self.root = root
+        self.canvas = canvas
+        self.on_done = on_done
+        self.images = image_files() if images is None else images
+        self.chunk_ms = chunk_ms
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.image_futures = []
+        self.total = len(self.images)
+        self.done = 0
+        self.started_at = 0.0
+        self.elapsed = 0.0
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self.image_futures = [(path, self.pool.submit(_read_image, path)) for path in self.images]
+        self.draw_progress()
+        self.root.after(1, self.pump)
+
+    def pump(self):
+        deadline = time.perf_counter() + self.chunk_ms / 1000.0
+        while self.image_futures and time.perf_counter() < deadline:
+            path, fut = self.image_futures[0]
+            if not fut.done():
+                break
+            self.image_futures.pop(0)
+            try:
+                ASSETS.load_file(path, fut.result())
+            except Exception:
+                pass
+            self.done += 1
+        self.draw_progress()
+        if self.image_futures:
+            self.root.after(1, self.pump)
+            return
+        self.pool.shutdown(wait=False)
+        self.elapsed = time.perf_counter() - self.started_at
+        self.canvas.delete("loading")
+        self.on_done()
+
+    def draw_progress(self):
+        ratio = self.done / self.total if self.total else 1.0
+        cx, cy = SCREEN_WIDTH / 2, GAME_HEIGHT / 2
+        if not self.canvas.find_withtag("loading"):
+            self.canvas.create_text(cx, cy - 40, text="", fill="white", font=("Arial", 18), tags=("loading", "loading_text"))
+            self.canvas.create_rectangle(cx - 300, cy, cx + 300, cy + 30, outline="white", tags="loading")
+            self.canvas.create_rectangle(cx - 300, cy, cx - 300, cy + 30, fill="skyblue", outline="", tags=("loading", "loading_bar"))
+        self.canvas.itemconfig("loading_text", text=f"리소스 불러오는 중... {self.done}/{self.total}")
+        self.canvas.coords("loading_bar", cx - 300, cy, cx - 300 + 600 * ratio, cy + 30)
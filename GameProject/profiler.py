@@ -0,0 +1,135 @@
+﻿import csv
+import json
+import time
+import traceback
+from collections import Counter, deque
+
+from constants import *
+from assets import ASSETS
+
+
+SECTIONS = ("input", "player", "monsters", "boss", "collisions", "goal", "events", "render", "ui")
+
+
+def percentile(values, q):
+    """정렬된 리스트의 q(0~1) 분위 값 (최근접 순위)."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class FrameProfiler:
+    """프레임마다 구간별 소요 시간(ms)을 모아 최근 window 프레임의 p50/p99 를 계산.
+
+    구간은 lap(이름, 시작 시각) 으로 누적한다. 한 프레임에 시뮬레이션 스텝이
+    여러 번 돌면 같은 구간 시간이 합산된다. end_frame 이 한 프레임을 마감하고
+    trace(최근 trace_len 프레임)에 남기며, 이를 CSV/JSON 으로 내보낼 수 있다.
+    게임 루프에서 삼킨 예외는 count_exception 으로 종류별 횟수를 센다.
+    DEBUG_HITBOX 가 켜져 있으면 캔버스 bbox/hitbox 어긋남을 count_hitbox_mismatches 로 누적한다.
+    summary/export_json 에는 그 시점의 이미지 캐시 현황(ASSETS.report)도 함께 담는다.
+    """
+    def __init__(self, window=300, trace_len=3600, clock=time.perf_counter):
+        self.clock = clock
+        self.window = window
+        self.current = dict.fromkeys(SECTIONS, 0.0)
+        self.history = {name: deque(maxlen=window) for name in SECTIONS + ("frame",)}
+        self.trace = deque(maxlen=trace_len)
+        self.frames = 0
+        self.frame_start = None
+        self.exceptions = Counter()
+        self.last_exception = None
+        self.hitbox_mismatches = 0
+        self.last_hitbox_mismatch = None
+
+    def lap(self, name, t0):
+        now = self.clock()
+        self.current[name] += now - t0
+        return now
+
+    def begin_frame(self):
+        self.frame_start = self.clock()
+
+    def end_frame(self):
+        end = self.clock()
+        row = {name: sec * 1000.0 for name, sec in self.current.items()}
+        row["frame"] = (end - self.frame_start) * 1000.0 if self.frame_start is not None else sum(row.values())
+        for name, ms in row.items():
+            self.history[name].append(ms)
+        self.frames += 1
+        row["n"] = self.frames
+        self.trace.append(row)
+        self.current = dict.fromkeys(SECTIONS, 0.0)
+        self.frame_start = None
+
+    def count_exception(self, exc):
+        self.exceptions[type(exc).__name__] += 1
+        self.last_exception = "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))
+
+    def count_hitbox_mismatches(self, mismatches):
+        """check_hitboxes() 결과 [(엔티티, bbox, hitbox)] 를 누적하고 마지막 하나를 설명 문자열로 남긴다."""
+        if not mismatches:
+            return
+        self.hitbox_mismatches += len(mismatches)
+        ent, bbox, hitbox = mismatches[-1]
+        self.last_hitbox_mismatch = f"{type(ent).__name__}#{ent.eid}: canvas={bbox} python={hitbox}"
+
+    def stats(self):
+        """구간별 {"p50", "p99", "max"} (ms, 최근 window 프레임 기준)."""
+        out = {}
+        for name, values in self.history.items():
+            ordered = sorted(values)
+            out[name] = {"p50": percentile(ordered, 0.5), "p99": percentile(ordered, 0.99),
+                         "max": ordered[-1] if ordered else 0.0}
+        return out
+
+    def summary(self):
+        return {"frames": self.frames, "window": self.window, "sections": self.stats(),
+                "exceptions": dict(self.exceptions), "last_exception": self.last_exception,
+                "hitbox_mismatches": self.hitbox_mismatches, "last_hitbox_mismatch": self.last_hitbox_mismatch,
+                "assets": ASSETS.report()}
+
+    def export_csv(self, path):
+        fields = ["n", "frame"] + list(SECTIONS)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            for row in self.trace:
+                writer.writerow({k: (row[k] if k == "n" else round(row[k], 4)) for k in fields})
+
+    def export_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"summary": self.summary(), "frames": list(self.trace)}, f, ensure_ascii=False, indent=1)
+
+
+class ProfilerOverlay:
+    """ui_cv 오른쪽 위에 구간별 p50/p99 를 표시하는 토글식 오버레이 (refresh 프레임마다 갱신)."""
+    def __init__(self, canvas, profiler, refresh=15):
+        self.canvas = canvas
+        self.profiler = profiler
+        self.refresh = refresh
+        self.visible = False
+        self.text = None
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.canvas.delete("prof")
+        self.text = None
+        if self.visible:
+            self.canvas.create_rectangle(SCREEN_WIDTH - 330, 0, SCREEN_WIDTH, UI_HEIGHT, fill="black", outline="gray", tags="prof")
+            self.text = self.canvas.create_text(SCREEN_WIDTH - 320, 6, text="", fill="lime", anchor="nw",
+                                                font=("Courier", 10), tags="prof")
+            self.update(force=True)
+
+    def update(self, force=False):
+        if not self.visible or (not force and self.profiler.frames % self.refresh):
+            return
+        stats = self.profiler.stats()
+        lines = [f"{'':11}{'p50':>7}{'p99':>8}  ms"]
+        for name in ("frame",) + SECTIONS:
+            s = stats[name]
+            lines.append(f"{name:11}{s['p50']:7.2f}{s['p99']:8.2f}")
+        errors = sum(self.profiler.exceptions.values())
+        lines.append(f"exceptions {errors}")
+        if DEBUG_HITBOX:
+            lines.append(f"hitbox     {self.profiler.hitbox_mismatches}")
+        self.canvas.itemconfig(self.text, text="\n".join(lines))
@@ -0,0 +1,74 @@
+﻿"""보스 투사체 풀.
+
+투사체 하나를 dict 로 만들지 않고, 위치/속도/발사·만료 시각을 고정 크기 array 의 칸으로 둔다.
+살아 있는 투사체는 항상 앞쪽 [0, count) 칸에 모여 있고, 소멸하면 마지막 칸을 그 자리로
+옮긴다 (swap-remove, O(1)). 렌더러도 칸 번호별로 캔버스 아이템을 재사용한다.
+"""
+from array import array
+
+from constants import *
+from sweep import segment_box
+
+
+class ProjectilePool:
+    FIELDS = ("x", "y", "vx", "vy", "start", "expire")
+
+    def __init__(self, capacity=BOSS_PROJECTILE_CAP):
+        self.capacity = capacity
+        self.count = 0
+        for name in self.FIELDS:
+            setattr(self, name, array("d", bytes(8 * capacity)))
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def spawn(self, x, y, vx, vy, now, life=5.0):
+        """빈 칸에 투사체 추가. 풀이 가득 차면 버리고 False."""
+        i = self.count
+        if i >= self.capacity:
+            return False
+        self.x[i], self.y[i], self.vx[i], self.vy[i] = x, y, vx, vy
+        self.start[i], self.expire[i] = now, now + life
+        self.count = i + 1
+        return True
+
+    def _remove(self, i):
+        last = self.count - 1
+        if i != last:
+            for name in self.FIELDS:
+                col = getattr(self, name)
+                col[i] = col[last]
+        self.count = last
+
+    def step(self, now, stage, target=None):
+        """한 틱 진행. 이동 구간을 target 상자/지형과 스윕 판정해 먼저 닿는 쪽에서 소멸.
+
+        target 에 맞은 투사체 수를 돌려준다. 화면 밖으로 나가거나 만료된 것도 제거.
+        """
+        xs, ys, vxs, vys, expire = self.x, self.y, self.vx, self.vy, self.expire
+        cast = stage.cast_box
+        hits = 0
+        i = 0
+        while i < self.count:
+            x, y, vx, vy = xs[i], ys[i], vxs[i], vys[i]
+            wall = cast(x, y, 0, 0, vx, vy)
+            if target is not None:
+                t = segment_box(x, y, vx, vy, target)
+                if t is not None and (wall is None or t <= wall[0]):
+                    hits += 1
+                    self._remove(i)
+                    continue
+            if wall is not None:
+                self._remove(i)
+                continue
+            x += vx
+            y += vy
+            if x < 0 or x > MAP_WIDTH or y < 0 or y > GAME_HEIGHT or now > expire[i]:
+                self._remove(i)
+                continue
+            xs[i], ys[i] = x, y
+            i += 1
+        return hits
@@ -0,0 +1,434 @@
+﻿import tkinter as tk
+
+from constants import *
+from assets import ASSETS
+from damage_text import DamageTextPool
+
+
+class ItemState:
+    """엔티티 캔버스 아이템 하나와 마지막으로 Tk 에 넘긴 값 (좌표·앵커·프레임 키·state).
+
+    sync 는 새 값과 비교해 바뀐 것만 coords/itemconfig 로 보낸다. kind 는 "image"/"rect".
+    """
+    __slots__ = ("item", "kind", "x", "y", "anchor", "image", "state")
+
+    def __init__(self, item, kind, x, y, anchor, image, state):
+        self.item = item
+        self.kind = kind
+        self.x, self.y = x, y
+        self.anchor = anchor
+        self.image = image
+        self.state = state
+
+
+class CanvasRenderer:
+    """GameWorld 상태를 게임 캔버스에 반영: 맵/엔티티/투사체/드랍/연출 텍스트/팝업."""
+    def __init__(self, canvas, world):
+        self.canvas = canvas
+        self.world = world
+        self.items = {}
+        self.proj_items = {}
+        self.drop_items = {}
+        self.chest_items = {}
+        self.story_drawn = None
+        self.story_item = None
+        self.last_scroll = None
+        self.player_eid = None
+        self.terrain_cache = {}
+        self.view = (0.0, SCREEN_WIDTH)
+        self.damage_texts = DamageTextPool(canvas)
+        self.on_stat = world.choose_stat
+
+    def image(self, key):
+        return ASSETS.image(key)
+
+    def handle(self, name, *args):
+        if name == "stage_loaded":
+            self.rebuild()
+        elif name == "portal":
+            self.draw_portal(*args)
+        elif name == "damage_text":
+            self.create_damage_text(*args)
+        elif name == "level_up":
+            self.draw_level_up(*args)
+        elif name == "class_prompt":
+            self.draw_class_prompt(*args)
+        elif name == "help":
+            self.draw_help(*args)
+        elif name == "inventory":
+            self.draw_inventory(*args)
+        elif name == "chest_opened":
+            self.draw_chest_opened(*args)
+        elif name == "final_cutscene":
+            self.draw_final_cutscene(*args)
+
+    def reset_items(self):
+        self.items = {}
+        self.proj_items = {}
+        self.drop_items = {}
+        self.chest_items = {}
+        self.story_drawn = None
+        self.story_item = None
+        self.last_scroll = None
+        self.damage_texts.reset()
+
+    def rebuild(self):
+        self.canvas.delete("all")
+        self.canvas.config(bg="skyblue", scrollregion=(0, 0, MAP_WIDTH, GAME_HEIGHT))
+        self.reset_items()
+        self.draw_map()
+
+    TILE_FILES = {
+        -1: "image/tile_open.png",
+        -2: "image/tile_hidden.png",
+        0: "image/tile_stage0.png",
+        1: "image/tile_stage1.png",
+        2: "image/tile_stage2.png",
+        3: "image/tile_stage3.png",
+        4: "image/tile_stage_end.png",
+    }
+
+    def bake_terrain(self):
+        """스테이지 지형을 화면 폭(WIN_COLS 타일) 단위 PhotoImage 청크로 한 번만 합성.
+
+        타일마다 캔버스 아이템을 만드는 대신 청크 몇 장만 올린다. 맵 데이터는
+        스테이지 안에서 바뀌지 않으므로 (스테이지, 맵) 별로 캐시해 재시작 시 재사용하고,
+        다른 스테이지로 넘어가면 이전 스테이지 청크는 버린다. 청크는 ASSETS 에
+        ("terrain/stage<N>", x) 키로 등록되어 이미지 메모리 집계에 포함된다.
+        """
+        stage_level = self.world.stage_level
+        map_data = self.world.map_data
+        key = (stage_level, tuple(tuple(row) for row in map_data))
+        chunks = self.terrain_cache.get(key)
+        if chunks is not None:
+            return chunks
+        for old in list(self.terrain_cache):
+            del self.terrain_cache[old]
+            ASSETS.discard(self.terrain_asset(old[0]))
+        tile_img = None
+        tfile = self.TILE_FILES.get(stage_level)
+        if tfile:
+            try:
+                tile_img = self.image((tfile, None))
+            except Exception:
+                tile_img = None
+        color = "#5D4037" if stage_level == 1 else "#616161"
+
+        chunks = []
+        for c0 in range(0, MAP_COLS, WIN_COLS):
+            c1 = min(c0 + WIN_COLS, MAP_COLS)
+            img = tk.PhotoImage(width=(c1 - c0) * TILE_SIZE, height=GAME_HEIGHT)
+            for r in range(MAP_ROWS):
+                for c in range(c0, c1):
+                    if map_data[r][c] != 1:
+                        continue
+                    x, y = (c - c0) * TILE_SIZE, r * TILE_SIZE
+                    if r < MAP_ROWS-1 and (c == 0 or c == MAP_COLS-1):
+                        img.put("skyblue", to=(x, y, x+TILE_SIZE, y+TILE_SIZE))
+                    elif tile_img:
+                        img.tk.call(img.name, "copy", tile_img.name, "-to", x, y)
+                    else:
+                        img.put(color, to=(x, y, x+TILE_SIZE, y+TILE_SIZE))
+            chunks.append((c0 * TILE_SIZE, img))
+            ASSETS.add((self.terrain_asset(stage_level), c0 * TILE_SIZE), img)
+        self.terrain_cache[key] = chunks
+        return chunks
+
+    @staticmethod
+    def terrain_asset(stage_level):
+        return f"terrain/stage{stage_level}"
+
+    def draw_map(self):
+        for x, img in self.bake_terrain():
+            self.canvas.create_image(x, 0, image=img, anchor="nw", tags="terrain")
+
+        chest_img = None
+        if self.world.chests:
+            try:
+                chest_img = self.image(("image/tile_box.png", None))
+            except Exception:
+                chest_img = None
+        for chest in self.world.chests:
+            x, y = chest["bbox"][0], chest["bbox"][1]
+            if chest_img:
+                cid = self.canvas.create_image(x, y, image=chest_img, anchor="nw")
+            else:
+                cid = self.canvas.create_rectangle(x, y, x+TILE_SIZE, y+TILE_SIZE, fill="goldenrod", outline="saddlebrown", width=3)
+            self.chest_items[id(chest)] = cid
+
+    def sync(self, alpha=1.0):
+        """매 프레임 호출: 스토리 텍스트, 엔티티·투사체·드랍 아이템 위치와 카메라 반영.
+
+        alpha 는 직전 스텝과 현재 스텝 사이 보간 비율 (1.0 이면 최신 상태 그대로).
+        """
+        world = self.world
+        self.sync_story()
+
+        camera_x = world.camera_x
+        if abs(camera_x - world.prev_camera_x) < TILE_SIZE:
+            camera_x = world.prev_camera_x + (camera_x - world.prev_camera_x) * alpha
+        self.view = (camera_x - CULL_MARGIN, camera_x + SCREEN_WIDTH + CULL_MARGIN)
+
+        live = set()
+        if world.player:
+            if world.player.eid != self.player_eid:
+                ASSETS.preload(world.player.sprite_keys())
+                self.player_eid = world.player.eid
+            self.sync_entity(world.player, alpha)
+            live.add(world.player.eid)
+        view_l, view_r = self.view
+        for m in world.monsters:
+            if m.hitbox[2] >= view_l and m.hitbox[0] <= view_r:
+                self.sync_entity(m, alpha)
+            else:
+                self.hide_entity(m)
+            live.add(m.eid)
+        for eid in [e for e in self.items if e not in live]:
+            self.canvas.delete(self.items.pop(eid).item)
+
+        self.sync_projectiles()
+        self.sync_drops()
+        self.damage_texts.update(world.now)
+
+        scroll = camera_x / max(1, MAP_WIDTH - SCREEN_WIDTH)
+        if scroll != self.last_scroll:
+            self.canvas.xview_moveto(scroll)
+            self.last_scroll = scroll
+
+    def in_view(self, x1, x2):
+        """뷰포트 컬링: 구간이 화면(+CULL_MARGIN) 안이면 True."""
+        return x2 >= self.view[0] and x1 <= self.view[1]
+
+    def check_hitboxes(self, alpha=1.0, tolerance=2):
+        """디버그 전용: 캔버스 bbox 와 엔티티 hitbox 가 어긋난 (엔티티, bbox, 기대 hitbox) 목록.
+
+        캔버스는 sync(alpha) 로 보간된 위치에 있으므로 hitbox 도 같은 alpha 로 보간해 비교한다.
+        """
+        mismatches = []
+        entities = ([self.world.player] if self.world.player else []) + self.world.monsters
+        for ent in entities:
+            rec = self.items.get(ent.eid)
+            bbox = self.canvas.bbox(rec.item) if rec is not None else None
+            if not bbox:
+                continue
+            ox, oy = self.lerp_offset(ent, alpha)
+            x1, y1, x2, y2 = ent.hitbox
+            expected = (x1 + ox, y1 + oy, x2 + ox, y2 + oy)
+            if any(abs(a - b) > tolerance for a, b in zip(bbox, expected)):
+                mismatches.append((ent, bbox, expected))
+        return mismatches
+
+    @staticmethod
+    def lerp_offset(ent, alpha):
+        """보간 오프셋. 한 타일 이상 순간이동(대시·리스폰)한 경우에는 보간하지 않는다."""
+        ox, oy = ent.x - ent.prev_x, ent.y - ent.prev_y
+        if alpha >= 1.0 or abs(ox) >= TILE_SIZE or abs(oy) >= TILE_SIZE:
+            return 0.0, 0.0
+        return -ox * (1.0 - alpha), -oy * (1.0 - alpha)
+
+    def sync_entity(self, ent, alpha=1.0):
+        """엔티티 하나를 캔버스에 반영. 마지막으로 넘긴 값(ItemState)과 달라진 속성만 Tk 로 보낸다."""
+        rec = self.items.get(ent.eid)
+        state = "normal" if ent.visible else "hidden"
+        ox, oy = self.lerp_offset(ent, alpha)
+        image = ent.image
+        if image is not None:
+            x, y, anchor = ent.sprite_pos()
+            x, y = x + ox, y + oy
+            kind = "image"
+        else:
+            x, y = ent.x + ox, ent.y + oy
+            anchor = None
+            kind = "rect"
+        if rec is not None and rec.kind != kind:
+            self.canvas.delete(rec.item)
+            rec = None
+        if rec is None:
+            if image is not None:
+                item = self.canvas.create_image(x, y, image=self.image(image), anchor=anchor, state=state)
+            else:
+                item = self.canvas.create_rectangle(x, y, x + ent.w, y + ent.h,
+                                                    fill=ent.color, outline="black", state=state)
+            self.items[ent.eid] = ItemState(item, kind, x, y, anchor, image, state)
+            return
+        item = rec.item
+        if x != rec.x or y != rec.y:
+            if image is not None:
+                self.canvas.coords(item, x, y)
+            else:
+                self.canvas.coords(item, x, y, x + ent.w, y + ent.h)
+            rec.x, rec.y = x, y
+        if image != rec.image or anchor != rec.anchor or state != rec.state:
+            changes = {}
+            if image != rec.image:
+                changes["image"] = self.image(image)
+                rec.image = image
+            if anchor != rec.anchor:
+                changes["anchor"] = anchor
+                rec.anchor = anchor
+            if state != rec.state:
+                changes["state"] = state
+                rec.state = state
+            self.canvas.itemconfig(item, **changes)
+
+    def hide_entity(self, ent):
+        """화면 밖 엔티티: 한 번만 숨기고 좌표 갱신은 건너뛴다 (다시 들어오면 sync_entity 가 차이만 반영)."""
+        rec = self.items.get(ent.eid)
+        if rec is not None and rec.state != "hidden":
+            self.canvas.itemconfig(rec.item, state="hidden")
+            rec.state = "hidden"
+
+    def sync_projectiles(self):
+        """투사체 풀 칸 번호별로 캔버스 아이템을 재사용한다.
+
+        아이템은 처음 필요할 때 만들고, 빈 칸/화면 밖이 되면 지우지 않고 숨긴다.
+        칸별 마지막 (x, y, 프레임, 표시 여부) 를 기억해 바뀐 것만 캔버스에 넘긴다.
+        """
+        pool = self.world.boss_projectiles
+        frames = self.world.boss_proj_frames
+        last_frame = len(frames) - 1
+        now = self.world.now
+        items = self.proj_items
+        view_l, view_r = self.view[0] - 10, self.view[1] + 10
+        xs, ys, start = pool.x, pool.y, pool.start
+        for i in range(pool.count):
+            x, y = xs[i], ys[i]
+            entry = items.get(i)
+            if not view_l <= x <= view_r:
+                if entry is not None and entry[4]:
+                    self.canvas.itemconfig(entry[0], state="hidden")
+                    entry[4] = False
+                continue
+            idx = min(last_frame, int(now - start[i])) if frames else 0
+            if entry is None:
+                if frames:
+                    item = self.canvas.create_image(x, y, image=self.image(frames[idx]), anchor="center", tags="boss_proj")
+                else:
+                    item = self.canvas.create_oval(x-10, y-10, x+10, y+10, fill="orange", tags="boss_proj")
+                items[i] = [item, x, y, idx, True]
+                continue
+            item = entry[0]
+            if not entry[4]:
+                self.canvas.itemconfig(item, state="normal")
+                entry[4] = True
+            if frames and idx != entry[3]:
+                self.canvas.itemconfig(item, image=self.image(frames[idx]))
+                entry[3] = idx
+            if x != entry[1] or y != entry[2]:
+                if frames:
+                    self.canvas.coords(item, x, y)
+                else:
+                    self.canvas.coords(item, x-10, y-10, x+10, y+10)
+                entry[1], entry[2] = x, y
+        for i, entry in items.items():
+            if i >= pool.count and entry[4]:
+                self.canvas.itemconfig(entry[0], state="hidden")
+                entry[4] = False
+
+    def sync_drops(self):
+        live = set()
+        for item in self.world.dropped_items:
+            iid = item["iid"]
+            live.add(iid)
+            if iid not in self.drop_items and self.in_view(item["x"], item["x"]+30):
+                x, y = item["x"], item["y"]
+                self.drop_items[iid] = self.canvas.create_oval(x, y, x+30, y+30, fill=item["data"]["color"])
+        for iid in [k for k in self.drop_items if k not in live]:
+            self.canvas.delete(self.drop_items.pop(iid))
+
+    def sync_story(self):
+        story = self.world.story
+        if story is self.story_drawn:
+            return
+        if self.story_item is not None:
+            self.canvas.delete(self.story_item)
+            self.story_item = None
+        if story:
+            self.story_item = self.canvas.create_text(story["x"], story["y"], text=story["text"], fill="white",
+                                                      font=("Arial", 16), tags="story_msg", width=SCREEN_WIDTH*0.9)
+        self.story_drawn = story
+
+    def draw_portal(self, gx, gy, color):
+        self.canvas.create_oval(gx, gy, gx+60, gy+90, fill=color, outline="white", width=3, tags="portal")
+        self.canvas.create_text(gx+30, gy-20, text="▲", font=("Arial", 20, "bold"), fill="white", tags="portal")
+
+    def create_damage_text(self, x, y, dmg, key=None):
+        if not self.in_view(x-40, x+40):
+            return
+        self.damage_texts.add(x, y, dmg, key, self.world.now)
+
+    def draw_level_up(self, cx, cy):
+        self.canvas.delete("lvl_popup")
+        if cx is None:
+            return
+        self.canvas.create_rectangle(cx-200, cy-100, cx+200, cy+80, fill="black", outline="gold", width=3, tags="lvl_popup")
+        self.canvas.create_text(cx, cy-60, text="LEVEL UP!", fill="gold", font=("Arial", 24), tags="lvl_popup")
+        self.canvas.create_rectangle(cx-150, cy-20, cx-20, cy+30, fill="red", tags=("lvl_popup", "btn_atk"))
+        self.canvas.create_text(cx-85, cy+5, text="ATK +5", fill="white", tags=("lvl_popup", "btn_atk"))
+        self.canvas.create_rectangle(cx+20, cy-20, cx+150, cy+30, fill="blue", tags=("lvl_popup", "btn_def"))
+        self.canvas.create_text(cx+85, cy+5, text="DEF +2", fill="white", tags=("lvl_popup", "btn_def"))
+        self.canvas.tag_bind("btn_atk", "<Button-1>", lambda e: self.on_stat("atk"))
+        self.canvas.tag_bind("btn_def", "<Button-1>", lambda e: self.on_stat("def"))
+
+    def draw_class_prompt(self, cx, cy):
+        self.canvas.delete("class_ui")
+        if cx is None:
+            return
+        self.canvas.create_rectangle(cx-360, cy-100, cx+360, cy+80, fill="black", outline="gold", width=3, tags="class_ui")
+        self.canvas.create_text(cx, cy-60, text="전직을 선택하세요 (숫자 키)", fill="gold", font=("Arial", 18), tags="class_ui")
+        self.canvas.create_text(cx, cy-30, text="[1] 스트레인져(마법사): 차원의 틈에서 흘러나온 마력을 다루는 마법사", fill="cyan", font=("Arial", 16), tags="class_ui")
+        self.canvas.create_text(cx, cy, text="[2] 스트라이더(메카닉): 미래의 기술과 기동성을 가진 로봇", fill="violet", font=("Arial", 16), tags="class_ui")
+        self.canvas.create_text(cx, cy+30, text="[3] 프라이슈츠(저격수): 원거리에서 총으로 적을 제압하는 사냥꾼", fill="orange", font=("Arial", 16), tags="class_ui")
+
+    def draw_help(self, cx, cy):
+        self.canvas.delete("help_overlay")
+        if cx is None:
+            return
+        self.canvas.create_rectangle(cx-360, cy-180, cx+360, cy+180, fill="black", outline="white", width=2, tags="help_overlay")
+        lines = [
+            "조작법 안내",
+            "기본: 이동(방향키) / 점프(스페이스) / 공격(Z키) / 스킬(D키) / 인벤토리(I키)",
+            "스트레인져(마법사): 점프 하강 중 로 부유(S키), 플라즈마 발사(D키 꾹)",
+            "스트라이더(메카닉): 대시 공격(Z 공격 후 바로 좌 혹은 우 더블탭)\n *더블탭: (<- <- or -> -> 빠르게 연타))",
+            "프라이슈츠(저격수): 스킬(D키), 콤보(Z키 연타)",
+            "아이템: 빨간색(회복 물약), 청록색(강철 검), 은색(낡은 검), 갈색(나무 방패)"
+        ]
+        for i, t in enumerate(lines):
+            self.canvas.create_text(cx, cy-120 + i*40, text=t, fill="yellow" if i==0 else "white",
+                                    font=("Arial", 16 if i==0 else 14), tags="help_overlay", width=700)
+
+    def draw_inventory(self, cx):
+        self.canvas.delete("inv_ui")
+        if cx is None:
+            return
+        player = self.world.player
+        x1, y1, x2, y2 = cx-200, 100, cx+200, 600
+        self.canvas.create_rectangle(x1, y1, x2, y2, fill="#333", outline="white", tags="inv_ui")
+        self.canvas.create_text(cx, 130, text="INVENTORY", fill="white", font=("Arial", 20), tags="inv_ui")
+        for i, item in enumerate(player.inventory):
+            y_pos = 180 + (i * 40)
+            mark = "[E]" if item in player.equipped.values() else ""
+            text = f"{i+1}. {item['name']} {mark} (Val: {item['val']})"
+            self.canvas.create_text(x1+50, y_pos, text=text, fill=item["color"], anchor="w", font=("Arial", 14), tags="inv_ui")
+
+    def draw_chest_opened(self, chest):
+        try:
+            self.canvas.itemconfig(self.chest_items.get(id(chest)), outline="yellow")
+        except Exception:
+            pass
+        self.canvas.create_text(SCREEN_WIDTH/2, 80, text="상자에는 낡은 거울만이 들어있다.", fill="yellow", font=("Arial", 18, "bold"), tags="ending_msg")
+        self.canvas.create_text(SCREEN_WIDTH/2, 120, text="반전: 그 순간, 주인공은 깨닫습니다. 외부의 도구가 필요한 것이 아니라,\n'조력자의 힘을 이어받아 시련을 극복해낸 자신' 자체가 부서진 차원을 메울 유일한 열쇠임을 알게 됩니다.", fill="white", font=("Arial", 16), tags="ending_msg")
+        portal = self.world.ending_portal
+        cx, gy = portal["x"], portal["y"]
+        self.canvas.create_oval(cx-30, gy, cx+30, gy+90, fill="white", outline="gray", width=3, tags="ending_portal")
+        self.canvas.create_text(cx, gy-20, text="▲", font=("Arial", 20, "bold"), fill="black", tags="ending_portal")
+
+    def draw_final_cutscene(self, cx, cy):
+        """화면을 비우고 플레이어와 엔딩 문구만 남긴다 (플레이어는 다음 sync 에서 다시 생성)."""
+        self.canvas.delete("all")
+        self.canvas.config(bg="white")
+        self.reset_items()
+        text = ("엔딩: 주인공은 망설임 없이 빛이 쏟아지는 코어 속으로 걸어 들어갑니다.\n"
+                "\"나의 여정은 여기서 끝나지만, 이 세계의 평화는 영원할 것이다.\"\n"
+                "결말: 주인공은 스스로 열쇠가 되어 차원의 틈을 막고, 세계는 다시 평화를 되찾습니다.")
+        self.canvas.create_text(cx, cy - 120, text=text, fill="black", font=("Arial", 16, "bold"), width=SCREEN_WIDTH*0.8)
@@ -0,0 +1,166 @@
+﻿"""입력 리플레이: 시드 + 틱별 입력 비트마스크를 기록/재생.
+
+게임 입력은 키 이벤트가 올 때마다 바로 월드에 넣지 않고 InputLatch 에 모았다가
+틱 경계에서 비트마스크로 샘플링해 apply_mask 로 반영한다. 실제 플레이와 재생이
+같은 경로를 타므로, 같은 시드에서 같은 마스크 열을 넣으면 같은 결과가 나온다.
+
+파일 형식 (리틀 엔디언):
+    헤더  "<4sBQBI"  매직 b"ARPR", 버전, RNG 시드, 직업 인덱스, 총 틱 수
+    본문  "<HI" 반복  (반복 횟수, 마스크) 런 길이 인코딩
+"""
+import struct
+
+from world import GameWorld
+
+
+INPUT_KEYS = ("Left", "Right", "Up", "space", "z", "d", "s", "i", "h",
+              "0", "1", "2", "3", "4", "5", "6", "7", "8", "9",
+              "stat_atk", "stat_def")
+INPUT_BITS = {key: 1 << i for i, key in enumerate(INPUT_KEYS)}
+CLASS_TYPES = ("iron", "strider", "stranger", "freischutz")
+
+MAGIC = b"ARPR"
+VERSION = 1
+HEADER = struct.Struct("<4sBQBI")
+RUN = struct.Struct("<HI")
+
+
+def input_key(keysym, char=""):
+    """Tk keysym → 기록용 입력 이름 (기록 대상이 아니면 None). 키패드 숫자는 일반 숫자로."""
+    if keysym.startswith("KP_") and keysym[3:].isdigit():
+        return keysym[3:]
+    if keysym == "H":
+        return "h"
+    if keysym in INPUT_BITS:
+        return keysym
+    if char.isdigit():
+        return char
+    return None
+
+
+class InputLatch:
+    """틱 사이 키 이벤트 누적. 한 틱 안에서 눌렀다 뗀 키도 그 틱에는 눌린 것으로 샘플링."""
+    def __init__(self):
+        self.held = 0
+        self.pressed = 0
+
+    def press(self, key):
+        bit = INPUT_BITS[key]
+        self.held |= bit
+        self.pressed |= bit
+
+    def release(self, key):
+        self.held &= ~INPUT_BITS[key]
+
+    def tap(self, key):
+        """마우스 클릭처럼 한 틱만 눌린 입력."""
+        self.pressed |= INPUT_BITS[key]
+
+    def sample(self):
+        mask = self.held | self.pressed
+        self.pressed = 0
+        return mask
+
+
+def apply_mask(world, prev, mask):
+    """직전 마스크와 비교해 바뀐 입력만 key_down/key_up (클릭은 choose_stat) 으로 전달."""
+    changed = prev ^ mask
+    if changed:
+        for key in INPUT_KEYS:
+            bit = INPUT_BITS[key]
+            if not changed & bit:
+                continue
+            down = bool(mask & bit)
+            if key.startswith("stat_"):
+                if down:
+                    world.choose_stat(key[5:])
+            elif down:
+                world.key_down(key, key if key.isdigit() else "")
+            else:
+                world.key_up(key)
+    return mask
+
+
+class Replay:
+    """한 세션의 시드, 시작 직업, 틱별 입력 마스크 (런 길이 인코딩으로 보관)."""
+    def __init__(self, seed, char_type="iron"):
+        self.seed = seed
+        self.char_type = char_type
+        self.runs = []
+        self.ticks = 0
+
+    def record(self, mask):
+        if self.runs and self.runs[-1][1] == mask and self.runs[-1][0] < 0xFFFF:
+            self.runs[-1][0] += 1
+        else:
+            self.runs.append([1, mask])
+        self.ticks += 1
+
+    def masks(self):
+        for count, mask in self.runs:
+            for _ in range(count):
+                yield mask
+
+    def to_bytes(self):
+        head = HEADER.pack(MAGIC, VERSION, self.seed, CLASS_TYPES.index(self.char_type), self.ticks)
+        return head + b"".join(RUN.pack(count, mask) for count, mask in self.runs)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < HEADER.size:
+            raise ValueError("리플레이 파일 형식이 아닙니다.")
+        magic, version, seed, cls_idx, ticks = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION or cls_idx >= len(CLASS_TYPES):
+            raise ValueError("리플레이 파일 형식이 아닙니다.")
+        if (len(data) - HEADER.size) % RUN.size:
+            raise ValueError("리플레이 파일이 잘렸습니다.")
+        replay = cls(seed, CLASS_TYPES[cls_idx])
+        for off in range(HEADER.size, len(data), RUN.size):
+            count, mask = RUN.unpack_from(data, off)
+            replay.runs.append([count, mask])
+            replay.ticks += count
+        if replay.ticks != ticks:
+            raise ValueError("리플레이 파일이 잘렸습니다.")
+        return replay
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class ReplayPlayer:
+    """리플레이를 헤드리스 GameWorld 에 실시간 제약 없이 재생 (벤치마크·회귀 확인용)."""
+    def __init__(self, replay, world=None):
+        self.replay = replay
+        self.world = world or GameWorld(emit_events=False, seed=replay.seed)
+        self.prev = 0
+
+    def run(self, max_ticks=None, on_tick=None):
+        world = self.world
+        world.start_game(self.replay.char_type)
+        for n, mask in enumerate(self.replay.masks()):
+            if max_ticks is not None and n >= max_ticks:
+                break
+            self.prev = apply_mask(world, self.prev, mask)
+            world.step()
+            if on_tick:
+                on_tick(world)
+        return world
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    replay = Replay.load(sys.argv[1])
+    t0 = time.perf_counter()
+    world = ReplayPlayer(replay).run()
+    dt = time.perf_counter() - t0
+    p = world.player
+    print(f"{replay.ticks} ticks in {dt:.2f}s ({replay.ticks / max(dt, 1e-9):.0f} ticks/s)")
+    print(f"stage={world.stage_level} class={p.char_type} lv={p.level} hp={p.hp} pos=({p.x:.1f}, {p.y:.1f})")
@@ -0,0 +1,83 @@
+﻿from constants import TILE_SIZE
+
+
+class SpatialHash:
+    """타일 격자(기본 TILE_SIZE) 단위 공간 해시. 판정 영역이 걸친 셀마다 엔티티를 등록한다.
+
+    엔티티별로 점유 셀 범위를 기억해 두고, 이동 후 범위가 바뀐 경우에만 셀을 옮긴다.
+    query() 는 후보를 eid 순(= 생성 순)으로 돌려주어 전체 목록을 도는 것과 같은 순서를 유지한다.
+    """
+    def __init__(self, cell_size=TILE_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.spans = {}
+
+    def _span(self, box):
+        cs = self.cell_size
+        return (int(box[0] // cs), int(box[1] // cs), int(box[2] // cs), int(box[3] // cs))
+
+    def _add(self, obj, span):
+        cells = self.cells
+        for cx in range(span[0], span[2] + 1):
+            for cy in range(span[1], span[3] + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = bucket = set()
+                bucket.add(obj)
+
+    def _discard(self, obj, span):
+        cells = self.cells
+        for cx in range(span[0], span[2] + 1):
+            for cy in range(span[1], span[3] + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is not None:
+                    bucket.discard(obj)
+                    if not bucket:
+                        del cells[(cx, cy)]
+
+    def insert(self, obj, box):
+        self.remove(obj)
+        span = self._span(box)
+        self.spans[obj] = span
+        self._add(obj, span)
+
+    def update(self, obj, box):
+        """등록된 엔티티의 영역 갱신. 등록되지 않은(이미 제거된) 엔티티는 무시."""
+        self.move(obj, self._span(box))
+
+    def move(self, obj, span):
+        """셀 범위 (x1, y1, x2, y2) 를 직접 받아 갱신 (범위를 미리 계산한 일괄 경로용)."""
+        old = self.spans.get(obj)
+        if old is None:
+            return
+        if span == old:
+            return
+        self._discard(obj, old)
+        self.spans[obj] = span
+        self._add(obj, span)
+
+    def remove(self, obj):
+        span = self.spans.pop(obj, None)
+        if span is not None:
+            self._discard(obj, span)
+
+    def clear(self):
+        self.cells.clear()
+        self.spans.clear()
+
+    def query(self, box):
+        """box 와 같은 셀을 공유하는 후보 목록 (정밀 AABB 판정은 호출 측)."""
+        x1, y1, x2, y2 = self._span(box)
+        cells = self.cells
+        found = set()
+        for cx in range(x1, x2 + 1):
+            for cy in range(y1, y2 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        if len(found) < 2:
+            return list(found)
+        return sorted(found, key=lambda o: o.eid)
+
+    def __len__(self):
+        return len(self.spans)
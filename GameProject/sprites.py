@@ -0,0 +1,92 @@
+﻿"""스프라이트 파일 메타데이터(크기/GIF 프레임 수)를 Tk 없이 읽어 프레임 키 목록을 만든다.
+
+프레임 키는 (파일 경로, GIF 인덱스 또는 None) 튜플이며, 실제 PhotoImage 생성은 렌더러가 담당한다.
+"""
+import os
+import struct
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_info_cache = {}
+
+
+def resolve(path):
+    return path if os.path.isabs(path) else os.path.join(BASE_DIR, path)
+
+
+def _gif_info(data):
+    w, h, flags = struct.unpack("<HHB", data[6:11])
+    pos = 13
+    if flags & 0x80:
+        pos += 3 * (2 << (flags & 0x07))
+    frames = 0
+    while pos < len(data):
+        block = data[pos]
+        if block == 0x3B:
+            break
+        if block == 0x21:
+            pos += 2
+        elif block == 0x2C:
+            frames += 1
+            local = data[pos + 9]
+            pos += 10
+            if local & 0x80:
+                pos += 3 * (2 << (local & 0x07))
+            pos += 1
+        else:
+            break
+        while pos < len(data) and data[pos]:
+            pos += data[pos] + 1
+        pos += 1
+    return w, h, frames
+
+
+def image_info(path):
+    """(폭, 높이, 프레임 수). 파일이 없거나 읽을 수 없으면 OSError/ValueError."""
+    if path in _info_cache:
+        return _info_cache[path]
+    with open(resolve(path), "rb") as f:
+        data = f.read()
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        w, h = struct.unpack(">II", data[16:24])
+        info = (w, h, 1)
+    elif data[:6] in (b"GIF87a", b"GIF89a"):
+        info = _gif_info(data)
+    else:
+        raise ValueError(f"지원하지 않는 이미지 형식: {path}")
+    _info_cache[path] = info
+    return info
+
+
+def anchor_box(x, y, anchor, w, h):
+    """캔버스 이미지 아이템과 같은 규칙으로 앵커 기준점 (x, y) 에서 (x1, y1, x2, y2) 계산."""
+    horiz = anchor[-1] if anchor[-1] in "ew" and anchor != "center" else ""
+    vert = anchor[0] if anchor[0] in "ns" else ""
+    if horiz == "w":
+        x1 = x
+    elif horiz == "e":
+        x1 = x - w
+    else:
+        x1 = x - w // 2
+    if vert == "n":
+        y1 = y
+    elif vert == "s":
+        y1 = y - h
+    else:
+        y1 = y - h // 2
+    return (x1, y1, x1 + w, y1 + h)
+
+
+def png_frame(path):
+    """단일 이미지 프레임 키. 파일이 없으면 예외(PhotoImage 로딩 실패와 동일하게 취급)."""
+    image_info(path)
+    return (path, None)
+
+
+def gif_frames(path):
+    """GIF 전체 프레임 키 목록. 읽을 수 없으면 빈 목록."""
+    try:
+        _, _, count = image_info(path)
+    except (OSError, ValueError):
+        return []
+    return [(path, i) for i in range(count)]
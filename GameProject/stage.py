@@ -0,0 +1,139 @@
+﻿"""스테이지 컴파일: map_data(2차원 리스트)를 충돌/지형 질의용 평면 테이블로 한 번만 변환.
+
+    solid        바깥을 한 칸씩 벽(1)으로 두른 (MAP_ROWS+2) x (MAP_COLS+2) 평면 bytes.
+                 (r, c) 는 row_off(r) + c + 1 번째 칸. 범위 밖 행은 맨 위 패딩 행(전부 벽)을 가리킨다.
+    row_spans    행마다 연속된 벽 구간 [(시작 열, 끝 열(미포함)), ...]
+    standable    (r, c) 가 빈칸(0)이고 바로 아래가 벽이면 1 (몬스터/플레이어 스폰 가능 위치)
+    ground_top   열마다 위에서 내려다봤을 때 가장 아래쪽 지면 행 (find_ground_y 용)
+
+같은 map_data 객체는 한 번만 컴파일해 재사용한다 (STAGE_* 는 모듈 상수).
+"""
+from constants import *
+
+
+class CompiledStage:
+    def __init__(self, map_data):
+        self.map_data = map_data
+        self.stride = stride = MAP_COLS + 2
+        solid = bytearray(b"\x01") * (stride * (MAP_ROWS + 2))
+        standable = bytearray(stride * (MAP_ROWS + 2))
+        for r in range(MAP_ROWS):
+            row = map_data[r]
+            base = (r + 1) * stride + 1
+            for c in range(MAP_COLS):
+                solid[base + c] = row[c] == 1
+                if r < MAP_ROWS - 1 and row[c] == 0 and map_data[r + 1][c] == 1:
+                    standable[base + c] = 1
+        self.solid = bytes(solid)
+        self.standable = bytes(standable)
+        self.offsets = {r: (r + 1) * stride for r in range(-1, MAP_ROWS + 1)}
+
+        self.row_spans = []
+        for r in range(MAP_ROWS):
+            spans, c = [], 0
+            row = map_data[r]
+            while c < MAP_COLS:
+                if row[c] == 1:
+                    start = c
+                    while c < MAP_COLS and row[c] == 1:
+                        c += 1
+                    spans.append((start, c))
+                else:
+                    c += 1
+            self.row_spans.append(spans)
+
+        self.ground_top = []
+        for c in range(MAP_COLS):
+            top = MAP_ROWS - 1
+            for r in range(MAP_ROWS - 2, -1, -1):
+                if self.standable[self.offsets[r] + c + 1]:
+                    top = r + 1
+                    break
+            self.ground_top.append(top)
+
+    def row_off(self, r):
+        """행 r 의 solid 시작 오프셋. 맵 밖 행은 전부 벽인 패딩 행(0)."""
+        return self.offsets.get(r, 0)
+
+    def is_wall(self, r, c):
+        if 0 <= c < MAP_COLS or c == -1 or c == MAP_COLS:
+            return self.solid[self.offsets.get(r, 0) + c + 1] == 1
+        return True
+
+    def is_standable(self, r, c):
+        return 0 <= c < MAP_COLS and self.standable[self.offsets.get(r, 0) + c + 1] == 1
+
+    def cast_box(self, x, y, w, h, dx, dy):
+        """(x, y, w, h) 상자를 (dx, dy) 만큼 옮길 때 처음 닿는 벽 (DDA 격자 순회).
+
+        앞쪽 모서리가 지나는 타일 경계를 시간 순으로 밟으며, 새로 들어서는 열/행 칸만 검사한다.
+        맞으면 (t, 축) — t 는 0~1 이동 비율, 축은 'x'/'y' (시작부터 벽 안이면 (0.0, None)).
+        안 맞으면 None. w=h=0 이면 점(투사체) 광선 판정.
+        """
+        T = TILE_SIZE
+        solid, offsets = self.solid, self.offsets
+        ew = w - 0.1 if w > 0.1 else 0.0
+        eh = h - 0.1 if h > 0.1 else 0.0
+        lead_x = x + ew if dx > 0 else x
+        lead_y = y + eh if dy > 0 else y
+        col = int(lead_x // T)
+        row = int(lead_y // T)
+        c0, c1 = int(x // T), int((x + ew) // T)
+        r0, r1 = int(y // T), int((y + eh) // T)
+        for r in range(r0, r1 + 1):
+            off = offsets.get(r, 0) + 1
+            for c in range(max(c0, -1), min(c1, MAP_COLS) + 1):
+                if solid[off + c]:
+                    return 0.0, None
+        inf = float("inf")
+        if dx > 0:
+            step_c, tx, tdx = 1, ((col + 1) * T - lead_x) / dx, T / dx
+        elif dx < 0:
+            step_c, tx, tdx = -1, (col * T - lead_x) / dx, -T / dx
+        else:
+            step_c, tx, tdx = 0, inf, inf
+        if dy > 0:
+            step_r, ty, tdy = 1, ((row + 1) * T - lead_y) / dy, T / dy
+        elif dy < 0:
+            step_r, ty, tdy = -1, (row * T - lead_y) / dy, -T / dy
+        else:
+            step_r, ty, tdy = 0, inf, inf
+        while True:
+            if tx <= ty:
+                t = tx
+                if t > 1:
+                    return None
+                col += step_c
+                if not -1 <= col <= MAP_COLS:
+                    return t, "x"
+                ny = y + dy * t
+                for r in range(int(ny // T), int((ny + eh) // T) + 1):
+                    if solid[offsets.get(r, 0) + col + 1]:
+                        return t, "x"
+                tx += tdx
+            else:
+                t = ty
+                if t > 1:
+                    return None
+                row += step_r
+                nx = x + dx * t
+                off = offsets.get(row, 0) + 1
+                for c in range(max(int(nx // T), -1), min(int((nx + ew) // T), MAP_COLS) + 1):
+                    if solid[off + c]:
+                        return t, "y"
+                ty += tdy
+
+    def ground_y(self, x_pos, h):
+        """x_pos 열의 지면 위에 높이 h 인 물체를 세울 y."""
+        c = int(max(0, min(MAP_COLS-1, x_pos / TILE_SIZE)))
+        return self.ground_top[c] * TILE_SIZE - h
+
+
+_compiled = {}
+
+
+def compile_stage(map_data):
+    stage = _compiled.get(id(map_data))
+    if stage is None or stage.map_data is not map_data:
+        stage = _compiled[id(map_data)] = CompiledStage(map_data)
+    return stage
@@ -0,0 +1,35 @@
+﻿"""공용 픽스처: headless 백엔드 위에서 실제 AdventureRPGGame 을 만들고, 테스트별 캔버스 연산 횟수를 모아 요약에 출력."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import headless
+
+OP_COUNTS = {}
+
+
+@pytest.fixture
+def game(request):
+    """선로딩까지 끝난 게임 (iron, 오프닝 스테이지). 카운터는 0 에서 시작한다."""
+    with headless.installed():
+        g = headless.make_game()
+        headless.run_until_loaded(g)
+        headless.reset_ops(g)
+        try:
+            yield g
+        finally:
+            OP_COUNTS[request.node.nodeid] = headless.canvas_ops(g)
+            g.audio.sounds.shutdown()
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not OP_COUNTS:
+        return
+    terminalreporter.section("canvas ops")
+    for nodeid, ops in OP_COUNTS.items():
+        game_ops = " ".join(f"{k}={v}" for k, v in sorted(ops["game"].items()))
+        ui_ops = sum(ops["ui"].values())
+        terminalreporter.write_line(f"{nodeid}: {game_ops or '-'} | ui={ui_ops}")
@@ -0,0 +1,42 @@
+﻿"""이미지 캐시: 렌더러가 합성한 지형 청크도 ASSETS 집계에 잡히고, 떠난 스테이지의 청크는 버려지는지."""
+import json
+
+from headless import run_ticks
+from assets import ASSETS
+
+
+def terrain_files():
+    return sorted(path for path in ASSETS.report()["by_file"] if path.startswith("terrain/"))
+
+
+def test_terrain_chunks_counted_and_evicted_on_stage_change(game):
+    assert terrain_files() == ["terrain/stage-1"]
+    game.world.load_stage(1)
+    run_ticks(game, 2)
+    assert terrain_files() == ["terrain/stage1"]
+    assert len(game.renderer.terrain_cache) == 1
+    chunks = ASSETS.report()["by_file"]["terrain/stage1"]
+    assert chunks["frames"] == len(game.renderer.bake_terrain())
+    assert chunks["bytes"] > 0
+    game.world.load_stage(2)
+    run_ticks(game, 2)
+    assert terrain_files() == ["terrain/stage2"]
+
+
+def test_restart_reuses_baked_terrain(game):
+    game.world.load_stage(1)
+    run_ticks(game, 2)
+    chunks = game.renderer.bake_terrain()
+    game.world.load_stage(1)
+    run_ticks(game, 2)
+    assert game.renderer.bake_terrain() is chunks
+
+
+def test_profile_export_includes_asset_report(game, tmp_path):
+    run_ticks(game, 5)
+    path = tmp_path / "profile.json"
+    game.profiler.export_json(path)
+    with open(path, encoding="utf-8") as f:
+        assets = json.load(f)["summary"]["assets"]
+    assert assets["bytes"] == ASSETS.memory_bytes() > 0
+    assert "terrain/stage-1" in assets["by_file"]
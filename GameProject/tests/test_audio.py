@@ -0,0 +1,78 @@
+﻿"""효과음: 지연 로딩이 Tk 스레드를 막지 않는지, 채널 상한·재생 간격 제한이 지켜지는지."""
+import time
+
+import headless
+from audio import SoundBank, SoundMixer
+
+
+def wait_collected(bank, key, timeout=2.0):
+    deadline = time.perf_counter() + timeout
+    while key not in bank.cache and time.perf_counter() < deadline:
+        time.sleep(0.001)
+        bank.collect()
+
+
+def test_miss_starts_background_decode_and_returns_none():
+    with headless.installed():
+        bank = SoundBank()
+        try:
+            assert bank.get("iron_attack") is None
+            assert "iron_attack" in bank.pending
+            assert bank.get("iron_attack") is None
+            wait_collected(bank, "iron_attack")
+            assert bank.get("iron_attack") is not None
+            assert bank.stats["loads"] == 1
+        finally:
+            bank.shutdown()
+
+
+def test_voice_cap_and_throttle():
+    with headless.installed() as mixer:
+        audio = SoundMixer()
+        audio.setup()
+        try:
+            audio.sounds.prefetch(["boss_projectile"])
+            wait_collected(audio.sounds, "boss_projectile")
+            for i in range(10):
+                for _ in range(5):
+                    audio.request("play_sound", "boss_projectile")
+                audio.flush(i * 0.1)
+            assert audio.stats["played"] == 10
+            assert audio.stats["throttled"] == 40
+            assert audio.active_voices()["enemy"] == 3
+            assert len(mixer.channels) == sum(audio.spec.values())
+        finally:
+            audio.sounds.shutdown()
+
+
+def test_loop_on_cold_key_starts_after_decode():
+    with headless.installed():
+        audio = SoundMixer()
+        audio.setup()
+        try:
+            audio.request("play_loop", "iron_walk")
+            audio.flush(0.0)
+            assert audio.active_voices()["loop"] == 0
+            assert "iron_walk" in audio.deferred_loops
+            audio.sounds.pending["iron_walk"].result(timeout=2.0)
+            audio.flush(0.016)
+            slot = audio._owned("iron_walk")[0]
+            assert slot[0].get_busy() and slot[0].loops == -1
+            assert not audio.deferred_loops
+        finally:
+            audio.sounds.shutdown()
+
+
+def test_pause_cancels_deferred_loop():
+    with headless.installed():
+        audio = SoundMixer()
+        audio.setup()
+        try:
+            audio.request("play_loop", "stranger_plasma")
+            audio.request("pause_sound", "stranger_plasma")
+            audio.flush(0.0)
+            audio.sounds.pending["stranger_plasma"].result(timeout=2.0)
+            audio.flush(0.016)
+            assert audio.active_voices()["loop"] == 0
+        finally:
+            audio.sounds.shutdown()
@@ -0,0 +1,44 @@
+﻿"""NumPy 일괄 몬스터 물리: 배치 경로가 몬스터별 루프와 비트 단위로 같은 결과를 내고, 마릿수에 따라 켜지고 꺼지는지."""
+import pytest
+
+import benchmark
+import world as world_mod
+from constants import BATCH_MIN_MONSTERS
+from replay import apply_mask
+
+
+def run_scripted(stage, char_type, count, ticks):
+    w = benchmark.make_world(stage, char_type, count)
+    for m in w.monsters:
+        m.hp = m.max_hp = 400
+    prev = 0
+    states = []
+    for t in range(ticks):
+        w.player.hp = w.player.max_hp
+        prev = apply_mask(w, prev, benchmark.scripted_mask(char_type, t))
+        w.step()
+        states.append((w.player.x, w.player.y, w.player.exp,
+                       [(m.eid, m.x, m.y, m.dx, m.dy, m.on_ground, m.hp) for m in w.monsters]))
+    return w, states
+
+
+@pytest.mark.parametrize("char_type", benchmark.CLASSES)
+def test_batch_physics_matches_scalar(monkeypatch, char_type):
+    batched, batch_states = run_scripted(1, char_type, 150, 300)
+    assert batched.monster_batch is None or batched.monster_batch.members
+    monkeypatch.setattr(world_mod, "BATCH_MIN_MONSTERS", 10 ** 9)
+    scalar, scalar_states = run_scripted(1, char_type, 150, 300)
+    assert scalar.monster_batch is None or not scalar.monster_batch.members
+    assert batch_states == scalar_states
+
+
+def test_batch_switches_with_hysteresis():
+    w = benchmark.make_world(1, "iron", BATCH_MIN_MONSTERS)
+    if w.monster_batch is None:
+        pytest.skip("NumPy 없음")
+    assert w.sync_monster_batch()
+    while len(w.monsters) > BATCH_MIN_MONSTERS // 2:
+        w.monsters.pop()
+        assert w.sync_monster_batch()
+    w.monsters.pop()
+    assert not w.sync_monster_batch()
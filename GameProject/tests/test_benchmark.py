@@ -0,0 +1,27 @@
+﻿"""벤치마크 --fake-render: 디스플레이 없이 렌더러까지 돌려 틱당 캔버스 연산 수를 남기는지."""
+import json
+
+import benchmark
+
+
+def test_fake_render_reports_canvas_ops(tmp_path):
+    path = tmp_path / "bench.json"
+    benchmark.main(["--fake-render", "--ticks", "30", "--stages", "1", "--classes", "iron",
+                    "--counts", "10", "--json", str(path)])
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    assert data["render"] == "fake"
+    ops = data["results"][0]["canvas_ops_per_tick"]
+    assert ops["coords"] > 0
+    assert "update_idletasks" not in ops
+
+
+def test_render_without_display_falls_back_to_fake(monkeypatch, capsys):
+    monkeypatch.setattr(benchmark, "has_display", lambda: False)
+    assert benchmark.parse_args(["--render"])["render"] == "fake"
+    assert "--fake-render" in capsys.readouterr().err
+
+
+def test_world_only_has_no_op_counts():
+    r = benchmark.bench(0, "iron", 10, 20)
+    assert r["canvas_ops_per_tick"] is None
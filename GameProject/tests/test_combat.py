@@ -0,0 +1,51 @@
+﻿"""전투 질의: NumPy(배치 판정 영역 열) 경로와 공간 해시 경로가 같은 대상을 같은 순서로 돌려주는지."""
+import random
+
+import pytest
+
+import benchmark
+
+
+@pytest.fixture
+def queries():
+    w = benchmark.make_world(1, "iron", 200)
+    if not w.sync_monster_batch():
+        pytest.skip("NumPy 없음")
+    fast = w.combat
+    slow = type(fast)(w)
+    slow._batch = lambda: None
+    return fast, slow
+
+
+def eids(monsters):
+    return [m.eid for m in monsters]
+
+
+def test_box_and_circle_paths_agree(queries):
+    fast, slow = queries
+    rng = random.Random(7)
+    for _ in range(300):
+        x, y = rng.uniform(0, 1900), rng.uniform(0, 760)
+        box = (x, y, x + rng.uniform(10, 300), y + rng.uniform(10, 200))
+        assert eids(fast.box(box)) == eids(slow.box(box))
+        cx, cy, r = rng.uniform(0, 1900), rng.uniform(0, 760), rng.uniform(10, 200)
+        assert eids(fast.circle(cx, cy, r)) == eids(slow.circle(cx, cy, r))
+
+
+def test_sweep_paths_agree(queries):
+    fast, slow = queries
+    rng = random.Random(11)
+    for _ in range(300):
+        x, y = rng.uniform(0, 1900), rng.uniform(0, 760)
+        box = (x, y, x + 40, y + 60)
+        dx, dy = rng.uniform(-420, 420), rng.uniform(-40, 40)
+        assert eids(fast.sweep(box, dx, dy)) == eids(slow.sweep(box, dx, dy))
+
+
+def test_exclude_and_results_sorted(queries):
+    fast, slow = queries
+    box = (0, 0, 1920, 768)
+    everyone = eids(fast.box(box))
+    assert everyone == sorted(everyone)
+    skip = set(everyone[::2])
+    assert eids(fast.box(box, exclude=skip)) == eids(slow.box(box, exclude=skip)) == everyone[1::2]
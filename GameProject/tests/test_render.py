@@ -0,0 +1,51 @@
+﻿"""렌더러 더티 동기화: 바뀐 속성만 캔버스로 보내는지 연산 횟수로 확인."""
+from headless import run_ticks, reset_ops
+
+
+def test_repeated_sync_pushes_nothing(game):
+    run_ticks(game, 10)
+    game.renderer.sync(1.0)
+    reset_ops(game)
+    game.renderer.sync(1.0)
+    ops = game.game_cv.ops
+    assert ops["coords"] == 0
+    assert ops["itemconfig"] == 0
+
+
+def test_idle_player_only_swaps_frames(game):
+    run_ticks(game, 60)
+    reset_ops(game)
+    run_ticks(game, 60)
+    ops = game.game_cv.ops
+    assert ops["coords"] == 0
+    assert 0 < ops["itemconfig"] <= 60 // 5 + 2
+
+
+def test_crowd_itemconfig_far_below_one_per_entity(game):
+    game.world.load_stage(1)
+    run_ticks(game, 30)
+    entities = 1 + len(game.world.monsters)
+    reset_ops(game)
+    run_ticks(game, 120)
+    ops = game.game_cv.ops
+    assert ops["itemconfig"] < entities * 120 // 10
+
+
+def test_offscreen_monster_hidden_once_then_skipped(game):
+    game.world.load_stage(1)
+    run_ticks(game, 10)
+    view_l, view_r = game.renderer.view
+    m = next(m for m in game.world.monsters if view_l <= m.hitbox[0] and m.hitbox[2] <= view_r)
+    shift = view_r + 100 - m.hitbox[0]
+    m.x += shift
+    m.prev_x += shift
+    m.refresh_hitbox()
+    reset_ops(game)
+    game.renderer.sync(1.0)
+    assert game.renderer.items[m.eid].state == "hidden"
+    assert game.game_cv.ops["itemconfig"] >= 1
+    reset_ops(game)
+    game.renderer.sync(1.0)
+    ops = game.game_cv.ops
+    assert ops["coords"] == 0
+    assert ops["itemconfig"] == 0
@@ -0,0 +1,53 @@
+﻿"""리플레이 왕복: 실제 게임 세션에서 기록한 입력을 파일로 저장·로드해 헤드리스 월드에 재생하면 같은 상태가 나와야 한다."""
+import pytest
+
+from headless import run_ticks, press, release
+from replay import Replay, ReplayPlayer
+
+
+def snapshot(world):
+    p = world.player
+    return (world.stage_level, p.char_type, p.level, p.hp, p.exp, round(p.x, 6), round(p.y, 6),
+            [(m.eid, round(m.x, 6), round(m.y, 6), m.hp) for m in world.monsters])
+
+
+def test_recorded_session_replays_identically(game, tmp_path):
+    script = [("Right", 40), ("space", 3), ("Right", 30), ("z", 5), ("Left", 20), ("z", 5)]
+    for key, ticks in script:
+        press(game, key)
+        run_ticks(game, ticks)
+        release(game, key)
+        run_ticks(game, 2)
+    path = tmp_path / "session.rpr"
+    game.replay.save(path)
+
+    replay = Replay.load(path)
+    assert replay.ticks == game.replay.ticks
+    assert list(replay.masks()) == list(game.replay.masks())
+    world = ReplayPlayer(replay).run()
+    assert snapshot(world) == snapshot(game.world)
+
+
+def sample_replay():
+    replay = Replay(seed=1234, char_type="freischutz")
+    for mask in [0, 0, 1, 1, 1, 5, 0] * 3:
+        replay.record(mask)
+    return replay
+
+
+def test_bytes_round_trip():
+    replay = sample_replay()
+    back = Replay.from_bytes(replay.to_bytes())
+    assert (back.seed, back.char_type, back.ticks) == (1234, "freischutz", replay.ticks)
+    assert list(back.masks()) == list(replay.masks())
+
+
+@pytest.mark.parametrize("mangle", [
+    lambda b: b"XXXX" + b[4:],
+    lambda b: b[:5],
+    lambda b: b[:-1],
+    lambda b: b[:-6],
+], ids=["magic", "short_header", "partial_run", "missing_run"])
+def test_corrupt_file_rejected(mangle):
+    with pytest.raises(ValueError):
+        Replay.from_bytes(mangle(sample_replay().to_bytes()))
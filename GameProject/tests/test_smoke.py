@@ -0,0 +1,45 @@
+﻿"""헤드리스 스모크: 모든 스테이지를 실제 game_core 렌더 루프로 돌려도 예외·hitbox 어긋남이 없어야 한다.
+
+hitbox 비교는 보간 없이(alpha=1.0) 다시 동기화한 뒤에 한다.
+"""
+import pytest
+
+from headless import run_ticks, press, release
+
+
+def test_loads_into_opening_stage(game):
+    assert game.world.player is not None
+    assert game.world.stage_level == -1
+    assert game.world.tick > 0
+
+
+@pytest.mark.parametrize("stage", [-2, -1, 0, 1, 2, 3, 4])
+def test_stage_runs_cleanly(game, stage):
+    game.world.load_stage(stage)
+    press(game, "Right")
+    for _ in range(4):
+        game.world.player.hp = game.world.player.max_hp
+        run_ticks(game, 30)
+    release(game, "Right")
+    press(game, "z")
+    run_ticks(game, 30)
+    release(game, "z")
+    assert game.world.stage_level == stage
+    assert not game.profiler.exceptions
+    game.renderer.sync(1.0)
+    assert game.renderer.check_hitboxes() == []
+
+
+def test_debug_hitbox_goes_to_profiler_not_stdout(game, monkeypatch, capsys):
+    import game_core
+    monkeypatch.setattr(game_core, "DEBUG_HITBOX", True)
+    game.world.load_stage(1)
+    press(game, "Right")
+    for _ in range(4):
+        game.world.player.hp = game.world.player.max_hp
+        run_ticks(game, 50)
+    release(game, "Right")
+    assert capsys.readouterr().out == ""
+    assert not game.profiler.exceptions
+    assert game.profiler.hitbox_mismatches == 0, game.profiler.last_hitbox_mismatch
+    assert game.profiler.summary()["hitbox_mismatches"] == 0
@@ -0,0 +1,59 @@
+﻿"""타이머 휠: 만기 순서, 스테이지 전환 취소, 콜백 안에서 clear_stage()/clear() 를 부를 때의 회귀."""
+from headless import run_ticks
+from timers import TimerWheel
+
+
+def test_fires_on_due_tick_in_schedule_order():
+    w = TimerWheel(slots=8)
+    fired = []
+    w.schedule(3, lambda: fired.append(("a", w.tick)))
+    w.schedule(3, lambda: fired.append(("b", w.tick)))
+    w.schedule(11, lambda: fired.append(("c", w.tick)))
+    w.advance(10)
+    assert fired == [("a", 3), ("b", 3)]
+    w.advance(11)
+    assert fired[-1] == ("c", 11)
+    assert len(w) == 0
+
+
+def test_clear_stage_inside_callback_cancels_rest_of_bucket():
+    w = TimerWheel()
+    fired = []
+    w.schedule(3, w.clear_stage)
+    w.schedule(3, lambda: fired.append("stale"))
+    w.schedule(3, lambda: fired.append("player"), stage=False)
+    w.advance(5)
+    assert fired == ["player"]
+
+
+def test_clear_inside_callback_uses_new_wheel():
+    w = TimerWheel(slots=8)
+    fired = []
+
+    def restart():
+        w.clear()
+        w.schedule(2, lambda: fired.append(("new", w.tick)))
+
+    w.schedule(3, restart)
+    w.schedule(3, lambda: fired.append(("old", w.tick)))
+    w.advance(10)
+    assert fired == [("new", 5)]
+
+
+def test_pushed_back_handle_survives_clear_stage_in_same_bucket():
+    w = TimerWheel(slots=8)
+    fired = []
+    w.schedule(11, lambda: fired.append(w.tick), stage=False)
+    w.schedule(3, w.clear_stage)
+    w.advance(20)
+    assert fired == [11]
+
+
+def test_stage_switch_from_timer_drops_old_stage_timers(game):
+    world = game.world
+    fired = []
+    world.after(160, lambda: world.load_stage(1))
+    world.after(160, lambda: fired.append("stale"))
+    run_ticks(game, 20)
+    assert world.stage_level == 1
+    assert fired == []
@@ -0,0 +1,91 @@
+﻿from constants import *
+
+
+class TimerHandle:
+    """예약된 지연 호출 하나. cancel() 로 취소."""
+    __slots__ = ("due", "callback", "stage", "active")
+
+    def __init__(self, due, callback, stage):
+        self.due = due
+        self.callback = callback
+        self.stage = stage
+        self.active = True
+
+    def cancel(self):
+        self.active = False
+        self.callback = None
+
+
+class TimerWheel:
+    """틱 단위 해시 타이머 휠 (게임 루프가 소유, 벽시계와 무관).
+
+    만기 틱 % slots 칸에 핸들을 넣어 두고, advance() 는 지나가는 칸만 본다.
+    그래서 틱당 비용은 그 칸에 든 타이머 수뿐이다 (한 바퀴보다 긴 지연은 다음 바퀴까지 남겨 둔다).
+    같은 틱에 만기된 타이머는 예약 순서대로 실행한다.
+    stage=True 인 핸들은 clear_stage() (스테이지 전환) 때 모두 취소된다.
+    """
+    def __init__(self, slots=TIMER_WHEEL_SLOTS):
+        self.slots = slots
+        self.wheel = [[] for _ in range(slots)]
+        self.running = ()
+        self.tick = 0
+
+    def schedule(self, ticks, callback, stage=True):
+        """ticks 틱 뒤(최소 1) 에 callback 호출 예약."""
+        handle = TimerHandle(self.tick + max(1, ticks), callback, stage)
+        self.wheel[handle.due % self.slots].append(handle)
+        return handle
+
+    def advance(self, tick):
+        """tick 까지 한 틱씩 진행하며 만기된 콜백 실행.
+
+        실행 중인 칸은 running 에 두므로 콜백 안에서 clear_stage()/clear() 를 불러도 같은 칸의 남은 타이머가 취소된다.
+        콜백이 clear() 로 휠을 새로 만들 수 있으므로 self.wheel 은 매번 다시 읽는다.
+        """
+        slots = self.slots
+        while self.tick < tick:
+            self.tick += 1
+            idx = self.tick % slots
+            bucket = self.wheel[idx]
+            if not bucket:
+                continue
+            self.wheel[idx] = []
+            self.running = bucket
+            try:
+                for handle in bucket:
+                    if not handle.active:
+                        continue
+                    if handle.due > self.tick:
+                        self.wheel[idx].append(handle)
+                        continue
+                    callback = handle.callback
+                    handle.cancel()
+                    callback()
+            finally:
+                self.running = ()
+
+    def clear_stage(self):
+        """스테이지에 묶인 타이머(지연 스테이지 전환, 스토리 해제 등) 를 모두 취소."""
+        for handle in self.running:
+            if handle.stage:
+                handle.cancel()
+        for idx, bucket in enumerate(self.wheel):
+            if bucket:
+                keep = []
+                for handle in bucket:
+                    if handle.stage:
+                        handle.cancel()
+                    elif handle.active:
+                        keep.append(handle)
+                self.wheel[idx] = keep
+
+    def clear(self):
+        for handle in self.running:
+            handle.cancel()
+        for bucket in self.wheel:
+            for handle in bucket:
+                handle.cancel()
+        self.wheel = [[] for _ in range(self.slots)]
+
+    def __len__(self):
+        return sum(1 for bucket in self.wheel for handle in bucket if handle.active)
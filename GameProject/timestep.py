@@ -0,0 +1,80 @@
+﻿import time
+
+from constants import FRAME_MS, RENDER_MS, MAX_CATCHUP_STEPS
+
+
+class FixedTimestep:
+    """누적기 기반 고정 스텝 타이밍: 실제 경과 시간을 모아 FRAME_MS 단위로 시뮬레이션을 진행.
+
+    렌더 콜백 한 번에 필요한 만큼(최대 max_steps) 스텝을 몰아서 돌리고,
+    남은 누적 시간 비율(alpha)로 렌더러가 스프라이트 위치를 보간한다.
+    time_scale 을 1보다 크게 두면 실제 시간보다 빠르게 시뮬레이션한다.
+    """
+    def __init__(self, step_ms=FRAME_MS, budget_ms=RENDER_MS, max_steps=MAX_CATCHUP_STEPS, clock=time.perf_counter):
+        self.step = step_ms / 1000.0
+        self.budget = budget_ms / 1000.0
+        self.max_steps = max_steps
+        self.clock = clock
+        self.time_scale = 1.0
+        self.accumulator = 0.0
+        self.alpha = 1.0
+        self.last_time = None
+        self.frame_start = 0.0
+        self.sim_end = 0.0
+        self.last = {"steps": 0, "sim_ms": 0.0, "render_ms": 0.0, "frame_ms": 0.0,
+                     "budget_ms": budget_ms, "over_budget": False}
+        self.frames = 0
+        self.total_steps = 0
+        self.over_budget_frames = 0
+        self.dropped_ms = 0.0
+        self.worst_frame_ms = 0.0
+
+    def begin_frame(self):
+        """이번 렌더 프레임에 돌릴 시뮬레이션 스텝 수."""
+        now = self.clock()
+        self.frame_start = now
+        if self.last_time is None:
+            self.last_time = now - self.step
+        elapsed = (now - self.last_time) * self.time_scale
+        self.last_time = now
+        self.accumulator += elapsed
+        steps = int(self.accumulator / self.step + 1e-9)
+        if steps > self.max_steps:
+            self.dropped_ms += (steps - self.max_steps) * self.step * 1000.0
+            steps = self.max_steps
+            self.accumulator = self.step * steps
+        self.accumulator -= steps * self.step
+        self.alpha = self.accumulator / self.step
+        return steps
+
+    def end_sim(self):
+        self.sim_end = self.clock()
+
+    def end_frame(self, steps):
+        end = self.clock()
+        frame = end - self.frame_start
+        self.sim_end = max(self.sim_end, self.frame_start)
+        self.last = {
+            "steps": steps,
+            "sim_ms": (self.sim_end - self.frame_start) * 1000.0,
+            "render_ms": (end - self.sim_end) * 1000.0,
+            "frame_ms": frame * 1000.0,
+            "budget_ms": self.budget * 1000.0,
+            "over_budget": frame > self.budget,
+        }
+        self.frames += 1
+        self.total_steps += steps
+        if frame > self.budget:
+            self.over_budget_frames += 1
+        self.worst_frame_ms = max(self.worst_frame_ms, frame * 1000.0)
+
+    def summary(self):
+        return {
+            "frames": self.frames,
+            "steps": self.total_steps,
+            "steps_per_frame": self.total_steps / self.frames if self.frames else 0.0,
+            "over_budget_frames": self.over_budget_frames,
+            "dropped_ms": self.dropped_ms,
+            "worst_frame_ms": self.worst_frame_ms,
+            "last": dict(self.last),
+        }
@@ -0,0 +1,866 @@
+﻿import random
+import math
+
+from constants import *
+from entities import Monster, Player
+from spatial import SpatialHash
+from profiler import FrameProfiler
+from batch import MonsterBatch
+from stage import compile_stage
+from projectiles import ProjectilePool
+from timers import TimerWheel
+from combat import CombatQuery
+import sprites
+
+
+class GameWorld:
+    """Tk 없이 동작하는 게임 상태/시뮬레이션: 물리, AI, 충돌, 투사체, 스테이지 스크립트.
+
+    화면/사운드는 직접 다루지 않고 events 큐에 (이름, *인자) 형태로 남기며,
+    렌더러(CanvasRenderer)와 AdventureRPGGame 이 매 프레임 이를 소비한다.
+    시간은 실제 시계가 아니라 step() 호출 수로 흐르는 시뮬레이션 시간(now, 초)이다.
+    난수는 seed 로 만든 전용 rng 만 쓰므로 같은 시드·같은 입력이면 같은 결과가 나온다.
+    """
+    def __init__(self, emit_events=True, seed=None):
+        self.emit_events = emit_events
+        self.seed = random.randrange(1 << 32) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.events = []
+        self.now = 0.0
+        self.tick = 0
+        self.timers = TimerWheel()
+        self._next_id = 0
+
+        self.player = None
+        self.keys = {}
+        self.is_paused = False
+        self.show_inventory = False
+        self.help_visible = False
+        self.monsters = []
+        self.monster_index = SpatialHash()
+        self.monster_batch = MonsterBatch() if MonsterBatch.available() else None
+        self.boss_projectiles = ProjectilePool()
+        self.combat = CombatQuery(self)
+        self.dropped_items = []
+        self.goal_obj = None
+        self.chest_opened = False
+        self.chests = []
+        self.ending_portal = None
+        self.final_cutscene_running = False
+        self.boss_proj_frames = []
+        for i in range(1, 6):
+            try:
+                self.boss_proj_frames.append(sprites.png_frame(f"image/boss_proj{i}.png"))
+            except Exception:
+                break
+        self.story = None
+        self.msg_log = ""
+        self.map_data = STAGE_OPEN
+        self.stage = compile_stage(self.map_data)
+        self.stage_level = -1
+        self.camera_x = 0.0
+        self.prev_camera_x = 0.0
+        self.far_monster_stride = FAR_MONSTER_STRIDE
+        self.profiler = FrameProfiler()
+        self.cam_move_dir = 0
+        self.loop_tick = 0
+
+    def new_id(self):
+        self._next_id += 1
+        return self._next_id
+
+    def emit(self, name, *args):
+        if self.emit_events:
+            self.events.append((name,) + args)
+
+    def after(self, ms, callback, stage=True):
+        """시뮬레이션 틱 기준 지연 호출 (canvas.after 대체). ms 는 틱 단위로 올림.
+
+        취소 가능한 TimerHandle 을 돌려준다. stage=True 면 load_stage 때 자동 취소되고,
+        플레이어 동작 타이머처럼 스테이지를 넘어 유지돼야 하면 stage=False.
+        """
+        return self.timers.schedule(math.ceil(ms / FRAME_MS), callback, stage)
+
+    def run_timers(self):
+        self.timers.advance(self.tick)
+
+    def play_sound(self, key, loop=False): self.emit("sound", "play_sound", key, loop)
+    def play_loop(self, key): self.emit("sound", "play_loop", key)
+    def pause_sound(self, key): self.emit("sound", "pause_sound", key)
+    def stop_sound(self, key): self.emit("sound", "stop_sound", key)
+    def stop_all_sounds(self): self.emit("sound", "stop_all_sounds")
+    def play_bgm(self): self.emit("sound", "play_bgm")
+    def stop_bgm(self): self.emit("sound", "stop_bgm")
+    def preload_sounds(self, keys): self.emit("sound", "preload_sounds", keys)
+
+    def start_game(self, char_type):
+        self.rng.seed(self.seed)
+        self.stop_all_sounds()
+        self.camera_x = 0.0
+        self.chest_opened = False
+        self.chests = []
+        self.ending_portal = None
+        self.final_cutscene_running = False
+        self.tutorial_done = False
+        self.help_visible = False
+        self.is_paused = False
+        self.timers.clear()
+        self.player = Player(self, 100, 100, char_type)
+        self.preload_sounds(CLASS_SOUNDS.get(char_type, ()))
+        self.stage_level = -1
+        self.load_stage(-1)
+        self.play_bgm()
+
+    def load_stage(self, stage_num):
+        """스테이지 전환: 맵/몬스터 초기화, 연출 텍스트, 플레이어 리스폰·카메라 설정."""
+        self.stage_level = max(-2, min(stage_num, 4))
+        self.is_paused = False
+        self.timers.clear_stage()
+        self.emit("stage_loaded")
+        self.story = None
+        self.clear_monsters()
+        self.boss_projectiles.clear()
+        self.dropped_items.clear()
+        self.goal_obj = None
+        self.chests = []
+        self.ending_portal = None
+        self.final_cutscene_running = False
+        self.chest_opened = False
+        self.tutorial_done = self.tutorial_done if self.stage_level == 0 else True
+        if self.stage_level == -2:
+            self.awaiting_class = False
+            self.class_chosen = False
+        else:
+            self.awaiting_class = False
+
+        if self.stage_level == -1:
+            self.map_data = STAGE_OPEN
+            self.log("차원의 코어 붕괴로 왕국이 멸망 위기... 오른쪽 포탈로 이동하세요.")
+            self.show_story("배경: 평화롭던 왕국은 세계의 균형을 유지하는 '차원의 코어'에 의해 보호받고 있었습니다.\n사건: 어느 날, 알 수 없는 원인으로 코어가 파괴되면서 시공간에 균열이 발생합니다. 과거에 봉인된 몬스터들이 풀려나고, 왕국은 멸망의 위기에 처합니다.", 0)
+        elif self.stage_level == 0:
+            self.map_data = STAGE_0
+            self.tutorial_timer = 120
+            self.tutorial_boss_spawned = False
+            self.tutorial_done = False
+            self.show_story("상황: 플레이어는 왕국을 지키는 평범한 기사 '아이언나이트'로 시작합니다.\n전개: 쏟아지는 몬스터들에게 맞서지만 역부족입니다. (필패 이벤트: 공격해도 몬스터가 죽지 않음)", 0)
+        elif self.stage_level == -2:
+            self.map_data = STAGE_HIDDEN
+            self.log("조력자의 힘이 깃든 숨겨진 공간. 전직할 캐릭터를 선택하세요.")
+            self.class_chosen = False
+            self.awaiting_class = False
+            self.show_story("사건: 죽음의 문턱에서 신비한 힘을 가진 '조력자'가 나타나 자신의 생명을 희생하여 주인공을 구합니다.\n유언: \"내 수명은 여기까지다... 내 모든 힘과 가능성을 너에게 주마. 부디 이 땅을 지켜다오.\"\n(조력자는 빛이 되어 사라지고, 주인공은 그 힘을 받아들인 채 정신을 잃은 뒤 깨어나 각성합니다.)", 0)
+        elif self.stage_level == 1:
+            self.map_data = STAGE_1
+        elif self.stage_level == 2:
+            self.map_data = STAGE_2
+        elif self.stage_level == 3:
+            self.map_data = STAGE_3
+        else:
+            self.map_data = STAGE_END
+        self.stage = compile_stage(self.map_data)
+        self.build_map()
+        
+        if self.stage_level >= 1 or self.stage_level == -2:
+            self.player.hp = self.player.max_hp
+            self.player.invincible = 0
+
+        spawn_x = 100
+        self.player.x = spawn_x
+        self.player.y = self.find_ground_y(spawn_x)
+        self.player.dy = 0
+        self.player.dx = 0
+        self.keys = {}
+        self.player.on_ground = True
+        self.player.visible = True
+        self.player.refresh_hitbox()
+
+        self.camera_x = max(0, min(MAP_WIDTH - SCREEN_WIDTH, self.player.x - (SCREEN_WIDTH/2)))
+
+        monster_type = "enemy0" if self.stage_level == 1 else ["enemy1", "enemy2"]
+        spawn_count = 0
+        if self.stage_level == 0:
+            spawn_count = 0
+        elif self.stage_level == 1:
+            spawn_count = 0
+        elif self.stage_level in [1, 2]:
+            spawn_count = 0
+        elif self.stage_level >= 4 or self.stage_level <= 0:
+            spawn_count = 0
+        else:
+            spawn_count = 5 + (self.stage_level * 2)
+        if self.stage_level == 3:
+            spawn_count = 3
+        
+        for _ in range(spawn_count):
+            placed = False
+            for _ in range(800):
+                c = self.rng.randint(1, MAP_COLS-2)
+                r = self.rng.randint(1, MAP_ROWS-2)
+                if self.stage.is_standable(r, c):
+                    m_name = monster_type if isinstance(monster_type, str) else self.rng.choice(monster_type)
+                    mob = Monster(self, c*TILE_SIZE, r*TILE_SIZE, m_name)
+                    self.add_monster(mob)
+                    placed = True
+                    break
+            if not placed:
+                self.log("몬스터 스폰 실패: 빈 공간 부족")
+                break
+
+        if self.stage_level == 1:
+            self.clear_monsters()
+            self.spawn_stage1_monsters()
+        elif self.stage_level == 2:
+            self.clear_monsters()
+            self.spawn_stage2_monsters()
+
+        if self.stage_level == 3:
+            bx, by = (MAP_COLS//2)*TILE_SIZE, (MAP_ROWS-3)*TILE_SIZE
+            boss = Monster(self, bx, by, "Boss")
+            self.preload_sounds(("boss_projectile",))
+            boss.hp = 1000; boss.max_hp = 1000; boss.stats.atk = 35
+            self.add_monster(boss)
+        
+        if self.stage_level in [1, 2, 3]:
+            self.log(f"STAGE {stage_num} 시작!")
+
+    def add_monster(self, monster):
+        self.monsters.append(monster)
+        self.monster_index.insert(monster, monster.hitbox)
+        if self.monster_batch is not None and self.monster_batch.members:
+            self.attach_to_batch(monster)
+
+    def attach_to_batch(self, monster):
+        size = sprites.image_info(monster.image[0])[:2] if monster.image is not None else None
+        self.monster_batch.add(monster, size)
+
+    def sync_monster_batch(self):
+        """몬스터 수에 따라 일괄 물리 사용 여부 전환 (BATCH_MIN_MONSTERS 이상이면 배치, 절반 밑이면 해제)."""
+        batch = self.monster_batch
+        if batch is None:
+            return False
+        if batch.members:
+            if len(self.monsters) < BATCH_MIN_MONSTERS // 2:
+                batch.clear()
+        elif len(self.monsters) >= BATCH_MIN_MONSTERS:
+            for m in self.monsters:
+                self.attach_to_batch(m)
+        return bool(batch.members)
+
+    def clear_monsters(self):
+        self.monsters.clear()
+        if self.monster_batch is not None:
+            self.monster_batch.clear()
+        self.monster_index.clear()
+
+    def monsters_near(self, box):
+        """box 주변 셀의 몬스터 후보(광역 단계). 모든 몬스터 판정이 공유한다."""
+        return self.monster_index.query(box)
+
+    def get_bbox(self, obj):
+        """모든 몬스터 판정이 쓰는 영역. 물리 갱신 시점의 파이썬 측 hitbox (캔버스 조회 없음)."""
+        return obj.hitbox
+
+    def can_damage_monster(self, m):
+        return True
+
+    def update_boss_actions(self):
+        """보스 투사체 발사 패턴 처리(쿨타임·속도·사운드)."""
+        now = self.now
+        for boss in [m for m in self.monsters if m.is_boss]:
+            if (now - boss.boss_last_shot) >= boss.boss_shot_cd and self.player:
+                bx, by = boss.x + boss.w/2, boss.y + boss.h/2
+                px, py = self.player.x + self.player.w/2, self.player.y + self.player.h/2
+                dx, dy = px - bx, py - by
+                dist = math.hypot(dx, dy) or 1
+                speed = 14.0
+                vx, vy = (dx/dist)*speed, (dy/dist)*speed
+                self.boss_projectiles.spawn(bx, by, vx, vy, now)
+                boss.boss_last_shot = now
+                self.play_sound("boss_projectile")
+
+    def build_map(self):
+        """스테이지 스토리 출력 및 상자 위치 수집 (타일 그리기는 렌더러 담당)."""
+        self.chests = []
+        story_msgs = {
+            1: "깨어나 새로운 힘을 느낀다.\n목표: 왕국 주변을 점거한 슬라임들을 처치하며 잃어버린 감각을 되찾고 코어로 향한다.",
+            2: "차원의 균열이 깊다. 더 강한 몬스터가 앞을 막는다.\n조력자의 유언을 되새기며 포기하지 않고 전진하자.",
+            3: "코어 직전: 코어 앞을 지키는 최종 보스를 쓰러뜨려라.",
+            4: "코어 제어실: 상자를 깨우면 진실이 드러난다.\n(상자 주변에 도달하면 기본 공격(z) 키를 누르세요.)",
+        }
+        if self.stage_level in story_msgs:
+            self.log(story_msgs[self.stage_level])
+            if self.stage_level in [1, 2, 3]:
+                self.show_story(story_msgs[self.stage_level], y=80)
+            else:
+                self.show_story(story_msgs[self.stage_level])
+
+        for r in range(MAP_ROWS):
+            for c in range(MAP_COLS):
+                if self.map_data[r][c] == 2:
+                    x, y = c*TILE_SIZE, r*TILE_SIZE
+                    self.chests.append({"bbox": (x, y, x+TILE_SIZE, y+TILE_SIZE)})
+
+    def update_boss_projectiles(self):
+        """투사체 풀 한 틱 진행 (지형/플레이어 스윕 판정). 플레이어에 닿은 수만큼 피해."""
+        player = self.player
+        target = (player.x, player.y, player.x + player.w, player.y + player.h) if player else None
+        for _ in range(self.boss_projectiles.step(self.now, self.stage, target)):
+            player.take_damage(20)
+
+    def key_down(self, keysym, char=""):
+        if keysym in self.keys and self.keys[keysym]:
+            return
+        if getattr(self, "awaiting_class", False):
+            digit = None
+            if keysym in ["1", "2", "3", "KP_1", "KP_2", "KP_3"]:
+                digit = keysym[-1] if "KP_" in keysym else keysym
+            elif char in ["1", "2", "3"]:
+                digit = char
+            if digit:
+                mapping = {"1": "stranger", "2": "strider", "3": "freischutz"}
+                self.choose_class(mapping[digit])
+            return
+
+        self.keys[keysym] = True
+
+        if keysym.lower() == "h":
+            self.toggle_help()
+            return
+
+        if keysym == "d" and self.player and self.player.char_type == "stranger":
+            self.player.plasma_press()
+        if keysym == "d" and self.player and self.player.char_type == "freischutz":
+            self.player.skill_trigger()
+
+        if self.player and self.player.char_type == "strider":
+            if self.player.can_dash_cancel:
+                if keysym in ["Left", "Right"]:
+                    if self.player.last_tap_key and self.player.last_tap_key != keysym:
+                        self.player.last_tap_key = None
+                    curr_time = self.now
+                    if (self.player.last_tap_key == keysym and 
+                        curr_time - self.player.last_tap_time < 0.3):
+                        
+                        direction = "right" if keysym == "Right" else "left"
+                        dead_monsters = self.player.dash_skill(direction, self.map_data)
+                        for m in dead_monsters: self.kill_monster(m)
+                        self.player.can_dash_cancel = False 
+                        self.player.last_tap_key = None 
+                    else:
+                        self.player.last_tap_key = keysym
+                        self.player.last_tap_time = curr_time
+
+        if keysym == "i": self.toggle_inventory()
+        if self.show_inventory and char.isdigit():
+            self.equip_item(int(char) - 1)
+
+    def key_up(self, keysym):
+        self.keys[keysym] = False
+        if keysym == "d" and self.player and self.player.char_type == "stranger":
+            self.player.plasma_release()
+
+    def step(self):
+        """한 틱 진행: 타이머, 입력 처리, 물리/카메라, 보스/이벤트, 충돌·목표 판정."""
+        self.tick += 1
+        self.now = self.tick * FRAME_MS / 1000.0
+        self.save_prev_positions()
+        self.run_timers()
+        if self.player and not self.is_paused:
+            if self.stage_level == -1:
+                pass
+            elif self.stage_level == -2:
+                if not getattr(self, "class_chosen", False) and not getattr(self, "awaiting_class", False):
+                    self.prompt_class_choice()
+            elif self.stage_level == 0:
+                if not getattr(self, "tutorial_done", False):
+                    if not getattr(self, "tutorial_boss_spawned", False):
+                        self.clear_monsters()
+                        for i in range(8):
+                            tbx = (MAP_COLS//2 + i - 4)*TILE_SIZE
+                            tby = (MAP_ROWS-3)*TILE_SIZE
+                            doom = Monster(self, tbx, tby, "enemy3")
+                            doom.hp = 9999; doom.max_hp = 9999; doom.stats.atk = 30
+                            doom.target_player = True
+                            self.add_monster(doom)
+                        self.tutorial_boss_spawned = True
+                        self.log("압도적인 적이 나타났다! 필패 이벤트")
+                    if self.player.hp <= 10:
+                        self.tutorial_done = True
+                        self.is_paused = True
+                        self.player.hp = 10
+                        self.player.invincible = 9999
+                        self.clear_monsters()
+                        self.after(800, lambda: self.load_stage(-2))
+                        return
+            prof = self.profiler
+            t = prof.clock()
+            self.process_input()
+            t = prof.lap("input", t)
+            self.player.update_physics(self.map_data)
+            self.update_camera()
+            
+            if self.player.char_type == "stranger":
+                self.player.update_plasma()
+                is_s_pressed = self.keys.get("s", False)
+                self.player.toggle_floating(is_s_pressed)
+
+            if self.player.invincible > 0:
+                self.player.invincible -= 1
+            t = prof.lap("player", t)
+            
+            if self.sync_monster_batch():
+                self.step_monster_batch()
+            else:
+                for m in self.monsters[:]: 
+                    if self.far_monster_stride > 1 and not m.is_boss and self.is_far(m):
+                        if (self.loop_tick + m.eid) % self.far_monster_stride:
+                            continue
+                    m.update_physics(self.map_data)
+                    if m.hp <= 0:
+                        self.kill_monster(m) 
+            t = prof.lap("monsters", t)
+            if self.stage_level == 3 and any(m.is_boss for m in self.monsters):
+                if self.loop_tick % 3 == 0:
+                    self.update_boss_actions()
+                    self.update_boss_projectiles()
+            t = prof.lap("boss", t)
+                
+            self.check_collisions()
+            t = prof.lap("collisions", t)
+            self.check_goal()
+            prof.lap("goal", t)
+            
+            if self.player.hp <= 0:
+                self.player.hp = 0
+                if self.stage_level in [1, 2, 3]:
+                    msg = "쓰러졌습니다... 잠시 후 이 스테이지에서 재시작합니다."
+                    self.log(msg)
+                    self.show_story(msg, 12000)
+                    self.is_paused = True
+                    self.after(1200, lambda lvl=self.stage_level: self.load_stage(lvl))
+                    return
+                else:
+                    self.log("GAME OVER...")
+                    self.is_paused = True
+        
+        if self.is_paused:
+            if self.player and self.player.hp > 0:
+                self.is_paused = False
+        
+        self.loop_tick += 1
+
+    def step_monster_batch(self):
+        """MonsterBatch 로 몬스터 물리를 한꺼번에 진행 (몬스터별 루프와 같은 결과)."""
+        members = None
+        if self.far_monster_stride > 1:
+            members = [m for m in self.monsters
+                       if m.is_boss or not self.is_far(m) or not (self.loop_tick + m.eid) % self.far_monster_stride]
+        active = list(self.monster_batch.members if members is None else members)
+        player_x = self.player.x if self.player else None
+        boxes, spans = self.monster_batch.step(self.map_data, player_x, members)
+        index = self.monster_index
+        indexed = index.spans
+        for m, box, span in zip(active, boxes, spans):
+            m.hitbox = box
+            if indexed.get(m) != span:
+                index.move(m, span)
+        stepped = None if members is None else set(members)
+        for m in self.monsters[:]:
+            if m.hp <= 0 and (stepped is None or m in stepped):
+                self.kill_monster(m)
+
+    def save_prev_positions(self):
+        """렌더 보간용: 스텝 시작 시점의 위치를 기억."""
+        self.prev_camera_x = self.camera_x
+        if self.player:
+            self.player.prev_x, self.player.prev_y = self.player.x, self.player.y
+        if self.monster_batch is not None and self.monster_batch.members:
+            self.monster_batch.save_prev()
+            return
+        for m in self.monsters:
+            m.prev_x, m.prev_y = m.x, m.y
+
+    def in_view(self, x1, x2, margin=CULL_MARGIN):
+        """가로 구간 [x1, x2] 가 카메라 창(+margin)과 겹치는지."""
+        return x2 >= self.camera_x - margin and x1 <= self.camera_x + SCREEN_WIDTH + margin
+
+    def is_far(self, ent):
+        """화면에서 FAR_MONSTER_DIST 이상 떨어진 엔티티 (저비용 갱신 대상)."""
+        return not self.in_view(ent.hitbox[0], ent.hitbox[2], FAR_MONSTER_DIST)
+
+    def update_camera(self):
+        px_center = self.player.x + (self.player.w / 2)
+        want_left = self.keys.get("Left", False)
+        want_right = self.keys.get("Right", False)
+        dir_val = -1 if want_left and not want_right else 1 if want_right and not want_left else 0
+
+        at_right_edge = False
+        if dir_val != 0:
+            at_right_edge = self.camera_x >= (MAP_WIDTH - SCREEN_WIDTH - 1)
+            if dir_val < 0:
+                anchor = 0.68 if at_right_edge else 0.78
+            else:
+                anchor = 0.55
+            target_start = px_center - (SCREEN_WIDTH * anchor)
+            target_start = max(0, min(MAP_WIDTH - SCREEN_WIDTH, target_start))
+        else:
+            target_start = self.camera_x
+
+        delta = target_start - self.camera_x
+        max_step = MOVE_SPEED * (0.22 if dir_val > 0 else 0.28)
+        step = delta * 0.10
+        step = max(-max_step, min(max_step, step))
+
+        if dir_val < 0 and at_right_edge and delta < 0:
+            self.camera_x = target_start
+        elif abs(delta) <= 1.0:
+            self.camera_x = target_start
+        else:
+            self.camera_x = self.camera_x + step
+
+    def process_input(self):
+        self.player.dx = 0
+        if self.keys.get("Left"): self.player.dx = -MOVE_SPEED
+        if self.keys.get("Right"): self.player.dx = MOVE_SPEED
+        if self.keys.get("space") and self.player.on_ground: self.player.dy = JUMP_POWER
+        
+        if self.keys.get("z"):
+            self.player.attack()
+
+    def get_attack_box(self):
+        if not self.player:
+            return None
+        if not (self.player.is_attacking or (self.player.char_type == "freischutz" and self.player.is_skilling)):
+            return None
+        atk_range = 60
+        if self.player.current_dir == "right":
+            return (self.player.x + self.player.w, self.player.y, self.player.x + self.player.w + atk_range, self.player.y + self.player.h)
+        else:
+            return (self.player.x - atk_range, self.player.y, self.player.x, self.player.y + self.player.h)
+
+    def check_collisions(self):
+        """플레이어-몬스터 충돌 피해, 기본 공격 타격 판정, 드랍/상자 처리."""
+        p_box = (self.player.x, self.player.y, self.player.x + self.player.w, self.player.y + self.player.h)
+        if not self.player.is_attacking and not (self.player.char_type == "freischutz" and self.player.is_skilling):
+            self.player.attack_hit_consumed = False
+        for m in self.monsters_near(p_box):
+            mx1, my1, mx2, my2 = self.get_bbox(m)
+            if self.overlap(p_box, (mx1, my1, mx2, my2)):
+                if not (self.player.char_type == "strider" and self.player.is_dashing):
+                    self.player.take_damage(m.stats.atk)
+
+        if self.player.char_type in ["iron", "strider"] and self.player.is_attacking:
+            if not self.player.attack_hit_consumed:
+                atk_range = STRIDER_ATK_RANGE if self.player.char_type == "strider" else 30
+                if self.player.current_dir == "right":
+                    atk_box = (self.player.x+self.player.w, self.player.y, self.player.x+self.player.w+atk_range, self.player.y+self.player.h)
+                else:
+                    atk_box = (self.player.x-atk_range, self.player.y, self.player.x, self.player.y+self.player.h)
+                target = None
+                best_dist = None
+                for m in self.combat.box(atk_box):
+                    mx1, my1, mx2, my2 = self.get_bbox(m)
+                    if self.player.current_dir == "right":
+                        dist = max(0, mx1 - (self.player.x + self.player.w))
+                    else:
+                        dist = max(0, (self.player.x) - mx2)
+                    if best_dist is None or dist < best_dist:
+                        best_dist = dist
+                        target = m
+                if target:
+                    target.hp -= self.player.atk
+                    self.create_damage_text(target.x, target.y, self.player.atk, target.eid)
+                    target.x += 20 if self.player.x < target.x else -20
+                    if target.hp <= 0: self.kill_monster(target)
+                    self.player.attack_hit_consumed = True
+        
+        if self.player.char_type == "stranger" and self.player.is_attacking:
+            if not self.player.attack_hit_consumed:
+                atk_range = STRANGER_ATK_RANGE
+                if self.player.current_dir == "right":
+                    atk_box = (self.player.x+self.player.w, self.player.y, self.player.x+self.player.w+atk_range, self.player.y+self.player.h)
+                else:
+                    atk_box = (self.player.x-atk_range, self.player.y, self.player.x, self.player.y+self.player.h)
+                target = None
+                best_dist = None
+                for m in self.combat.box(atk_box):
+                    mx1, my1, mx2, my2 = self.get_bbox(m)
+                    if self.player.current_dir == "right":
+                        dist = max(0, mx1 - (self.player.x + self.player.w))
+                    else:
+                        dist = max(0, (self.player.x) - mx2)
+                    if best_dist is None or dist < best_dist:
+                        best_dist = dist
+                        target = m
+                if target:
+                    target.hp -= self.player.atk
+                    self.create_damage_text(target.x, target.y, self.player.atk, target.eid)
+                    if target.hp <= 0: self.kill_monster(target)
+                    self.player.attack_hit_consumed = True
+        
+        if self.player.char_type == "freischutz":
+            if self.player.is_attacking:
+                self.player.check_freischutz_hit(is_skill=False)
+            if self.player.is_skilling:
+                self.player.check_freischutz_hit(is_skill=True)
+
+        if self.stage_level == 4 and not self.chest_opened:
+            atk_box = self.get_attack_box()
+            if atk_box:
+                for chest in self.chests:
+                    if self.overlap(atk_box, chest["bbox"]):
+                        self.open_final_chest(chest)
+                        break
+
+        for item in self.dropped_items[:]:
+            ix, iy = item["x"], item["y"]
+            if self.overlap(p_box, (ix, iy, ix + 30, iy + 30)):
+                self.player.inventory.append(item["data"])
+                self.dropped_items.remove(item)
+                self.log(f"{item['data']['name']} 획득!")
+                if self.show_inventory: self.draw_inventory()
+
+    def kill_monster(self, monster):
+        if monster in self.monsters:
+            self.monsters.remove(monster)
+            self.monster_index.remove(monster)
+            if self.monster_batch is not None:
+                self.monster_batch.remove(monster)
+            if monster.is_boss:
+                self.boss_projectiles.clear()
+            exp = monster.stats.exp
+            self.player.exp += exp
+            if self.player.exp >= self.player.max_exp: self.level_up_event()
+            if self.rng.random() < 0.3:
+                item = self.rng.choice(ITEM_DB)
+                drop_y = monster.y + monster.h - 30
+                self.dropped_items.append({"iid": self.new_id(), "x": monster.x, "y": drop_y, "data": item})
+
+    def check_goal(self):
+        """포탈 생성/입장, 엔딩 포탈, 전직 포탈 등 스테이지 이동 트리거 처리."""
+        if self.stage_level >= 4 or self.stage_level == 0:
+            if self.stage_level == 4 and self.ending_portal and not self.final_cutscene_running:
+                cx = self.ending_portal["x"]
+                cy = self.ending_portal["y"] + 45
+                px_cx = self.player.x + (self.player.w / 2)
+                py_cy = self.player.y + (self.player.h / 2)
+                if abs(px_cx - cx) < 60 and abs(py_cy - cy) < 80:
+                    if self.keys.get("Up"):
+                        self.play_final_cutscene()
+            return
+
+        if self.stage_level == -2 and getattr(self, "class_chosen", False) and not self.goal_obj:
+            self.spawn_hidden_portal()
+
+        if self.stage_level == -1 and not self.goal_obj:
+            self.spawn_portal("skyblue")
+            self.log("오프닝: 오른쪽 포탈로 이동해 이야기를 시작하세요. [↑]")
+
+        if self.stage_level >= 0 and not self.monsters and not self.goal_obj:
+            self.spawn_portal("purple")
+            if self.stage_level < 3:
+                self.log("포탈이 열렸습니다! [↑]키로 이동하세요.")
+            else:
+                msg = "보스를 처치했습니다! 포탈로 이동하세요. [↑]"
+                self.log(msg)
+                self.show_story("오른쪽 포탈을 타고 코어 제어실로 이동해 주세요", 12000)
+
+        if self.goal_obj:
+            gx, gy = self.goal_obj
+            px_cx = self.player.x + (self.player.w / 2)
+            py_cy = self.player.y + (self.player.h / 2)
+            if abs(px_cx - gx) < 40 and abs(py_cy - (gy+40)) < 60:
+                if self.keys.get("Up"):
+                    if self.stage_level == -1:
+                        self.load_stage(0)
+                    elif self.stage_level == -2:
+                        self.load_stage(1)
+                    elif self.stage_level < 3:
+                        self.load_stage(self.stage_level + 1)
+                    elif self.stage_level == 3:
+                        self.load_stage(4)
+
+    def spawn_portal(self, color):
+        """맵 오른쪽 끝에 포탈 배치. goal_obj 는 ▲ 표시 위치(근접 판정 기준)."""
+        gx = (MAP_COLS-3) * TILE_SIZE
+        gy = (MAP_ROWS-1) * TILE_SIZE - 90
+        self.goal_obj = (gx+30, gy-20)
+        self.emit("portal", gx, gy, color)
+
+    def level_up_event(self):
+        """레벨업 처리: 스탯 초기화, 중앙 팝업 UI 띄우고 선택 기다림."""
+        self.is_paused = True
+        self.player.level += 1
+        self.player.exp = 0
+        self.player.max_exp = int(self.player.max_exp * 1.2)
+        self.emit("level_up", self.camera_x + SCREEN_WIDTH/2, GAME_HEIGHT/2)
+
+    def choose_stat(self, stat):
+        if stat == "atk": self.player.base_atk += 5
+        else: self.player.base_def += 2
+        self.emit("level_up", None, None)
+        self.player.hp = self.player.max_hp
+        self.is_paused = False
+
+    def prompt_class_choice(self):
+        self.awaiting_class = True
+        self.emit("class_prompt", self.camera_x + SCREEN_WIDTH/2, GAME_HEIGHT/2)
+
+    def choose_class(self, char_type):
+        self.player = Player(self, self.player.x, self.player.y, char_type)
+        self.preload_sounds(CLASS_SOUNDS.get(char_type, ()))
+        self.class_chosen = True
+        self.awaiting_class = False
+        self.emit("class_prompt", None, None)
+        self.log(f"{char_type} 전직 완료! 슬라임을 처치하며 힘을 익히세요.")
+        if self.stage_level == -2:
+            self.spawn_hidden_portal()
+
+    def toggle_help(self):
+        self.help_visible = not self.help_visible
+        if self.help_visible:
+            self.emit("help", self.camera_x + SCREEN_WIDTH/2, GAME_HEIGHT/2)
+        else:
+            self.emit("help", None, None)
+
+    def spawn_hidden_portal(self):
+        if self.goal_obj:
+            return
+        self.spawn_portal("purple")
+        self.log("포탈이 열렸습니다! [↑]키로 이동하세요.")
+
+    def spawn_stage1_monsters(self):
+        """스테이지1: 플랫폼 폭별 고정 수량, 바닥 랜덤 스폰 구현."""
+        width_to_count = {3: 1, 4: 2, 5: 3, 6: 4, 9: 7}
+        spawned = 0
+        for r in range(1, MAP_ROWS-1):
+            for start, end in self.stage.row_spans[r]:
+                width = end - start
+                if width in width_to_count:
+                    count = width_to_count[width]
+                    for i in range(count):
+                        pos = start + (width / (count + 1)) * (i + 1)
+                        x = pos * TILE_SIZE
+                        y = (r - 1) * TILE_SIZE
+                        m = Monster(self, x, y, "enemy0")
+                        m.left_bound = start * TILE_SIZE
+                        m.right_bound = (start + width) * TILE_SIZE
+                        self.add_monster(m)
+                        spawned += 1
+        ground_row = MAP_ROWS - 2
+        ground_spawn = 5
+        attempts = 0
+        while ground_spawn > 0 and attempts < 400:
+            attempts += 1
+            c = self.rng.randint(1, MAP_COLS-2)
+            if self.stage.is_standable(ground_row, c):
+                m = Monster(self, c * TILE_SIZE, ground_row * TILE_SIZE, "enemy0")
+                self.add_monster(m)
+                ground_spawn -= 1
+
+    def spawn_stage2_monsters(self):
+        """스테이지2: 행·폭 규칙 기반 플랫폼 스폰, 바닥 좌/우 구간별 랜덤 스폰."""
+        config = [
+            (2, 5, 3),
+            (3, 4, 2),
+            (4, 3, 1),
+            (7, 4, 2),
+            (8, 3, 1),
+        ]
+        for r_idx, target_w, count in config:
+            if r_idx < 0 or r_idx >= MAP_ROWS-1:
+                continue
+            for start, end in self.stage.row_spans[r_idx]:
+                width = end - start
+                if width == target_w:
+                    for i in range(count):
+                        pos = start + (width / (count + 1)) * (i + 1)
+                        x = pos * TILE_SIZE
+                        y = (r_idx - 1) * TILE_SIZE
+                        mtype = self.rng.choice(["enemy1", "enemy2"])
+                        m = Monster(self, x, y, mtype)
+                        m.left_bound = start * TILE_SIZE
+                        m.right_bound = (start + width) * TILE_SIZE
+                        self.add_monster(m)
+        ground_row = MAP_ROWS - 2
+        def spawn_ground(side, target_count):
+            attempts = 0
+            while target_count > 0 and attempts < 500:
+                attempts += 1
+                if side == "left":
+                    col = self.rng.randint(1, 21)
+                else:
+                    col = self.rng.randint(23, MAP_COLS-2)
+                if self.stage.is_standable(ground_row, col):
+                    mtype = self.rng.choice(["enemy1", "enemy2"])
+                    m = Monster(self, col * TILE_SIZE, ground_row * TILE_SIZE, mtype)
+                    self.add_monster(m)
+                    target_count -= 1
+        spawn_ground("left", 7)
+        spawn_ground("right", 4)
+
+    def find_ground_y(self, x_pos):
+        return self.stage.ground_y(x_pos, self.player.h)
+
+    def toggle_inventory(self):
+        self.show_inventory = not self.show_inventory
+        if self.show_inventory: self.draw_inventory()
+        else: self.emit("inventory", None)
+
+    def draw_inventory(self):
+        self.emit("inventory", self.camera_x + SCREEN_WIDTH/2)
+
+    def equip_item(self, idx):
+        if 0 <= idx < len(self.player.inventory):
+            item = self.player.inventory[idx]
+            if item["type"] == 0:
+                self.player.hp = min(self.player.max_hp, self.player.hp + item["val"])
+                self.player.inventory.pop(idx)
+            elif item["type"] == 1:
+                self.player.equipped["weapon"] = item
+                self.player.equip_atk = item["val"]
+            elif item["type"] == 2:
+                self.player.equipped["armor"] = item
+                self.player.equip_def = item["val"]
+            self.draw_inventory()
+
+    def open_final_chest(self, chest):
+        if self.chest_opened:
+            return
+        self.chest_opened = True
+        self.story = None
+        self.log("스스로가 열쇠임을 깨달았다. 빛 속으로 걸어간다.")
+        cx = (chest["bbox"][0] + chest["bbox"][2]) / 2
+        gy = (MAP_ROWS-1) * TILE_SIZE - 90
+        self.ending_portal = {"x": cx, "y": gy}
+        self.emit("chest_opened", chest)
+
+    def play_final_cutscene(self):
+        if self.final_cutscene_running:
+            return
+        self.final_cutscene_running = True
+        self.is_paused = True
+        self.stop_bgm()
+        self.story = None
+        cx, cy = self.camera_x + SCREEN_WIDTH/2, GAME_HEIGHT/2
+        self.player.x, self.player.y = cx - self.player.w/2, cy - self.player.h
+        self.emit("final_cutscene", cx, cy)
+
+    def log(self, text): self.msg_log = text
+
+    def show_story(self, text, duration_ms=8000, y=120):
+        story = {"text": text, "x": self.camera_x + SCREEN_WIDTH/2, "y": y}
+        self.story = story
+        if duration_ms > 0:
+            self.after(duration_ms, lambda: self.clear_story(story))
+
+    def clear_story(self, story):
+        if self.story is story:
+            self.story = None
+    
+    def create_damage_text(self, x, y, dmg, key=None):
+        """데미지 숫자 표시 요청. key(대상 eid)가 같으면 렌더러가 짧은 간격의 연타를 한 숫자로 합친다."""
+        self.emit("damage_text", x, y, dmg, key)
+
+    def overlap(self, box1, box2):
+        return not (box1[2] < box2[0] or box1[0] > box2[2] or box1[3] < box2[1] or box1[1] > box2[3])